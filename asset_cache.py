@@ -0,0 +1,192 @@
+"""
+asset_cache.py
+
+On-disk cache of pre-scaled images.
+
+This script defines the `AssetCache` class, which stores groups of decoded and scaled
+images as raw pixels in one binary file per group and size. On later runs the file is
+memory-mapped and the surfaces are made directly from its pages, without decoding or
+scaling any PNG/JPG. A group is rebuilt when any of its source files changes.
+
+File layout (little-endian):
+    header: magic b'SAC1', entry count (uint32)
+    entry:  source mtime in ns (int64), width, height (uint32), pixel format (4 bytes)
+    then the pixel data of every entry, one after another, in entry order
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Standard Imports
+import mmap
+import os
+import struct
+
+import pygame
+
+# Local Imports
+from game_state import SUITS, RANKS
+from image_cache import image_cache, CARD_BACK_PATH
+
+MENU_BACKGROUND_PATH = 'resources/images/photorealistic-casino-lifestyle.jpg'
+GAME_BACKGROUND_PATH = 'resources/images/green_background.png'
+
+MAGIC = b'SAC1'
+HEADER = struct.Struct('<4sI')
+ENTRY = struct.Struct('<qII4s')
+
+
+class AssetCache:
+    """Class to represent the on-disk cache of pre-scaled images.
+
+    Attributes:
+        cache_dir (str): The directory holding the cache files.
+        mappings (list): The memory-mapped cache files backing the loaded surfaces.
+    """
+
+    def __init__(self, cache_dir='.asset_cache'):
+        """Initialize the cache.
+
+        Args:
+            cache_dir (str): The directory holding the cache files (default: '.asset_cache').
+        """
+        self.cache_dir = cache_dir
+        self.mappings = []
+
+    def get_path(self, name, size):
+        """Return the path of the cache file for a group of images at a given size."""
+        suffix = '{}x{}'.format(*size) if size else 'original'
+        return os.path.join(self.cache_dir, f'{name}_{suffix}.bin')
+
+    def load(self, name, paths, size=None, loader=image_cache.get):
+        """Load a group of images, from the cache file if it is up to date.
+
+        The loaded surfaces are also added to the shared image cache.
+
+        Args:
+            name (str): The name of the group, used for the cache file name.
+            paths (list): The paths of the source image files.
+            size (tuple): The size to scale the images to, or None to keep their original size.
+            loader (callable): The function used to load and scale a source image when the cache is cold.
+
+        Returns:
+            list: The surfaces, in the order of `paths`.
+        """
+        mtimes = [os.stat(path).st_mtime_ns for path in paths]
+        cache_path = self.get_path(name, size)
+        surfaces = self._read(cache_path, mtimes)
+        if surfaces is None:
+            surfaces = [loader(path, size) for path in paths]
+            self._write(cache_path, mtimes, surfaces)
+        for path, surface in zip(paths, surfaces):
+            image_cache.put(path, size, surface)
+        return surfaces
+
+    def _read(self, cache_path, mtimes):
+        """Map a cache file and make surfaces from it.
+
+        Returns:
+            list: The surfaces, or None if the file is missing or out of date.
+        """
+        try:
+            with open(cache_path, 'rb') as file:
+                mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+        except (OSError, ValueError):
+            return None
+
+        layout = self._check(mapping, mtimes)
+        if layout is None:
+            mapping.close()  # No surface uses it yet
+            return None
+
+        view = memoryview(mapping)
+        surfaces = [pygame.image.frombuffer(view[offset:offset + length], size, pixel_format)
+                    for offset, length, size, pixel_format in layout]
+        self.mappings.append(mapping)  # Keep the mapping alive for as long as the surfaces use it
+        return surfaces
+
+    @staticmethod
+    def _check(mapping, mtimes):
+        """Check a mapped cache file against the source files, before any surface is made from it.
+
+        Returns:
+            list: The (offset, length, size, pixel format) of each image, or None if the file is
+                corrupt or out of date.
+        """
+        try:
+            magic, count = HEADER.unpack_from(mapping, 0)
+            if magic != MAGIC or count != len(mtimes):
+                return None
+            entries = [ENTRY.unpack_from(mapping, HEADER.size + i * ENTRY.size) for i in range(count)]
+        except struct.error:
+            return None
+
+        offset = HEADER.size + count * ENTRY.size
+        layout = []
+        for (mtime, width, height, pixel_format), source_mtime in zip(entries, mtimes):
+            if mtime != source_mtime:
+                return None
+            pixel_format = pixel_format.rstrip(b'\0').decode()
+            length = width * height * len(pixel_format)
+            if offset + length > len(mapping):
+                return None
+            layout.append((offset, length, (width, height), pixel_format))
+            offset += length
+        return layout
+
+    def _write(self, cache_path, mtimes, surfaces):
+        """Write surfaces to a cache file. Errors are ignored, as the cache is only an optimization."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f'{cache_path}.{os.getpid()}.tmp'
+            with open(temp_path, 'wb') as file:
+                file.write(HEADER.pack(MAGIC, len(surfaces)))
+                formats = []
+                for mtime, surface in zip(mtimes, surfaces):
+                    pixel_format = 'RGBA' if surface.get_flags() & pygame.SRCALPHA else 'RGB'
+                    formats.append(pixel_format)
+                    file.write(ENTRY.pack(mtime, surface.get_width(), surface.get_height(), pixel_format.encode()))
+                for pixel_format, surface in zip(formats, surfaces):
+                    file.write(pygame.image.tobytes(surface, pixel_format))
+            os.replace(temp_path, cache_path)  # Readers never see a partly written file
+        except OSError:
+            pass
+
+
+def get_card_image_paths():
+    """Return the paths of the card face images, by suit and rank, followed by the card back."""
+    paths = [f'resources/images/cards/{rank}_of_{suit}.png' for suit in SUITS for rank in RANKS]
+    paths.append(CARD_BACK_PATH)
+    return paths
+
+
+def load_menu_background(cache):
+    """Load the main menu background image.
+
+    Args:
+        cache (AssetCache): The asset cache to load from.
+
+    Returns:
+        pygame.Surface: The background image.
+    """
+    return cache.load('menu', [MENU_BACKGROUND_PATH])[0]
+
+
+def load_game_assets(cache, card_size, loader=image_cache.get):
+    """Load the card images and the game background.
+
+    This does not need the display, so it can run on a background thread.
+
+    Args:
+        cache (AssetCache): The asset cache to load from.
+        card_size (tuple): The dimensions (width, height) of the cards.
+        loader (callable): The function used to load and scale a source image when the cache is cold.
+
+    Returns:
+        tuple: The card images (keyed by suit and rank, plus 'card_back') and the game background.
+    """
+    surfaces = iter(cache.load('cards', get_card_image_paths(), card_size, loader))
+    card_images = {suit: {rank: next(surfaces) for rank in RANKS} for suit in SUITS}
+    card_images['card_back'] = next(surfaces)
+    background_image_game = cache.load('game', [GAME_BACKGROUND_PATH])[0]
+    return card_images, background_image_game
@@ -0,0 +1,114 @@
+"""
+auto_complete.py
+
+Automatic foundation moves on the headless game state.
+
+`play_safe_moves` sends the cards to the foundations that no tableau move could still need
+(see `solver.is_safe_foundation_move`), so the player does not have to. `auto_complete`
+finishes a game once every tableau card is face up: the lowest card still needed is then
+either on top of its column, since every card above it in a run is lower, or in the stock
+and discard stacks, where turning the stock over reaches it. The whole foundation sequence
+is therefore found in one pass, without any search, and recorded as one undo entry.
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Local Imports
+from game_state import DISCARD, STOCK, TABLEAU, card_rank
+from solver import foundation_target, is_safe_foundation_move
+
+SOURCES = (*TABLEAU, DISCARD)  # The stacks whose top card can go to the foundations
+
+
+def get_safe_move(game_state):
+    """Get a move to the foundations that can never block a win.
+
+    Args:
+        game_state (GameState): The position.
+
+    Returns:
+        tuple: The (from_stack, to_stack) of the move, or None if there is no safe move.
+    """
+    stacks = game_state.stacks
+    for source in SOURCES:
+        if stacks[source]:
+            card = stacks[source][-1]
+            target = foundation_target(game_state, card)
+            if target is not None and is_safe_foundation_move(stacks, card):
+                return source, target
+    return None
+
+
+def play_safe_moves(game_state, linked=False):
+    """Make every safe move to the foundations, including those the previous ones make safe.
+
+    Args:
+        game_state (GameState): The position, changed in place.
+        linked (bool): Whether the moves are undone together with the move before them, e.g.
+            the player's move that made them possible (default: False).
+
+    Returns:
+        list: The moves made, as `Move` objects.
+    """
+    moves = []
+    safe_move = get_safe_move(game_state)
+    while safe_move:
+        source, target = safe_move
+        game_state.move(source, target, 1, linked or bool(moves))
+        moves.append(game_state.history_manager.last_move())  # As recorded, with whether it revealed a card
+        safe_move = get_safe_move(game_state)
+    return moves
+
+
+def can_auto_complete(game_state):
+    """Check if the game can be finished automatically: it is not won yet and every tableau card is face up.
+
+    Args:
+        game_state (GameState): The position.
+
+    Returns:
+        bool: True if `auto_complete` would win the game.
+    """
+    return not game_state.check_win() and not any(game_state.hidden[stack] for stack in TABLEAU)
+
+
+def auto_complete(game_state):
+    """Play every remaining card to the foundations, turning the stock over when needed.
+
+    The moves are recorded as one undo entry. Cards are played from the tableau and the
+    discard stack, lowest first, and the stock is only clicked when none can go up.
+
+    Args:
+        game_state (GameState): The position, changed in place.
+
+    Returns:
+        list: The moves made, as `Move` objects (empty if the game cannot be finished automatically).
+    """
+    if not can_auto_complete(game_state):
+        return []
+    stacks = game_state.stacks
+    moves = []
+    clicks = 0  # Stock clicks since the last foundation move
+    while not game_state.check_win():
+        plays = []
+        for source in SOURCES:
+            if stacks[source]:
+                target = foundation_target(game_state, stacks[source][-1])
+                if target is not None:
+                    plays.append((card_rank(stacks[source][-1]), source, target))
+        if plays:
+            _, source, target = min(plays)
+            game_state.move(source, target, 1, bool(moves))
+            moves.append(game_state.history_manager.last_move())
+            clicks = 0
+            continue
+        # A whole turn of the stock always reaches the next card; stop rather than loop if it did not
+        if clicks > len(stacks[STOCK]) + len(stacks[DISCARD]):
+            break
+        move = game_state.stock_click(bool(moves))
+        if move is None:
+            break
+        moves.append(move)
+        clicks += 1
+    return moves
@@ -0,0 +1,371 @@
+"""
+batch_state.py
+
+Batched game state for Monte Carlo playouts, on NumPy arrays.
+
+This script defines the `BatchState` class, which holds N games at once: the cards of
+every stack of every game in one array, with the stack lengths and the face-down counts
+next to it. Legal moves are a fixed list of actions (a move from one stack to another,
+plus a click on the stock), and the legal-action mask and the moves themselves are
+computed for the whole batch with array operations instead of a Python loop per game.
+`score_moves` plays many biased random games after each candidate move of a position and
+ranks the moves by their win rate, for hints the solver could not settle.
+
+NumPy is required by this module only; the rest of the game runs without it.
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Third-party Library Imports
+import numpy
+
+# Local Imports
+from game_state import (DISCARD, EMPTY, FOUNDATION_ACCEPTS, FOUNDATIONS, STACK_COUNT, STOCK, TABLEAU,
+                        TABLEAU_ACCEPTS)
+from move import Move
+from snapshot import Snapshot
+
+MAX_STACK_SIZE = 52
+
+
+def _build_actions():
+    """Build the list of actions: every (from_stack, to_stack) pair a move can be made between, then the stock click.
+
+    Only one run of a tableau stack can ever go onto a given card (the face-up cards form a
+    run of alternating colors and consecutive ranks), so the number of cards of a tableau
+    move follows from the two stacks and is not part of the action.
+    """
+    actions = [(source, target) for source in TABLEAU for target in (*TABLEAU, *FOUNDATIONS) if target != source]
+    actions.extend((DISCARD, target) for target in (*TABLEAU, *FOUNDATIONS))
+    actions.extend((source, target) for source in FOUNDATIONS for target in TABLEAU)
+    actions.append((STOCK, DISCARD))  # The stock click: deal a card, or recycle the discard stack
+    return numpy.array(actions, dtype=numpy.intp)
+
+
+ACTIONS = _build_actions()
+STOCK_ACTION = len(ACTIONS) - 1
+ACTION_FROM, ACTION_TO = ACTIONS[:STOCK_ACTION, 0], ACTIONS[:STOCK_ACTION, 1]
+RUN_ACTION = (ACTION_FROM < len(TABLEAU)) & (ACTION_TO < len(TABLEAU))  # Tableau to tableau moves
+
+# RANKS[card]: the rank of a card (0 for aces), and 13 for EMPTY, so a run from a king up
+# to a top card of rank r holds 13 - r cards and a run onto a top card of rank t holds t - r
+RANKS = numpy.append(numpy.arange(52) % 13, 13).astype(numpy.int16)
+
+# ACCEPTS[kind, top, card]: whether `card` can go on `top` (EMPTY for an empty stack), kind 0 for
+# tableau and 1 for foundation stacks
+ACCEPTS = numpy.array([[[table[top] >> card & 1 for card in range(52)] for top in range(EMPTY + 1)]
+                       for table in (TABLEAU_ACCEPTS, FOUNDATION_ACCEPTS)], dtype=bool)
+ACTION_KIND = (ACTION_TO >= FOUNDATIONS[0]).astype(numpy.intp)
+ACCEPTS_FLAT = ACCEPTS.ravel()  # Indexed by `ACCEPTS_OFFSET + top * 52 + card`, one lookup instead of three
+ACCEPTS_OFFSET = (ACTION_KIND * (EMPTY + 1) * 52).astype(numpy.int16)
+
+# Weights of the playout policy by kind of move: foundation moves first, then moves turning
+# a tableau card face up, cards off the discard stack, the stock, and last the tableau moves
+# that reveal nothing and foundation cards back down
+FOUNDATION_WEIGHT = 50.0
+REVEAL_WEIGHT = 20.0
+DISCARD_WEIGHT = 5.0
+STOCK_WEIGHT = 1.0
+SHUFFLE_WEIGHT = 0.05
+_weights = numpy.where(ACTION_KIND == 1, FOUNDATION_WEIGHT,
+                       numpy.where(ACTION_FROM == DISCARD, DISCARD_WEIGHT, SHUFFLE_WEIGHT / 5))
+_weights[RUN_ACTION] = SHUFFLE_WEIGHT
+WEIGHTS = numpy.append(_weights, STOCK_WEIGHT).astype(numpy.float32)
+TINY = numpy.finfo(numpy.float32).tiny
+REVEAL_FACTOR = REVEAL_WEIGHT / SHUFFLE_WEIGHT  # Multiplies the weight of a tableau move that turns a card face up
+
+
+class BatchState:
+    """Class to represent N games held in NumPy arrays.
+
+    Attributes:
+        cards (numpy.ndarray): (N, 13, 52) uint8 array of the encoded cards of each stack, bottom card first.
+        lengths (numpy.ndarray): (N, 13) int16 array of the number of cards in each stack.
+        hidden (numpy.ndarray): (N, 13) int16 array of the number of face-down cards at the bottom
+            of each stack (always 0 outside the tableau; the stock is face down as a whole).
+    """
+
+    def __init__(self, size):
+        """Initialize N empty games.
+
+        Args:
+            size (int): The number of games.
+        """
+        self.cards = numpy.zeros((size, STACK_COUNT, MAX_STACK_SIZE), dtype=numpy.uint8)
+        self.lengths = numpy.zeros((size, STACK_COUNT), dtype=numpy.int16)
+        self.hidden = numpy.zeros((size, STACK_COUNT), dtype=numpy.int16)
+        self.rows = numpy.arange(size)[:, None]
+
+    @classmethod
+    def from_game_state(cls, game_state, size):
+        """Create a batch of copies of one position.
+
+        Args:
+            game_state (GameState): The position.
+            size (int): The number of copies.
+
+        Returns:
+            BatchState: The batch.
+        """
+        batch = cls(size)
+        for stack, cards in enumerate(game_state.stacks):
+            batch.cards[:, stack, :len(cards)] = cards
+            batch.lengths[:, stack] = len(cards)
+        batch.hidden[:, :len(TABLEAU)] = game_state.hidden[:len(TABLEAU)]
+        return batch
+
+    @classmethod
+    def from_game_states(cls, game_states):
+        """Create a batch of different positions, one game each.
+
+        Args:
+            game_states (list): The positions.
+
+        Returns:
+            BatchState: The batch.
+        """
+        batch = cls(len(game_states))
+        for game, game_state in enumerate(game_states):
+            for stack, cards in enumerate(game_state.stacks):
+                batch.cards[game, stack, :len(cards)] = cards
+                batch.lengths[game, stack] = len(cards)
+            batch.hidden[game, :len(TABLEAU)] = game_state.hidden[:len(TABLEAU)]
+        return batch
+
+    @property
+    def size(self):
+        """int: The number of games."""
+        return len(self.lengths)
+
+    def face_up_mask(self):
+        """Get which card slots hold a face-up card.
+
+        Returns:
+            numpy.ndarray: (N, 13, 52) bool array.
+        """
+        positions = numpy.arange(MAX_STACK_SIZE)
+        mask = (positions >= self.hidden[:, :, None]) & (positions < self.lengths[:, :, None])
+        mask[:, STOCK] = False
+        return mask
+
+    def top_cards(self):
+        """Get the top card of each stack.
+
+        Returns:
+            numpy.ndarray: (N, 13) array of encoded cards, EMPTY for an empty stack.
+        """
+        tops = self.cards[self.rows, numpy.arange(STACK_COUNT), numpy.maximum(self.lengths - 1, 0)]
+        return numpy.where(self.lengths > 0, tops, EMPTY)
+
+    def foundation_tops(self):
+        """Get the top card of each foundation stack.
+
+        Returns:
+            numpy.ndarray: (N, 4) array of encoded cards, EMPTY for an empty foundation.
+        """
+        return self.top_cards()[:, FOUNDATIONS[0]:]
+
+    def legal_mask(self):
+        """Compute the legal actions of every game.
+
+        Returns:
+            numpy.ndarray: (N, len(ACTIONS)) bool array, True for a legal action.
+        """
+        return self._legal_actions()[0]
+
+    def _legal_actions(self):
+        """Compute the legal actions of every game, and which of them turn a tableau card face up.
+
+        Returns:
+            tuple: Two (N, len(ACTIONS)) bool arrays, the legal actions and the revealing actions.
+        """
+        tops = self.top_cards()
+        ranks = RANKS[tops]
+        source_tops, target_tops = tops[:, ACTION_FROM], tops[:, ACTION_TO]
+        counts = numpy.where(RUN_ACTION, ranks[:, ACTION_TO] - ranks[:, ACTION_FROM], 1)
+        hidden = self.hidden[:, ACTION_FROM]
+        face_up = self.lengths[:, ACTION_FROM] - hidden
+        movable = (counts >= 1) & (counts <= face_up)
+
+        # The base card of a run: `counts - 1` ranks above the top card, of the other color when
+        # that is odd. Only its color and rank matter on the tableau, so it is taken in the top
+        # card's suit (or the first suit of the other color) instead of being read from the stack
+        steps = numpy.clip(counts - 1, 0, 12)
+        cards = source_tops + steps + 26 * (steps & 1)
+        cards -= 52 * (cards >= 52)
+        legal = numpy.empty((self.size, len(ACTIONS)), dtype=bool)
+        legal[:, :STOCK_ACTION] = movable & ACCEPTS_FLAT[ACCEPTS_OFFSET + target_tops * numpy.int16(52) + cards]
+        legal[:, STOCK_ACTION] = (self.lengths[:, STOCK] + self.lengths[:, DISCARD]) > 0
+        reveals = numpy.zeros_like(legal)
+        reveals[:, :STOCK_ACTION] = (counts == face_up) & (hidden > 0)
+        return legal, reveals
+
+    def is_won(self):
+        """Check which games are won.
+
+        Returns:
+            numpy.ndarray: (N,) bool array.
+        """
+        return self.lengths[:, FOUNDATIONS[0]:].sum(axis=1) == 52
+
+    def apply(self, actions):
+        """Make one action in every game. The actions must be legal.
+
+        Args:
+            actions (numpy.ndarray): (N,) array of action indices, or -1 to leave a game as it is.
+        """
+        actions = numpy.asarray(actions)
+        games = numpy.nonzero((actions >= 0) & (actions != STOCK_ACTION))[0]
+        if len(games):
+            chosen = actions[games]
+            sources, targets = ACTION_FROM[chosen], ACTION_TO[chosen]
+            tops = self.top_cards()[games]
+            rows = numpy.arange(len(games))
+            counts = numpy.where(RUN_ACTION[chosen], RANKS[tops[rows, targets]] - RANKS[tops[rows, sources]], 1)
+            self._transfer(games, sources, targets, counts.astype(numpy.int16))
+
+            # Turn the new top card of tableau sources face up
+            tableau = sources < len(TABLEAU)
+            games, sources = games[tableau], sources[tableau]
+            lengths = self.lengths[games, sources]
+            reveal = (lengths > 0) & (self.hidden[games, sources] == lengths)
+            self.hidden[games[reveal], sources[reveal]] -= 1
+
+        games = numpy.nonzero(actions == STOCK_ACTION)[0]
+        if len(games):
+            dealing = self.lengths[games, STOCK] > 0
+            deal_games, recycle_games = games[dealing], games[~dealing]
+            self._transfer(deal_games, numpy.full(len(deal_games), STOCK), numpy.full(len(deal_games), DISCARD),
+                           numpy.ones(len(deal_games), dtype=numpy.int16))
+            self._transfer(recycle_games, numpy.full(len(recycle_games), DISCARD),
+                           numpy.full(len(recycle_games), STOCK), self.lengths[recycle_games, DISCARD],
+                           reverse=True)
+
+    def _transfer(self, games, sources, targets, counts, reverse=False):
+        """Move the top `counts` cards of a source stack onto a target stack, one (source, target, count) per game.
+
+        Args:
+            games (numpy.ndarray): The indices of the games, each at most once.
+            sources (numpy.ndarray): The source stack of each game.
+            targets (numpy.ndarray): The target stack of each game.
+            counts (numpy.ndarray): The number of cards moved in each game.
+            reverse (bool): Whether the moved cards are turned over as a pile (between the stock and the discard stack).
+        """
+        if not len(games):
+            return
+        offsets = numpy.arange(int(counts.max()))
+        moved = offsets < counts[:, None]
+        source_lengths = self.lengths[games, sources][:, None]
+        if reverse:
+            source_positions = source_lengths - 1 - offsets
+        else:
+            source_positions = source_lengths - counts[:, None] + offsets
+        target_positions = self.lengths[games, targets][:, None] + offsets
+
+        game_index = numpy.broadcast_to(games[:, None], moved.shape)[moved]
+        source_index = numpy.broadcast_to(sources[:, None], moved.shape)[moved]
+        target_index = numpy.broadcast_to(targets[:, None], moved.shape)[moved]
+        values = self.cards[game_index, source_index, source_positions[moved]]
+        self.cards[game_index, target_index, target_positions[moved]] = values
+        self.lengths[games, sources] -= counts
+        self.lengths[games, targets] += counts
+
+    def playout(self, max_steps, rng):
+        """Play every game on with biased random moves until it is won, stuck, or out of steps.
+
+        Moves are drawn with the weights of `WEIGHTS` (times `REVEAL_FACTOR` for moves that
+        turn a card face up): every legal action gets an exponential random time scaled down
+        by its weight and the first one to come is made, which draws for the whole batch at
+        once with the same odds as drawing each game's move in proportion to the weights.
+
+        Args:
+            max_steps (int): The maximum number of moves per game.
+            rng (numpy.random.Generator): The random generator.
+
+        Returns:
+            numpy.ndarray: (N,) array of the number of moves made in each game.
+        """
+        moves = numpy.zeros(self.size, dtype=numpy.int32)
+        for _ in range(max_steps):
+            legal, reveals = self._legal_actions()
+            done = self.is_won() | ~legal.any(axis=1)
+            if done.all():
+                break
+            weights = numpy.where(reveals, WEIGHTS * REVEAL_FACTOR, WEIGHTS) * legal
+            times = numpy.maximum(rng.standard_exponential(legal.shape, dtype=numpy.float32), TINY)
+            actions = (weights / times).argmax(axis=1)
+            actions[done] = -1
+            self.apply(actions)
+            moves += ~done
+        return moves
+
+
+def action_to_move(game_state, action):
+    """Convert an action index into the `Move` it makes in a position.
+
+    Args:
+        game_state (GameState): The position.
+        action (int): The action index.
+
+    Returns:
+        Move: The move.
+    """
+    if action == STOCK_ACTION:
+        if game_state.stacks[STOCK]:
+            return Move(STOCK, DISCARD, 1)
+        return Move(DISCARD, STOCK, len(game_state.stacks[DISCARD]))
+    from_stack, to_stack = (int(value) for value in ACTIONS[action])
+    count = 1
+    if RUN_ACTION[action]:
+        source, target = game_state.stacks[from_stack], game_state.stacks[to_stack]
+        count = int(RANKS[target[-1] if target else EMPTY] - RANKS[source[-1]])
+    return Move(from_stack, to_stack, count)
+
+
+def score_moves(game_state, playouts=32, max_steps=300, seed=None):
+    """Score every legal move of a position by the win rate of random playouts after it.
+
+    Args:
+        game_state (GameState): The position.
+        playouts (int): The number of playouts per move (default: 32).
+        max_steps (int): The maximum number of moves per playout (default: 300).
+        seed (int): The seed of the random generator, or None for a random seed.
+
+    Returns:
+        list: (move, win rate, mean number of foundation cards) tuples, best first.
+    """
+    root = BatchState.from_game_state(game_state, 1)
+    snapshot = Snapshot.from_game_state(game_state)
+    candidates = []
+    children = set()
+    for action in numpy.nonzero(root.legal_mask()[0])[0]:
+        # Moves leading to positions that play the same (e.g. a card to either of two empty stacks) are scored once
+        child = snapshot.apply(action_to_move(game_state, action)).canonical_key()
+        if child in children:
+            continue
+        children.add(child)
+        candidates.append(action)
+    if not candidates:
+        return []
+    candidates = numpy.array(candidates)
+
+    batch = BatchState.from_game_state(game_state, len(candidates) * playouts)
+    batch.apply(numpy.repeat(candidates, playouts))
+    batch.playout(max_steps, numpy.random.default_rng(seed))
+
+    win_rates = batch.is_won().reshape(len(candidates), playouts).mean(axis=1)
+    progress = batch.lengths[:, FOUNDATIONS[0]:].sum(axis=1).reshape(len(candidates), playouts).mean(axis=1)
+    order = numpy.lexsort((-progress, -win_rates))
+    return [(action_to_move(game_state, candidates[index]), float(win_rates[index]), float(progress[index]))
+            for index in order]
+
+
+def best_move(game_state, playouts=32, max_steps=300, seed=None):
+    """Get the move of a position with the best playout win rate (ties broken by foundation progress).
+
+    Returns:
+        Move: The best move, or None if there is no legal move.
+    """
+    scores = score_moves(game_state, playouts, max_steps, seed)
+    return scores[0][0] if scores else None
@@ -0,0 +1,10 @@
+"""
+benchmarks
+
+Benchmark scripts for the Solitaire game. Run them from the project root, for example:
+
+    python -m benchmarks.blit_atlas
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
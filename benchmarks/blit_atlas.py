@@ -0,0 +1,82 @@
+"""
+blit_atlas.py
+
+Benchmark of drawing a full 52-card table with and without the card atlas.
+
+The "before" run draws every stack from the card images as loaded from disk, which
+are not in the display's pixel format. The "after" run draws from the converted
+`CardAtlas`. Run it from the project root:
+
+    python -m benchmarks.blit_atlas [frames]
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Standard Imports
+import logging
+import sys
+import time
+
+import pygame
+
+# Local Imports
+from card_atlas import CardAtlas
+from deck import Deck
+from game_state import SUITS, RANKS
+from image_cache import image_cache, CARD_BACK_PATH
+
+SCREEN_SIZE = (1440, 800)
+CARD_SIZE = (100, 150)
+
+
+def count_blits(deck):
+    """Return the number of card blits needed to draw every stack of the deck once."""
+    blits = 0
+    for stack in deck.stacks:
+        if stack.is_discard or stack.is_foundation:
+            blits += 1 if stack.cards else 0
+        else:
+            blits += len(stack.cards)
+    return blits
+
+
+def run(screen, deck, atlas, frames):
+    """Draw every stack `frames` times and return the number of blits per second."""
+    start = time.perf_counter()
+    for _ in range(frames):
+        for stack in deck.stacks:
+            stack.draw(screen, atlas)
+    elapsed = time.perf_counter() - start
+    return count_blits(deck) * frames / elapsed
+
+
+def main():
+    """Run the benchmark and print the results."""
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    logging.disable(logging.CRITICAL)
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+
+    images = {suit: {rank: image_cache.get(f'resources/images/cards/{rank}_of_{suit}.png', CARD_SIZE)
+                     for rank in RANKS} for suit in SUITS}
+    images['card_back'] = image_cache.get(CARD_BACK_PATH, CARD_SIZE)
+
+    deck = Deck((0, 0), images, CARD_SIZE)
+    deck.setup_stacks(SCREEN_SIZE)
+    # Turn every tableau card face up, so the faces are drawn as well as the backs
+    for stack in deck.stacks[:7]:
+        for card in stack.cards:
+            card.face_up = True
+
+    atlas = CardAtlas(images, CARD_SIZE)
+    print(f"Table: {count_blits(deck)} card blits per frame, {frames} frames")
+    before = run(screen, deck, None, frames)
+    print(f"Before (unconverted images): {before:,.0f} blits/s")
+    after = run(screen, deck, atlas, frames)
+    print(f"After (converted atlas):     {after:,.0f} blits/s ({after / before:.1f}x)")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+drag_motion.py
+
+Benchmark of the per-frame cost of handling mouse motion while dragging a run of cards.
+
+Synthetic frames hold a growing number of queued motion events, and the dragged run
+grows from 1 to 13 cards. The "before" column moves every card for every event, as the
+event loop used to; the "after" column collapses the events with `coalesce_motion` and
+moves the run as one group with `Deck.drag_to`. Run it from the project root:
+
+    python -m benchmarks.drag_motion [frames]
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Standard Imports
+import logging
+import sys
+import time
+
+import pygame
+
+# Local Imports
+from deck import Deck
+from game_state import SUITS, RANKS, encode_card
+from input_events import coalesce_motion
+
+SCREEN_SIZE = (1440, 800)
+CARD_SIZE = (100, 150)
+
+
+def make_deck(run_length):
+    """Create a deck whose first tableau stack is a face-up run of `run_length` cards, from the king down."""
+    images = {suit: {rank: pygame.Surface(CARD_SIZE) for rank in RANKS} for suit in SUITS}
+    images['card_back'] = pygame.Surface(CARD_SIZE)
+    deck = Deck((0, 0), images, CARD_SIZE)
+    deck.setup_stacks(SCREEN_SIZE)
+
+    state = deck.game_state
+    run = [encode_card(RANKS[12 - i], 'spades' if i % 2 == 0 else 'hearts') for i in range(run_length)]
+    for stack in state.stacks:
+        stack[:] = [card for card in stack if card not in run]
+    state.stacks[0] = run
+    state.hidden[0] = 0
+    deck.sync_stacks()
+    return deck
+
+
+def make_frame(events_per_frame, frame):
+    """Create the motion events of one frame."""
+    return [pygame.event.Event(pygame.MOUSEMOTION, pos=(300 + frame % 50 + i, 400 + i), rel=(1, 1), buttons=(1, 0, 0))
+            for i in range(events_per_frame)]
+
+
+def handle_before(deck, events):
+    """Handle motion the old way: every event moves every dragged card."""
+    for event in events:
+        if event.type == pygame.MOUSEMOTION:
+            for card in deck.dragged_cards:
+                card.update_position(event.pos)
+
+
+def handle_after(deck, events):
+    """Handle motion the new way: one group move per run of motion events."""
+    for event in coalesce_motion(events):
+        if event.type == pygame.MOUSEMOTION:
+            deck.drag_to(event.pos)
+
+
+def measure(handle, run_length, events_per_frame, frames):
+    """Return the average time in microseconds to handle one frame of motion events."""
+    deck = make_deck(run_length)
+    stack = deck.stacks[0]
+    deck.start_dragging(stack, stack.cards[0].get_draggable_stack(), stack.cards[0].position)
+    batches = [make_frame(events_per_frame, frame) for frame in range(frames)]
+    start = time.perf_counter()
+    for events in batches:
+        handle(deck, events)
+        deck.pop_dirty_rects()
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+def main():
+    """Run the benchmark and print the results."""
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    logging.disable(logging.CRITICAL)
+    pygame.init()
+    pygame.display.set_mode(SCREEN_SIZE)
+    print(f"{'run':>4} {'events/frame':>13} {'before (us/frame)':>18} {'after (us/frame)':>17}")
+    for run_length in (1, 6, 13):
+        for events_per_frame in (1, 8, 32, 128):
+            before = measure(handle_before, run_length, events_per_frame, frames)
+            after = measure(handle_after, run_length, events_per_frame, frames)
+            print(f"{run_length:>4} {events_per_frame:>13} {before:>18.1f} {after:>17.1f}")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
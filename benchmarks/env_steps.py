@@ -0,0 +1,76 @@
+"""
+env_steps.py
+
+Benchmark of environment steps per second.
+
+Plays random legal actions on `SolitaireEnv` (one game, on `GameState`), on an in-process
+`VectorEnv` (every game on one `BatchState`) and on a `VectorEnv` split across worker
+processes, and counts the steps made per second (one step is one action in one game).
+Run it from the project root:
+
+    python -m benchmarks.env_steps [games] [steps] [workers]
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Standard Imports
+import multiprocessing
+import sys
+import time
+
+# Third-party Library Imports
+import numpy
+
+# Local Imports
+from solitaire_env import SolitaireEnv, VectorEnv
+
+
+def random_actions(mask, rng):
+    """Pick a random legal action in every row of an action mask."""
+    return (rng.random(mask.shape) * mask).argmax(axis=-1)
+
+
+def rate_single(steps, rng):
+    """Step one SolitaireEnv and return the number of steps per second."""
+    env = SolitaireEnv()
+    _, info = env.reset(0)
+    start = time.perf_counter()
+    for _ in range(steps):
+        _, _, terminated, truncated, info = env.step(random_actions(info['action_mask'], rng))
+        if terminated or truncated:
+            _, info = env.reset(env.deal_number + 1)
+    return steps / (time.perf_counter() - start)
+
+
+def rate_vector(env, steps, rng):
+    """Step a VectorEnv and return the number of steps per second, over all its games."""
+    _, info = env.reset(0)
+    start = time.perf_counter()
+    for _ in range(steps):
+        info = env.step(random_actions(info['action_mask'], rng))[4]
+    return steps * env.num_envs / (time.perf_counter() - start)
+
+
+def main():
+    """Run the benchmark and print the results."""
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else multiprocessing.cpu_count()
+    rng = numpy.random.default_rng(0)
+
+    single = rate_single(steps * 10, rng)
+    print(f"{'SolitaireEnv:':<42}{single:>12,.0f} steps/s")
+    in_process = rate_vector(VectorEnv(games), steps, rng)
+    print(f"{f'VectorEnv, {games} games in-process:':<42}{in_process:>12,.0f} steps/s ({in_process / single:.1f}x)")
+    env = VectorEnv(games, workers=workers)
+    try:
+        across = rate_vector(env, steps, rng)
+    finally:
+        env.close()
+    label = f'VectorEnv, {games} games on {workers} workers:'
+    print(f"{label:<42}{across:>12,.0f} steps/s ({across / single:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
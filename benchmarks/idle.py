@@ -0,0 +1,80 @@
+"""
+idle.py
+
+Benchmark of the CPU time and wakeups per second of an idle main loop.
+
+The "before" run is the old fixed 60 FPS loop (tick, poll events, redraw the full
+background, flip). The "after"
+run uses `FrameScheduler`, with a hint highlight timer running out halfway through, as
+in the game screen. No input arrives during either run. Run it from the project root:
+
+    python -m benchmarks.idle [seconds]
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Standard Imports
+import sys
+import time
+
+import pygame
+
+# Local Imports
+from scheduler import FrameScheduler
+
+SCREEN_SIZE = (1440, 800)
+FPS = 60
+
+
+def fixed_rate_loop(seconds):
+    """Run the old fixed frame rate loop. Returns the number of iterations."""
+    screen = pygame.display.get_surface()
+    background = pygame.Surface(SCREEN_SIZE)
+    clock = pygame.time.Clock()
+    wakeups = 0
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        clock.tick(FPS)
+        pygame.event.get()
+        screen.blit(background, (0, 0))
+        pygame.display.flip()
+        wakeups += 1
+    return wakeups
+
+
+def scheduled_loop(seconds):
+    """Run the scheduled loop with one timer running out halfway. Returns the number of iterations."""
+    scheduler = FrameScheduler(FPS)
+    start = time.perf_counter()
+    timers = [start + seconds / 2, start + seconds]
+    while timers:
+        timers = [timer for timer in timers if timer > time.perf_counter()]
+        timeout = int((timers[0] - time.perf_counter()) * 1000) + 1 if timers else None
+        if timeout is not None:
+            scheduler.next_events(False, timeout)
+    return scheduler.wakeups
+
+
+def measure(loop, seconds):
+    """Run a loop and return its CPU usage (as a fraction of one core) and wakeups per second."""
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    wakeups = loop(seconds)
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    return cpu / wall, wakeups / wall
+
+
+def main():
+    """Run the benchmark and print the results."""
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    pygame.init()
+    pygame.display.set_mode(SCREEN_SIZE)
+    pygame.event.set_blocked(None)  # Nothing from the system should wake the idle loops
+    for label, loop in (('Before (fixed 60 FPS)', fixed_rate_loop), ('After (event-driven)', scheduled_loop)):
+        cpu, wakeups = measure(loop, seconds)
+        print(f"{label:22} idle CPU {cpu * 100:5.1f}%, {wakeups:6.1f} wakeups/s")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
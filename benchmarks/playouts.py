@@ -0,0 +1,71 @@
+"""
+playouts.py
+
+Benchmark of random playout moves per second.
+
+"Before" plays the games one at a time on `GameState`, with random legal moves from the
+`LegalMoveIndex` (the random policy of the batch simulator). "After" plays the same number
+of games at once on `BatchState`, whose legal-action mask and moves are array operations
+over the whole batch. Both play up to the same number of moves per game from the deals
+numbered from 0; the batch draws its moves with the weights of its playout policy, so the
+two policies differ but every move is validated and made in both. Run it from the project
+root:
+
+    python -m benchmarks.playouts [games] [moves per game]
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Standard Imports
+import random
+import sys
+import time
+
+# Third-party Library Imports
+import numpy
+
+# Local Imports
+from batch_state import BatchState, score_moves
+from deals import deal_batch, deal_cards
+from game_state import GameState
+from simulate import play_random
+
+
+def main():
+    """Run the benchmark and print the results."""
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    max_moves = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+
+    start = time.perf_counter()
+    before_moves = 0
+    for deal_number in range(games):
+        state = GameState(max_history=max_moves + 1)
+        state.deal(deal_cards(deal_number))
+        before_moves += play_random(state, max_moves, random.Random(deal_number))
+    before = before_moves / (time.perf_counter() - start)
+
+    # Every game of the batch gets its own deal
+    states = []
+    for cards in deal_batch(0, games):
+        state = GameState()
+        state.deal(cards.tolist())
+        states.append(state)
+    batch = BatchState.from_game_states(states)
+    start = time.perf_counter()
+    after_moves = int(batch.playout(max_moves, numpy.random.default_rng(0)).sum())
+    after = after_moves / (time.perf_counter() - start)
+
+    print(f"Before (GameState, one game at a time): {before:>12,.0f} moves/s")
+    print(f"After (BatchState, {games} games at once): {after:>12,.0f} moves/s ({after / before:.1f}x), "
+          f"{batch.is_won().mean():.1%} of the playouts won")
+
+    state = GameState()
+    state.deal(deal_cards(0))
+    start = time.perf_counter()
+    scores = score_moves(state, seed=0)
+    print(f"Scoring the {len(scores)} moves of deal 0 by playouts: {time.perf_counter() - start:.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+snapshots.py
+
+Benchmark of branching from a position: trying every legal move of it.
+
+"Try and revert" makes each move on one `GameState` and undoes it again, as a lookahead on the
+live position has to; "copy" makes each move on a fresh copy of the game state, so every
+branch can be kept; "snapshot" applies each move to a `Snapshot`, which keeps every branch too
+but shares the untouched stacks with the parent. The positions are taken along random games
+from the deals numbered from 0, and the moves of each are listed once, outside the timing.
+Memory is the size of the objects a kept branch adds. Run it from the project root:
+
+    python -m benchmarks.snapshots [games] [moves per game]
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Standard Imports
+import random
+import sys
+import time
+
+# Local Imports
+from deals import deal_cards
+from game_state import STOCK, GameState
+from snapshot import Snapshot
+
+
+def make(state, move):
+    """Make a move on a game state, a stock click included."""
+    if move.from_stack == STOCK or move.to_stack == STOCK:
+        state.stock_click()
+    else:
+        state.move(move.from_stack, move.to_stack, move.count)
+
+
+def collect_positions(games, max_moves):
+    """Play random games and return (game state, snapshot, legal moves) for each position reached."""
+    rng = random.Random(0)
+    positions = []
+    for deal_number in range(games):
+        state = GameState()
+        state.deal(deal_cards(deal_number))
+        for _ in range(max_moves):
+            snapshot = Snapshot.from_game_state(state)
+            moves = snapshot.get_moves()
+            if not moves:
+                break
+            positions.append((state.copy(), snapshot, moves))
+            make(state, rng.choice(moves))
+    return positions
+
+
+def game_state_size(state):
+    """Return the number of bytes of a game state copy: its object, stacks, history and visit count."""
+    return (sys.getsizeof(state) + sys.getsizeof(state.__dict__) + sys.getsizeof(state.stacks) +
+            sum(sys.getsizeof(cards) for cards in state.stacks) + sys.getsizeof(state.hidden) +
+            sys.getsizeof(state.history_manager) + sys.getsizeof(state.history_manager.__dict__) +
+            sys.getsizeof(state.history_manager.history) + sys.getsizeof(state.position_visits))
+
+
+def snapshot_size(child, parent):
+    """Return the number of bytes a snapshot adds to its parent: the objects it does not share."""
+    size = sys.getsizeof(child) + sys.getsizeof(child.stacks)
+    size += sum(sys.getsizeof(cards) for cards, shared in zip(child.stacks, parent.stacks) if cards is not shared)
+    if child.hidden is not parent.hidden:
+        size += sys.getsizeof(child.hidden)
+    return size
+
+
+def main():
+    """Run the benchmark and print the results."""
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    max_moves = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    positions = collect_positions(games, max_moves)
+    branches = sum(len(moves) for _, _, moves in positions)
+
+    start = time.perf_counter()
+    for state, _, moves in positions:
+        for move in moves:
+            make(state, move)
+            state.undo_last_move()
+    revert = branches / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for state, _, moves in positions:
+        for move in moves:
+            make(state.copy(), move)
+    copy = branches / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _, snapshot, moves in positions:
+        for move in moves:
+            snapshot.apply(move)
+    apply = branches / (time.perf_counter() - start)
+
+    state, snapshot, moves = positions[len(positions) // 2]
+    copy_bytes = game_state_size(state.copy())
+    snapshot_bytes = sum(snapshot_size(snapshot.apply(move), snapshot) for move in moves) / len(moves)
+
+    print(f'{len(positions)} positions, {branches} branches')
+    print(f"{'Try and revert (GameState):':<30}{revert:>12,.0f} branches/s, no branch kept")
+    print(f"{'Copy (GameState):':<30}{copy:>12,.0f} branches/s, {copy_bytes:,} bytes per kept branch")
+    print(f"{'Snapshot:':<30}{apply:>12,.0f} branches/s ({apply / copy:.1f}x copy), "
+          f"{snapshot_bytes:,.0f} bytes per kept branch")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+startup.py
+
+Benchmark of the time to the first menu frame and to the first game frame, with a
+cold and a warm on-disk asset cache. It follows the same steps as main.py: the menu
+background is loaded first, then the card images and the game background load on a
+background thread while the menu is drawn. Run it from the project root:
+
+    python -m benchmarks.startup
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Standard Imports
+import logging
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+# Local Imports
+from asset_cache import AssetCache, load_menu_background, load_game_assets
+from deck import Deck
+from image_cache import image_cache
+
+SCREEN_SIZE = (1440, 800)
+CARD_SIZE = (100, 150)
+
+
+def measure(screen, cache_dir):
+    """Start the game once and return the times to the first menu frame and the first game frame, in ms."""
+    image_cache.clear()
+    start = time.perf_counter()
+
+    cache = AssetCache(cache_dir)
+    background_image = load_menu_background(cache)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        game_assets = executor.submit(load_game_assets, cache, CARD_SIZE)
+        screen.blit(background_image, (0, 0))
+        pygame.display.flip()
+        first_menu_frame = time.perf_counter() - start
+
+        card_images, background_image_game = game_assets.result()
+    deck = Deck((0, 0), card_images, CARD_SIZE)
+    deck.setup_stacks(SCREEN_SIZE)
+    screen.blit(background_image_game, (0, 0))
+    deck.draw(screen)
+    pygame.display.flip()
+    first_game_frame = time.perf_counter() - start
+    return first_menu_frame * 1000, first_game_frame * 1000
+
+
+def main():
+    """Run the benchmark and print the results."""
+    logging.disable(logging.CRITICAL)
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for label in ('cold', 'warm'):
+            menu, game = measure(screen, cache_dir)
+            print(f"{label}: first menu frame {menu:7.1f} ms, first game frame {game:7.1f} ms")
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+validation.py
+
+Microbenchmark of move validations per second.
+
+"Before" is the original string-based `Stack.can_add_card`, which rebuilt its rank
+mapping on every call and compared suit, rank and color strings. "After" is the same
+check through `can_place` and `GameState.can_add_card`, which look the move up in
+precomputed bit tables. Run it from the project root:
+
+    python -m benchmarks.validation [validations]
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Standard Imports
+import random
+import sys
+import time
+
+# Local Imports
+from game_state import GameState, SUITS, RANKS, can_place, card_color, stack_type
+
+
+class StringCard:
+    """Card with the string attributes the original validation used."""
+
+    def __init__(self, code):
+        self.rank = RANKS[code % 13]
+        self.suit = SUITS[code // 13]
+        self.color = card_color(code)
+
+
+def string_can_add_card(deck_type, cards, card):
+    """The original `Stack.can_add_card`, on a stack type and a list of `StringCard`."""
+    rank_mapping = {
+        'ace': 1, '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8,
+        '9': 9, '10': 10, 'jack': 11, 'queen': 12, 'king': 13
+    }
+    if deck_type == 'stock' or deck_type == 'discard':
+        return False
+    if deck_type == 'foundation':
+        if not cards:
+            return card.rank == 'ace'
+        top_card = cards[-1]
+        return (card.suit == top_card.suit) and (rank_mapping[card.rank] == rank_mapping[top_card.rank] + 1)
+    if not cards:
+        return card.rank == 'king'
+    top_card = cards[-1]
+    return card.color != top_card.color and rank_mapping[card.rank] == rank_mapping[top_card.rank] - 1
+
+
+def rate(function, cases):
+    """Run a validation function over all cases and return the number of validations per second."""
+    start = time.perf_counter()
+    for case in cases:
+        function(*case)
+    return len(cases) / (time.perf_counter() - start)
+
+
+def main():
+    """Run the benchmark and print the results."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    rng = random.Random(0)
+    samples = [(rng.randrange(13), rng.choice([None] + list(range(52))), rng.randrange(52)) for _ in range(count)]
+
+    string_cases = [(stack_type(stack), [] if top is None else [StringCard(top)], StringCard(card))
+                    for stack, top, card in samples]
+    type_cases = [(stack_type(stack), top, card) for stack, top, card in samples]
+
+    # GameState.can_add_card reads the top card from the state, so give each stack a fixed top card
+    state = GameState()
+    state_cases = [(stack, card) for stack, _, card in samples]
+    for stack in range(13):
+        state.stacks[stack] = [] if stack % 5 == 0 else [rng.randrange(52)]
+
+    before = rate(string_can_add_card, string_cases)
+    after = rate(can_place, type_cases)
+    after_state = rate(state.can_add_card, state_cases)
+    print(f"Before (strings):               {before:>12,.0f} validations/s")
+    print(f"After (can_place tables):       {after:>12,.0f} validations/s ({after / before:.1f}x)")
+    print(f"After (GameState.can_add_card): {after_state:>12,.0f} validations/s ({after_state / before:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -13,6 +13,10 @@ Created: 24-12-2024
 
 import pygame
 
+# Local Imports
+from game_state import encode_card, card_color
+from image_cache import image_cache, CARD_BACK_PATH
+
 class Card:
     """Class to represent a card object.
 
@@ -27,8 +31,10 @@ class Card:
         offset (tuple): The offset between the mouse position and the card's position during drag-and-drop.
         original_stack (list): The original stack for the card before dragging.
         stack (list): The current stack of cards the card belongs to.
+        index (int): The position of the card in its stack (0 is the bottom card), kept up to date by the stack.
         highlight (bool): Whether the card is highlighted.
         color (str): The color of the card ('red' for hearts/diamonds, 'black' for clubs/spades).
+        code (int): The integer encoding of the card used by the game state.
         back_image (pygame.Surface): The back image of the card.
     """
 
@@ -53,16 +59,16 @@ class Card:
         self.offset = (0, 0)
         self.original_stack = None  # Track the original stack
         self.stack = None  # Track the current stack
+        self.index = None  # Track the position of the card in the current stack
         self.highlight = False
+        self.in_flight = False  # Drawn by the deck while flying to its stack, not by the stack
 
-        # Assign the color of the card
-        if self.suit in ['diamonds', 'hearts']:
-            self.color = 'red'
-        else:
-            self.color = 'black'
+        # Assign the integer encoding and the color of the card
+        self.code = encode_card(rank, suit)
+        self.color = card_color(self.code)
 
-        self.back_image = pygame.image.load('resources/images/cards/card_back.png')
-        self.back_image = pygame.transform.scale(self.back_image, self.card_size)
+        # The back image is shared by all cards of the same size
+        self.back_image = image_cache.get(CARD_BACK_PATH, self.card_size)
 
     def start_drag(self, mouse_position):
         """Start dragging the card.
@@ -113,8 +119,7 @@ class Card:
             return []
         if self.stack is None:
             raise ValueError("Card is not in a stack")
-        index = self.stack.cards.index(self)
-        return self.stack.cards[index:]
+        return self.stack.cards[self.index:]
 
     def __str__(self):
         """Return the string representation of the card.
@@ -0,0 +1,100 @@
+"""
+card_atlas.py
+
+Texture atlas for card images.
+
+This script defines the `CardAtlas` class, which packs all 52 card faces and the card
+back into a single surface converted to the display's pixel format, so drawing a card
+is a plain copy instead of a per-pixel format conversion on every frame.
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+import pygame
+
+# Local Imports
+from game_state import SUITS, RANKS
+
+BACK = 52  # Index of the card back in `CardAtlas.rects`
+
+
+class CardAtlas:
+    """Class to represent an atlas of card images.
+
+    The faces are laid out in rows by suit and columns by rank, followed by a row
+    holding the card back.
+
+    Attributes:
+        card_size (tuple): The dimensions (width, height) of a card.
+        surface (pygame.Surface): The atlas surface, in the display's pixel format.
+        rects (list): The area of each card in the atlas, indexed by the card's
+            integer encoding, with the back at index `BACK`.
+    """
+
+    def __init__(self, images, card_size):
+        """Build the atlas from the card images.
+
+        The display mode must be set before the atlas is built.
+
+        Args:
+            images (dict): The card images, keyed by suit and rank, plus 'card_back'.
+            card_size (tuple): The dimensions (width, height) of a card.
+        """
+        self.card_size = card_size
+        width, height = card_size
+        atlas = pygame.Surface((width * len(RANKS), height * (len(SUITS) + 1)), pygame.SRCALPHA)
+        atlas.fill((0, 0, 0, 0))
+
+        self.rects = []
+        for row, suit in enumerate(SUITS):
+            for column, rank in enumerate(RANKS):
+                self.rects.append(self._pack(atlas, images[suit][rank], column * width, row * height))
+        self.rects.append(self._pack(atlas, images['card_back'], 0, len(SUITS) * height))
+
+        self.surface = atlas.convert_alpha()
+
+    def _pack(self, atlas, image, x, y):
+        """Copy an image into the atlas at (x, y), scaling it to the card size if needed.
+
+        Returns:
+            pygame.Rect: The area of the image in the atlas.
+        """
+        if image.get_size() != tuple(self.card_size):
+            image = pygame.transform.scale(image, self.card_size)
+        # Copy the pixels, alpha included, instead of blending them onto the empty atlas
+        atlas.blit(image, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        return pygame.Rect((x, y), self.card_size)
+
+    def get_rect(self, card):
+        """Return the area of the atlas to draw for a card, depending on whether it is face up.
+
+        Args:
+            card (Card): The card to draw.
+
+        Returns:
+            pygame.Rect: The area of the card's face or back in the atlas.
+        """
+        return self.rects[card.code if card.face_up else BACK]
+
+    def subsurface(self, suit, rank):
+        """Return the image of a card face as a subsurface of the atlas.
+
+        Args:
+            suit (str): The suit of the card.
+            rank (str): The rank of the card.
+
+        Returns:
+            pygame.Surface: A subsurface sharing the atlas pixels.
+        """
+        return self.surface.subsurface(self.rects[SUITS.index(suit) * 13 + RANKS.index(rank)])
+
+    def blit(self, screen, card, position=None):
+        """Draw a card from the atlas.
+
+        Args:
+            screen (pygame.Surface): The surface to draw on.
+            card (Card): The card to draw, face or back depending on its state.
+            position (tuple): The (x, y) position to draw at (default: the card's position).
+        """
+        screen.blit(self.surface, position or card.position, self.get_rect(card))
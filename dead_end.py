@@ -0,0 +1,157 @@
+"""
+dead_end.py
+
+Dead-end detection on the headless game state.
+
+A game can only be won by making progress: putting a card that is not there yet on the
+foundations, turning a face-down tableau card up, or getting a card out of the stock and
+discard stacks onto the tableau or the foundations. Until one of those happens, the
+face-down cards and the stock and discard cards stay where they are, and a face-up tableau
+card only comes to the top of its column when the run above it moves onto the other card of
+the same rank and color, which must have come to the top first. `is_dead_end` finds the
+cards that can ever come to the top that way, then checks whether any first progress is
+possible, with every card of the stock and discard stacks counted as reachable (a full
+cycle of the stock turns each of them up). When none is, no sequence of moves can ever make
+progress and the game is lost. It is a few scans over the 52 cards, cheap enough to run
+after every move.
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Local Imports
+from game_state import DISCARD, EMPTY, FOUNDATION_ACCEPTS, FOUNDATIONS, STOCK, TABLEAU, TABLEAU_ACCEPTS
+
+
+def _build_parent_masks():
+    """Build, for each card, the bit mask of the cards it can be placed on in the tableau.
+
+    Returns:
+        list: 52 bit masks, bit `top` set when the card can go on `top`.
+    """
+    parents = [0] * 52
+    for top in range(52):
+        for card in range(52):
+            if TABLEAU_ACCEPTS[top] >> card & 1:
+                parents[card] |= 1 << top
+    return parents
+
+
+PARENT_MASKS = _build_parent_masks()
+
+
+def _card_mask(cards):
+    """Get the bit mask of a list of encoded cards."""
+    mask = 0
+    for card in cards:
+        mask |= 1 << card
+    return mask
+
+
+def can_empty_column(game_state, exposed):
+    """Check if a column is empty, or can be emptied by moving its run onto an exposable card.
+
+    Args:
+        game_state (GameState): The position.
+        exposed (int): The bit mask of the exposable cards (see `get_exposable_cards`).
+
+    Returns:
+        bool: True if a king can get an empty column.
+    """
+    stacks, hidden = game_state.stacks, game_state.hidden
+    return any(not stacks[stack] or (not hidden[stack] and PARENT_MASKS[stacks[stack][0]] & exposed)
+               for stack in TABLEAU)
+
+
+def get_exposable_cards(game_state):
+    """Get the cards that can come to the top of a tableau stack before the game makes any progress.
+
+    Those are the top cards and, repeated until nothing changes, every face-up tableau card
+    whose run above can move onto a card already found (the other card of its rank and
+    color), and every foundation card that can come down onto one, after the cards above it.
+
+    Args:
+        game_state (GameState): The position.
+
+    Returns:
+        int: The bit mask of the cards.
+    """
+    stacks, hidden = game_state.stacks, game_state.hidden
+    exposed = 0
+    for stack in TABLEAU:
+        if stacks[stack]:
+            exposed |= 1 << stacks[stack][-1]
+
+    changed = True
+    while changed:
+        changed = False
+        for stack in TABLEAU:
+            cards = stacks[stack]
+            for position in range(hidden[stack], len(cards) - 1):
+                card = cards[position]
+                if not exposed >> card & 1 and PARENT_MASKS[cards[position + 1]] & exposed & ~(1 << card):
+                    exposed |= 1 << card
+                    changed = True
+
+        empty_column = can_empty_column(game_state, exposed)
+        for stack in FOUNDATIONS:
+            for card in reversed(stacks[stack]):
+                if exposed >> card & 1:
+                    continue
+                if not (PARENT_MASKS[card] & exposed or empty_column and TABLEAU_ACCEPTS[EMPTY] >> card & 1):
+                    break
+                exposed |= 1 << card
+                changed = True
+    return exposed
+
+
+def is_dead_end(game_state):
+    """Check if a position can never make progress again, so the game can no longer be won.
+
+    The check only answers True when that is certain; a position it answers False for
+    may still be lost.
+
+    Args:
+        game_state (GameState): The position.
+
+    Returns:
+        bool: True if no sequence of moves can put a new card on the foundations, turn a
+            tableau card face up, or play a card out of the stock and discard stacks.
+    """
+    if game_state.check_win():
+        return False
+    stacks, hidden = game_state.stacks, game_state.hidden
+
+    reserve = _card_mask(stacks[STOCK]) | _card_mask(stacks[DISCARD])
+    exposed = get_exposable_cards(game_state)
+
+    # A card not on the foundations yet can go up if it is the next card of a foundation
+    # (foundation cards coming down first does not change which cards are next)
+    foundation_cards = 0
+    foundation_next = 0
+    for stack in FOUNDATIONS:
+        foundation_cards |= _card_mask(stacks[stack])
+        foundation_next |= FOUNDATION_ACCEPTS[stacks[stack][-1] if stacks[stack] else EMPTY]
+    if foundation_next & (exposed | reserve) & ~foundation_cards:
+        return False
+
+    empty_column = can_empty_column(game_state, exposed)
+
+    def can_be_placed(card):
+        if PARENT_MASKS[card] & exposed:
+            return True
+        return empty_column and TABLEAU_ACCEPTS[EMPTY] >> card & 1
+
+    # A face-down card is turned up once the run above it moves away
+    for stack in TABLEAU:
+        if hidden[stack] and can_be_placed(stacks[stack][hidden[stack]]):
+            return False
+
+    # A stock or discard card is played once it goes on the tableau
+    card = 0
+    while reserve:
+        if reserve & 1 and can_be_placed(card):
+            return False
+        reserve >>= 1
+        card += 1
+    return True
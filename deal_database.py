@@ -0,0 +1,205 @@
+"""
+deal_database.py
+
+Memory-mapped database of solved deals.
+
+This script defines the `DealDatabase` class, which reads a file of precomputed solver
+outcomes for a range of deal numbers: whether each deal is winnable, proven unwinnable or
+unknown (the solver's pruned search finding no line is not a proof), the length of the winning line found and the number of nodes
+the search needed. Winnable deals are also listed by difficulty band (how much search the
+solver needed), so a winnable deal of a given difficulty is picked in O(1) at game start.
+The file is memory-mapped and only the pages holding the records actually read are loaded.
+
+File layout (little-endian):
+    header: magic b'SDB1', first deal number (uint64), deal count, band count (uint32)
+    band:   offset of the band's deal list in the file (uint64), deal count (uint32), one per band
+    record: outcome, unused (uint8), winning line length (uint16), nodes searched (uint32), one per deal
+    then the deal list of every band: deal numbers relative to the first deal (uint32)
+
+Build a database from the project root with, for example:
+
+    python deal_database.py --first 0 --count 100000 --max-nodes 20000 --output deals.db
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Standard Imports
+from array import array
+import argparse
+import mmap
+import multiprocessing
+import random
+import struct
+import sys
+
+# Local Imports
+from simulate import init_worker, positive_int, run_deal
+from solver import WON, LOST
+
+MAGIC = b'SDB1'
+HEADER = struct.Struct('<4sQII')
+BAND = struct.Struct('<QI')
+RECORD = struct.Struct('<BBHI')
+
+# Record outcomes
+UNKNOWN = 0
+WINNABLE = 1
+UNWINNABLE = 2  # Proven lost only: `run_deal` reports 'lost' for the solver only then
+OUTCOMES = {WON: WINNABLE, LOST: UNWINNABLE}
+
+# Difficulty bands of winnable deals, by the number of nodes the solver searched
+BANDS = ['easy', 'medium', 'hard']
+BAND_LIMITS = [150, 1000]  # Upper node limits of every band but the last
+
+
+def get_band(nodes):
+    """Return the index of the difficulty band of a winnable deal.
+
+    Args:
+        nodes (int): The number of nodes the solver searched to win the deal.
+
+    Returns:
+        int: The index into `BANDS`.
+    """
+    for band, limit in enumerate(BAND_LIMITS):
+        if nodes < limit:
+            return band
+    return len(BAND_LIMITS)
+
+
+def write_database(path, first, results):
+    """Write a database file.
+
+    Args:
+        path (str): The path of the file to write.
+        first (int): The first deal number.
+        results (list): One (outcome, line length, nodes) tuple per deal, in deal order.
+    """
+    band_deals = [array('I') for _ in BANDS]
+    for offset, (outcome, _, nodes) in enumerate(results):
+        if outcome == WINNABLE:
+            band_deals[get_band(nodes)].append(offset)
+
+    records_offset = HEADER.size + BAND.size * len(BANDS)
+    band_offset = records_offset + RECORD.size * len(results)
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, first, len(results), len(BANDS)))
+        for deals in band_deals:
+            file.write(BAND.pack(band_offset, len(deals)))
+            band_offset += deals.itemsize * len(deals)
+        for outcome, length, nodes in results:
+            file.write(RECORD.pack(outcome, 0, min(length, 0xFFFF), min(nodes, 0xFFFFFFFF)))
+        for deals in band_deals:
+            if sys.byteorder != 'little':
+                deals.byteswap()
+            deals.tofile(file)
+
+
+class DealDatabase:
+    """Class to represent a memory-mapped database of solved deals.
+
+    Attributes:
+        path (str): The path of the database file.
+        mapping (mmap.mmap): The read-only mapping of the file.
+        first (int): The first deal number in the database.
+        count (int): The number of deals in the database.
+        bands (list): The (file offset, deal count) of the deal list of each difficulty band.
+        records_offset (int): The file offset of the first deal's record.
+    """
+
+    def __init__(self, path):
+        """Open a database file. Only its header is read.
+
+        Args:
+            path (str): The path of the database file.
+
+        Raises:
+            ValueError: If the file is not a deal database.
+        """
+        self.path = path
+        with open(path, 'rb') as file:
+            self.mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.first, self.count, band_count = HEADER.unpack_from(self.mapping, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a deal database: {path}")
+        self.bands = [BAND.unpack_from(self.mapping, HEADER.size + BAND.size * band) for band in range(band_count)]
+        self.records_offset = HEADER.size + BAND.size * band_count
+
+    def lookup(self, deal_number):
+        """Look up the solver outcome of a deal.
+
+        Args:
+            deal_number (int): The deal number.
+
+        Returns:
+            tuple: (outcome, winning line length, nodes searched), where outcome is WINNABLE,
+                UNWINNABLE or UNKNOWN; None if the deal is not in the database.
+        """
+        offset = deal_number - self.first
+        if not 0 <= offset < self.count:
+            return None
+        outcome, _, length, nodes = RECORD.unpack_from(self.mapping, self.records_offset + RECORD.size * offset)
+        return outcome, length, nodes
+
+    def pick_winnable(self, difficulty=None, rng=random):
+        """Pick a random winnable deal, without any search.
+
+        Args:
+            difficulty (str): The difficulty band ('easy', 'medium' or 'hard'), or None for any.
+            rng (random.Random): The random generator to pick with (default: the `random` module).
+
+        Returns:
+            int: The deal number, or None if the database has no winnable deal in the band.
+        """
+        if difficulty is None:
+            total = sum(count for _, count in self.bands)
+            if not total:
+                return None
+            index = rng.randrange(total)
+            for offset, count in self.bands:
+                if index < count:
+                    break
+                index -= count
+        else:
+            offset, count = self.bands[BANDS.index(difficulty)]
+            if not count:
+                return None
+            index = rng.randrange(count)
+        return self.first + struct.unpack_from('<I', self.mapping, offset + 4 * index)[0]
+
+    def close(self):
+        """Close the mapping of the file."""
+        self.mapping.close()
+
+
+def main(argv=None):
+    """Solve a range of deals in parallel (with the batch simulator's workers) and write their database."""
+    parser = argparse.ArgumentParser(description='Build a database of solved deals.')
+    parser.add_argument('--first', type=int, default=0, help='first deal number (default: 0)')
+    parser.add_argument('--count', type=positive_int, default=10000, help='number of deals (default: 10000)')
+    parser.add_argument('--workers', type=positive_int, default=multiprocessing.cpu_count(),
+                        help='worker processes (default: one per core)')
+    parser.add_argument('--max-nodes', type=int, default=20000, help='node budget per deal (default: 20000)')
+    parser.add_argument('--output', default='deals.db', help='database file (default: deals.db)')
+    args = parser.parse_args(sys.argv[1:] if argv is None else argv)
+
+    results = [None] * args.count
+    chunk_size = max(1, min(64, args.count // (args.workers * 16)))
+    with multiprocessing.Pool(args.workers, init_worker, ('solver', 0, args.max_nodes)) as pool:
+        deal_numbers = range(args.first, args.first + args.count)
+        for done, (deal_number, result, moves, nodes, _) in enumerate(
+                pool.imap_unordered(run_deal, deal_numbers, chunk_size), 1):
+            results[deal_number - args.first] = (OUTCOMES.get(result, UNKNOWN), moves, nodes)
+            if done % 1000 == 0:
+                print(f'{done}/{args.count} deals solved', file=sys.stderr)
+    write_database(args.output, args.first, results)
+
+    database = DealDatabase(args.output)
+    print(f'{args.count} deals written to {args.output}: ' + ', '.join(
+        f'{count} {band}' for band, (_, count) in zip(BANDS, database.bands)) + ' winnable')
+    database.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -8,21 +8,42 @@ Created: 25-12-2024
 """
 
 # Standard Imports
-import random
 import logging
 
 import pygame
 
 # Local Imports
-from history_manager import HistoryManager
-from move import Move
+from game_state import GameState, STOCK, TABLEAU
+from auto_complete import auto_complete, can_auto_complete, play_safe_moves
 from card import Card
+from card_atlas import CardAtlas
+from dead_end import is_dead_end
+from deals import deal_cards, new_deal_number
+from hint_service import FAILED, HintService
+from spatial_index import SpatialIndex
+from solver import Solver
 from stack import Stack
 
+# Optional: rank the moves by random playouts when a hint search runs out of budget (needs NumPy)
+try:
+    from batch_state import best_move as playout_best_move
+except ImportError:
+    playout_best_move = None
+
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Search budgets. Hints are searched in the background, so their search can go deeper;
+# a new deal is checked before it is shown, so its search must stay short
+HINT_SOLVER = Solver(max_nodes=100000, time_limit=3.0)
+DEAL_SOLVER = Solver(max_nodes=5000, time_limit=0.25)
+WINNABLE_DEAL_ATTEMPTS = 10  # Number of shuffles checked for a winnable deal before settling for an unchecked one
+
+# Automatic moves are shown as cards flying to their new places, one move after the other
+AUTO_MOVE_INTERVAL = 60  # Milliseconds between the starts of two moves
+AUTO_MOVE_DURATION = 180  # Milliseconds a card takes to fly to its new place
+
 
 class Deck(object):
     """Class to represent a deck object containing cards and stacks.
@@ -31,6 +52,7 @@ class Deck(object):
 
     Attributes:
         cards (list): A list of card objects in the deck.
+        deal_number (int): The number of the current deal, which gives the order of the cards.
         position (tuple): The (x, y) position of the deck on the screen.
         card_size (tuple): The dimensions (width, height) of the cards in the deck.
         images (dict): A dictionary of card images for each suit and rank.
@@ -38,9 +60,23 @@ class Deck(object):
         dragged_card (Card): The card currently being dragged.
         stock_stack (Stack): The stack representing the stock pile.
         dragged_cards (list): A list of cards currently being dragged.
+        drag_rect (pygame.Rect): The screen area covered by the dragged cards.
+        drag_offsets (list): The offset of each dragged card from the corner of drag_rect.
+        drag_mouse_offset (tuple): The offset of the mouse from the corner of drag_rect.
         hint (str): A hint message for possible moves.
         highlight_start_time (int): The time when the highlight starts (for temporary hint highlight)
-        history_manager (HistoryManager): An instance of the HistoryManager class for managing
+        game_state (GameState): The headless game state the stacks are drawn from.
+        card_lookup (dict): The card objects of the current deal, keyed by their integer encoding.
+        atlas (CardAtlas): The atlas all cards are drawn from, built on the first draw.
+        dirty_rects (list): The screen areas changed since they were last collected for redrawing.
+        spatial_index (SpatialIndex): The index used to find the cards and stacks under a point or card.
+        hint_service (HintService): The background search for hints, cancelled as stacks change.
+        deal_database (DealDatabase): The solved deals winnable deals are picked from, or None to search instead.
+        dead_end (bool): True when no sequence of moves can make progress any more (see dead_end.py).
+        auto_play (bool): Whether safe cards go to the foundations after each move, and won games finish
+            by themselves once every tableau card is face up (see auto_complete.py).
+        flights (list): The cards flying to their new places after automatic moves, as
+            [card, start position, end position, start time, current position] lists.
     """
 
     def __init__(self, pos, images, card_size=(100, 150)):
@@ -48,29 +84,55 @@ class Deck(object):
         self.position = pos
         self.card_size = card_size
         self.images = images
+        self.card_lookup = {}
+        self.deal_number = None
         self.create_deck()
         self.stacks = []
         self.dragged_card = None
         self.stock_stack = None
         self.dragged_cards = None
+        self.drag_rect = None
+        self.drag_offsets = []
+        self.drag_mouse_offset = (0, 0)
         self.hint = None
         self.highlight_start_time = None
-        self.history_manager = HistoryManager()
-
-    def create_deck(self):
+        self.game_state = GameState()
+        self.hint_service = HintService(HINT_SOLVER, playouts=playout_best_move)
+        self.deal_database = None
+        self.dead_end = False
+        self.auto_play = False
+        self.flights = []
+        self.atlas = None
+        self.dirty_rects = []
+        self.spatial_index = None
+
+    def create_deck(self, deal_number=None):
         """
         Create a standard 52-card deck and shuffle it.
         Each card has a suit, rank, and is initially face down.
+        The card objects are created once and reused for every new deal.
+
+        Args:
+            deal_number (int): The deal to shuffle the cards into. A random deal is picked if None.
         """
         suits = ['hearts', 'diamonds', 'clubs', 'spades']
         ranks = ['ace', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king']
 
-        for suit in suits:
-            for rank in ranks:
-                image = self.images[suit][rank]
-                card = Card(image, self.card_size, rank, suit)
-                self.cards.append(card)
-        random.shuffle(self.cards)
+        if not self.card_lookup:
+            for suit in suits:
+                for rank in ranks:
+                    image = self.images[suit][rank]
+                    card = Card(image, self.card_size, rank, suit)
+                    self.card_lookup[card.code] = card
+
+        if deal_number is None:
+            deal_number = new_deal_number()
+        self.deal_number = deal_number
+        self.cards = [self.card_lookup[code] for code in deal_cards(deal_number)]
+        for card in self.cards:
+            card.face_up = False
+            card.highlight = False
+            card.stop_drag()
 
     def setup_stacks(self, display_size):
         """
@@ -110,24 +172,130 @@ class Deck(object):
                        self.stock_stack, discard_stack,
                        foundation_stack1, foundation_stack2, foundation_stack3, foundation_stack4]
 
-        # Distribute cards to the stacks 1-7
-        for i, stack in enumerate(self.stacks[:7]):
-            for j in range(i + 1):
-                card = self.cards.pop()
-                card.face_up = (j == i)
-                stack.add_card(card)
-        # Add the rest of the cards to the stock stack
-        self.stock_stack = self.stacks[7]
-        while self.cards:
-            card = self.cards.pop()
-            card.face_up = False
-            self.stock_stack.add_card(card)
+        # Index the stacks by column for hit-testing
+        self.spatial_index = SpatialIndex(self.stacks, start_x, self.card_size[0] + stack_spacing)
+
+        # Deal the cards to the tableau and stock stacks (this also clears the move history)
+        self.game_state.deal([card.code for card in self.cards])
+        self.cards = []
+        self.sync_stacks()
 
-    def reset_all(self, display_size):
-        """Reset the game by reinitializing the deck and stacks"""
-        self.create_deck()  # Recreate the deck
-        self.setup_stacks(display_size)  # Reinitialize the stacks
-        self.history_manager.clear_history()  # Clear the move history
+    def sync_stacks(self, *indices):
+        """Rebuild stacks from the game state, positioning and turning their cards, and update what depends
+        on the position.
+
+        Args:
+            *indices (int): The indices of the stacks to rebuild. All stacks are rebuilt if none are given.
+        """
+        indices = indices or range(len(self.stacks))
+        self.position_changed()
+        for index in indices:
+            stack = self.stacks[index]
+            self.mark_dirty(stack.get_bounding_rect())
+            cards = [self.card_lookup[code] for code in self.game_state.stacks[index]]
+            for position, card in enumerate(cards):
+                card.face_up = self.game_state.is_face_up(index, position)
+            stack.cards = []
+            stack.add_cards(cards)
+            self.mark_dirty(stack.get_bounding_rect())
+
+    def transfer_cards(self, from_index, to_index, count):
+        """Move the top cards of one stack onto another, after the game state made the same move.
+
+        Only the moved slice is touched, instead of rebuilding the stacks.
+
+        Args:
+            from_index (int): The index of the source stack.
+            to_index (int): The index of the destination stack.
+            count (int): The number of cards moved.
+        """
+        self.move_cards(from_index, to_index, count)
+        self.position_changed()
+
+    def move_cards(self, from_index, to_index, count):
+        """Move the top cards of one stack onto another on screen only, for moves applied in a batch.
+
+        Unlike transfer_cards, what depends on the position is not updated; position_changed must be
+        called once the batch is done.
+
+        Args:
+            from_index (int): The index of the source stack.
+            to_index (int): The index of the destination stack.
+            count (int): The number of cards moved.
+        """
+        source, target = self.stacks[from_index], self.stacks[to_index]
+        self.mark_dirty(source.get_bounding_rect())
+        self.mark_dirty(target.get_bounding_rect())
+
+        cards = source.pop_cards(count)
+        if from_index == STOCK or to_index == STOCK:
+            cards.reverse()  # Cards are turned over one at a time between the stock and the discard stack
+        for card in cards:
+            card.face_up = to_index != STOCK
+        target.add_cards(cards)
+
+        self.mark_dirty(source.get_bounding_rect())
+        self.mark_dirty(target.get_bounding_rect())
+
+    def position_changed(self):
+        """Update what depends on the position after stacks changed: the dead-end check and any hint being
+        searched."""
+        self.hint_service.cancel()  # Its result would be for a position that no longer exists
+        self.finish_animation()  # The cards in flight are already where the new position needs them
+        dead_end = is_dead_end(self.game_state)
+        if dead_end != self.dead_end:
+            logging.debug('No progress can be made any more' if dead_end else 'Progress can be made again')
+            self.dead_end = dead_end
+
+    def mark_dirty(self, rect):
+        """Record a screen area that has to be redrawn.
+
+        Args:
+            rect (pygame.Rect): The area that changed.
+        """
+        self.dirty_rects.append(rect)
+
+    def pop_dirty_rects(self):
+        """Return the screen areas changed since the last call and forget them.
+
+        Returns:
+            list: The changed areas, as pygame.Rect objects.
+        """
+        dirty_rects = self.dirty_rects
+        self.dirty_rects = []
+        return dirty_rects
+
+    def reset_all(self, display_size, winnable_only=False, deal_number=None, difficulty=None):
+        """Reset the game by reinitializing the deck and stacks
+
+        Winnable deals are picked from the deal database when there is one, without any
+        search; otherwise deals are reshuffled until the solver finds a winning line.
+
+        Args:
+            display_size (tuple): The (width, height) of the display.
+            winnable_only (bool): Whether to only deal a winnable deal (ignored when a deal number is given).
+            deal_number (int): The deal to play, or None for a random deal.
+            difficulty (str): The difficulty band of the winnable deal ('easy', 'medium' or 'hard'),
+                or None for any. Only used with a deal database.
+        """
+        if winnable_only and deal_number is None and self.deal_database:
+            deal_number = self.deal_database.pick_winnable(difficulty)
+            if deal_number is not None:
+                logging.debug(f'Winnable deal {deal_number} picked from the deal database')
+                winnable_only = False  # Already known to be winnable
+            else:
+                logging.debug('No winnable deal in the deal database, searching for one instead')
+
+        self.create_deck(deal_number)  # Recreate the deck
+        if winnable_only and deal_number is None:
+            for attempt in range(WINNABLE_DEAL_ATTEMPTS):
+                deal = GameState()
+                deal.deal([card.code for card in self.cards])
+                if DEAL_SOLVER.is_winnable(deal):
+                    logging.debug(f'Winnable deal {self.deal_number} found after {attempt + 1} shuffle(s)')
+                    break
+                self.create_deck()
+        self.setup_stacks(display_size)  # Reinitialize the stacks and clear the move history
 
     def check_win(self):
         """Check if all foundation stacks are complete
@@ -135,63 +303,122 @@ class Deck(object):
         Returns:
             bool: True if all foundations are complete, False otherwise.
         """
-        for stack in self.stacks[9:]:
-            if len(stack.cards) != 13:  # Assuming each foundation stack should have 13 cards
-                return False
-        return True
+        return self.game_state.check_win()
 
     def show_hint(self):
-        """Show a hint for possible moves"""
+        """Start searching for a hint in the background; update_hint shows it once it is found"""
+        if self.dead_end:
+            self.hint = "No moves left: undo or start a new game."
+            logging.debug(self.hint)
+            return
+        self.hint = "Searching for a hint..."
+        logging.debug("Searching for a hint")
+        self.hint_service.request(self.game_state)
+
+    def update_hint(self):
+        """Show the hint searched for by show_hint, if the search finished for the current position"""
+        result = self.hint_service.poll(self.game_state)
+        if result:
+            logging.debug(f"Hint search {result}")
+            if result.status == FAILED:
+                self.hint = "No hint could be found."
+            else:
+                self.highlight_move(result.best_move)
+
+    def highlight_move(self, move):
+        """Highlight a move for 2 seconds
+
+        Args:
+            move (Move): The move to highlight, or None if there is no move at all.
+        """
         self.hint = None  # Reset hint message
         logging.debug("Resetting hint message")
 
         # Clear all highlights
+        if self.highlight_start_time:
+            self.mark_highlights_dirty()
         for stack in self.stacks:
             stack.highlight = False
             for card in stack.cards:
                 card.highlight = False
 
-        suggested_cards = set()  # Keep track of suggestions to only show one
-        highlighted_pairs = []  # List to keep track of highlighted pairs
+        if move and move.from_stack != STOCK and move.to_stack != STOCK:
+            # Highlight the card to move and the front card of the target stack (or the empty stack)
+            card = self.card_lookup[self.game_state.stacks[move.from_stack][-move.count]]
+            card.highlight = True
+            target_stack = self.stacks[move.to_stack]
+            if target_stack.cards:
+                target_stack.cards[-1].highlight = True
+            else:
+                target_stack.highlight = True
+            logging.debug(f"Hint found: {card.rank} of {card.suit} can be moved to target stack")
+            self.highlight_start_time = pygame.time.get_ticks()  # Set the highlight start time
+            self.mark_highlights_dirty()
+            return
 
-        for stack in self.stacks:
-            logging.debug(f"Checking stack: {stack}")
-            if stack.is_foundation:
-                continue
-            for card in stack.cards:
-                logging.debug(f"Checking card: {card.rank} of {card.suit}, face_up: {card.face_up}")
-                if card.face_up and (card.rank, card.suit) not in suggested_cards:
-                    for target_stack in self.stacks:
-                        # Skip if the target stack is the same as the current stack or if the target stack is empty
-                        if target_stack == stack or not target_stack.cards:
-                            continue
-                        logging.debug(f"Checking if the hint is redundant")
-
-                        logging.debug(f"Checking if card can be added to target stack: {target_stack}")
-
-                        if target_stack.can_add_card(card):
-                            # Highlight the card and the target stack
-                            card.highlight = True
-                            if target_stack.cards:
-                                target_stack.cards[-1].highlight = True  # Highlight the front card of the target stack
-                                highlighted_pairs.append((card, target_stack.cards[-1]))
-                            else:
-                                target_stack.highlight = True  # Highlight the empty stack
-                                highlighted_pairs.append((card, target_stack))
-                            logging.debug(f"Hint found: {card.rank} of {card.suit} can be moved to target stack")
-                            self.highlight_start_time = pygame.time.get_ticks()  # Set the highlight start time
-                            if len(highlighted_pairs) >= 1:
-                                return
-
-        # If no moves are found, suggest clicking the stock stack
+        # Otherwise suggest clicking the stock stack
         if self.stock_stack.cards:
             self.stock_stack.cards[-1].highlight = True
         self.stock_stack.highlight = True
 
-
-        self.hint = "No other moves available. Try clicking the stock stack."
+        if move:
+            self.hint = "Try clicking the stock stack."
+        else:
+            self.hint = "No other moves available."
         self.highlight_start_time = pygame.time.get_ticks()
-        logging.debug("No moves found. Suggest clicking the stock stack.")
+        self.mark_highlights_dirty()
+        logging.debug(f"No card moves found. {self.hint}")
+
+    def get_highlight_rects(self):
+        """Get the hint highlights to draw.
+
+        Returns:
+            list: (pygame.Rect, color) pairs, in drawing order.
+        """
+        highlights = []
+        for stack in self.stacks:
+            # The hinted card may be anywhere in a face-up run, the target is a front card
+            for card in stack.cards:
+                if card.highlight:
+                    highlight_rect = pygame.Rect(card.position, (card.image.get_width(), card.image.get_height()))
+                    highlights.append((highlight_rect, (0, 0, 255)))
+            if stack.highlight:
+                highlight_rect = pygame.Rect(stack.position, (self.card_size[0], self.card_size[1]))
+                highlights.append((highlight_rect, (0, 0, 255)))
+        # Highlight the stock stack if it is highlighted
+        if self.stock_stack.highlight:
+            if self.stock_stack.cards:
+                front_card = self.stock_stack.cards[-1]
+                highlight_rect = pygame.Rect(front_card.position,
+                                             (front_card.image.get_width(), front_card.image.get_height()))
+            else:
+                highlight_rect = pygame.Rect(self.stock_stack.position, (self.card_size[0], self.card_size[1]))
+            highlights.append((highlight_rect, (255, 0, 0)))
+        return highlights
+
+    def mark_highlights_dirty(self):
+        """Record the areas of the hint highlights as changed."""
+        for highlight_rect, _ in self.get_highlight_rects():
+            self.mark_dirty(highlight_rect)
+
+    def get_highlight_timeout(self):
+        """Get the time left before the hint highlights are cleared.
+
+        Returns:
+            int: The number of milliseconds until update_highlights clears them, or None if none are shown.
+        """
+        if not self.highlight_start_time:
+            return None
+        return max(0, self.highlight_start_time + 2001 - pygame.time.get_ticks())
+
+    def update_highlights(self):
+        """Clear the hint highlights once they have been shown for 2 seconds."""
+        if self.highlight_start_time and pygame.time.get_ticks() - self.highlight_start_time > 2000:
+            self.mark_highlights_dirty()
+            for stack in self.stacks:
+                for card in stack.cards:
+                    card.highlight = False
+            self.highlight_start_time = None  # Reset the highlight start time
 
     def draw(self, screen):
         """Draw the card deck and stacks on the screen
@@ -199,141 +426,263 @@ class Deck(object):
         Args:
             screen (pygame.Surface): The surface to draw the deck on.
         """
+        # The atlas needs the display mode to be set, so it is built on the first draw
+        if self.atlas is None:
+            self.atlas = CardAtlas(self.images, self.card_size)
+
+        # Only the stacks inside the area being redrawn need to be drawn
+        clip_rect = screen.get_clip()
         for stack in self.stacks:
-            stack.draw(screen) # Draw each stack
+            if clip_rect.colliderect(stack.get_bounding_rect()):
+                stack.draw(screen, self.atlas) # Draw each stack
+
+        # Draw the cards in flight over the stacks, the first to fly on top
+        for card, _, _, _, position in reversed(self.flights):
+            self.atlas.blit(screen, card, position)
 
         # Draw the dragged cards on top, if any
         if self.dragged_cards:
-            for card in self.dragged_cards:
-                screen.blit(
-                    card.image if card.face_up else card.back_image,
-                    card.position
-                )
+            for card, (offset_x, offset_y) in zip(self.dragged_cards, self.drag_offsets):
+                self.atlas.blit(screen, card, (self.drag_rect.x + offset_x, self.drag_rect.y + offset_y))
 
-        # Draw hint highlights, if any
+        # Draw hint highlights, if any (they are cleared by update_highlights)
         if self.highlight_start_time:
-            elapsed_time = pygame.time.get_ticks() - self.highlight_start_time
-            if elapsed_time > 2000:  # 2 seconds
-                for stack in self.stacks:
-                    for card in stack.cards:
-                        card.highlight = False
-                self.highlight_start_time = None  # Reset the highlight start time
-            else:
-                for stack in self.stacks:
-                    if stack.cards:
-                        front_card = stack.cards[-1]
-                        if front_card.highlight:
-                            highlight_rect = pygame.Rect(front_card.position, (
-                                front_card.image.get_width(), front_card.image.get_height()))
-                            pygame.draw.rect(screen, (0, 0, 255), highlight_rect, 4)
-                    if stack.highlight:
-                        highlight_rect = pygame.Rect(stack.position, (self.card_size[0], self.card_size[1]))
-                        pygame.draw.rect(screen, (0, 0, 255), highlight_rect, 4)
-                # Highlight the stock stack if it is highlighted
-                if self.stock_stack.highlight:
-                    if self.stock_stack.cards:
-                        front_card = self.stock_stack.cards[-1]
-                        highlight_rect = pygame.Rect(front_card.position,
-                                                     (front_card.image.get_width(), front_card.image.get_height()))
-                    else:
-                        highlight_rect = pygame.Rect(self.stock_stack.position, (self.card_size[0], self.card_size[1]))
-                    pygame.draw.rect(screen, (255, 0, 0), highlight_rect, 4)
+            for highlight_rect, color in self.get_highlight_rects():
+                pygame.draw.rect(screen, color, highlight_rect, 4)
 
     def undo_last_move(self):
         """
-        Undo the last move
+        Undo the last move, with the moves linked to it (e.g. the safe moves it made possible, or a whole
+        auto-complete)
         Handles moves between tableau, stock, discard, and foundation stacks.
         """
         logging.debug('Attempting to undo the last move')
-        move = self.history_manager.undo_move()
-        if move:
+        moves = self.game_state.undo_last_entry()
+        for move in moves:
             logging.debug(f'Undoing move: {move}')
-            move.to_stack.remove_cards(move.cards)
-            for card, position in zip(move.cards, move.positions):
-                card.stack = move.from_stack
-                card.face_up = True
-                card.position = position
-                move.from_stack.add_card(card)
-
-            # Restore the face_up state if needed
-            remaining_cards_in_from_stack = len(move.from_stack.cards) - len(move.cards)
-            if move.last_card_face_up_state is not None and len(move.from_stack.cards) > len(move.cards):
-                last_card_index = -len(move.cards) - 1
-                last_card = move.from_stack.cards[last_card_index]
-                last_card.face_up = move.from_stack_face_up_state[remaining_cards_in_from_stack - 1]
-
-            # Make sure cards in the stock stack are face down
-            for card in self.stacks[7].cards:
-                card.face_up = False
-
-            # Make sure cards in the foundation stack are face up
-            for stack in self.stacks[9:]:
-                for card in stack.cards:
-                    card.face_up = True
+            # Put back exactly the moved cards, and turn the card they revealed face down again
+            self.move_cards(move.to_stack, move.from_stack, move.count)
+            if move.flipped:
+                self.stacks[move.from_stack].cards[-move.count - 1].face_up = False
+        if moves:
+            self.position_changed()
+            logging.debug(f'{len(moves)} move(s) undone successfully')
+        else:
+            logging.debug('No moves to undo')
 
-            # Make sure cards in the discard stack are face up
-            for card in self.stacks[8].cards:
-                card.face_up = True
+    def redo_last_move(self):
+        """
+        Redo the last undone move, with the moves linked to it
+        """
+        logging.debug('Attempting to redo the last undone move')
+        moves = self.game_state.redo_last_entry()
+        for move in moves:
+            logging.debug(f'Redoing move: {move}')
+            self.move_cards(move.from_stack, move.to_stack, move.count)
+            if move.flipped:
+                self.stacks[move.from_stack].cards[-1].face_up = True
+        if moves:
+            self.position_changed()
+        else:
+            logging.debug('No moves to redo')
 
-            # Redraw the screen to update the visual representation
-            #self.draw(pygame.display.get_surface())
-            logging.debug('Move undone successfully')
+    def undo_to_move(self, position):
+        """
+        Undo moves until only the first `position` moves remain, in one step
 
-        else:
-            logging.debug('No moves to undo')
+        The game state rewinds the moves, then each changed stack is rebuilt once.
+
+        Args:
+            position (int): The number of moves to keep.
+        """
+        changed = self.game_state.undo_to(position)
+        logging.debug(f'Undid moves back to move {position}, {len(changed)} stacks changed')
+        if changed:
+            self.sync_stacks(*sorted(changed))
+
+    def restart_deal(self):
+        """
+        Restart the current deal by undoing every recorded move
+        """
+        self.undo_to_move(0)
+
+    def get_dragged_rect(self):
+        """Get the screen area covered by the dragged cards.
+
+        Returns:
+            pygame.Rect: The bounding rectangle of the dragged cards.
+        """
+        return self.drag_rect.copy()
+
+    def start_dragging(self, stack, cards, mouse_position):
+        """Start dragging cards off a stack
+
+        The cards are moved as one group: their offsets from the group's corner are taken
+        once here, and dragging only moves the corner.
+
+        Args:
+            stack (Stack): The stack the cards are picked up from.
+            cards (list): The cards to drag, from the clicked card to the top of the stack.
+            mouse_position (tuple): The (x, y) position of the mouse.
+        """
+        self.finish_animation()
+        self.mark_dirty(stack.get_bounding_rect())
+        for card in cards:
+            card.start_drag(mouse_position)
+        self.dragged_cards = cards
+        stack.remove_cards(cards)
+        if cards:
+            first_card, last_card = cards[0], cards[-1]
+            self.drag_rect = pygame.Rect(first_card.position, first_card.card_size).union(
+                pygame.Rect(last_card.position, last_card.card_size))
+            self.drag_offsets = [(card.position[0] - self.drag_rect.x, card.position[1] - self.drag_rect.y)
+                                 for card in cards]
+            self.drag_mouse_offset = (mouse_position[0] - self.drag_rect.x, mouse_position[1] - self.drag_rect.y)
+
+    def drag_to(self, mouse_position):
+        """Move the dragged cards with the mouse
+
+        Only the group's position changes, so the cost does not depend on the number of dragged cards.
+
+        Args:
+            mouse_position (tuple): The (x, y) position of the mouse.
+        """
+        self.mark_dirty(self.drag_rect.copy())
+        self.drag_rect.topleft = (mouse_position[0] - self.drag_mouse_offset[0],
+                                  mouse_position[1] - self.drag_mouse_offset[1])
+        self.mark_dirty(self.drag_rect.copy())
 
     def stop_dragging(self):
         """Stop dragging the cards"""
-        for stack in self.stacks:
-            if stack.contains_card(self.dragged_cards[0]) and stack.can_add_card(self.dragged_cards[0]):
-                # Record the move
-                move = Move(
-                    self.dragged_cards,
-                    self.dragged_cards[0].original_stack,
-                    stack
-                )
-                self.history_manager.record_move(move)
-
-                # Move the cards to the new stack
-                for card in self.dragged_cards:
-                    stack.add_card(card)
-                if self.dragged_cards[0].original_stack.cards:
-                    self.dragged_cards[0].original_stack.cards[-1].face_up = True
+        self.mark_dirty(self.get_dragged_rect())
+        # Put the cards where the group was dropped
+        for card, (offset_x, offset_y) in zip(self.dragged_cards, self.drag_offsets):
+            card.position = (self.drag_rect.x + offset_x, self.drag_rect.y + offset_y)
+        from_stack = self.dragged_cards[0].original_stack
+        from_index = self.stacks.index(from_stack)
+        card = self.dragged_cards[0]
+        for to_index in self.spatial_index.get_stacks_overlapping(pygame.Rect(card.position, card.card_size)):
+            if self.game_state.move(from_index, to_index, len(self.dragged_cards)):
+                # The game state recorded the move; place the run on the target in one step
+                to_stack = self.stacks[to_index]
+                self.mark_dirty(to_stack.get_bounding_rect())
+                to_stack.add_cards(self.dragged_cards)
+                self.mark_dirty(to_stack.get_bounding_rect())
+                if from_stack.cards:
+                    # Turn the new top card face up if the game state revealed it
+                    from_stack.cards[-1].face_up = self.game_state.is_face_up(from_index, len(from_stack.cards) - 1)
+                    self.mark_dirty(from_stack.get_bounding_rect())
+                self.position_changed()
+                self.check_repeated_position()
+                self.play_automatic_moves()
                 return
 
         # If no valid stack, return to the original stack
-        for card in self.dragged_cards:
-            card.position = card.original_stack.get_next_card_position()
-            card.original_stack.add_card(card)
+        from_stack.add_cards(self.dragged_cards)
+        self.mark_dirty(from_stack.get_bounding_rect())
 
     def check_for_stock_click(self, mouse_position):
         """Check if the stock stack was clicked"""
-        stock_stack = self.stacks[7]
-        discard_stack = self.stacks[8]
-        if stock_stack.cards and stock_stack.cards[-1].check_if_clicked(mouse_position):
-            # Record the state of the stock and discard stacks
-            move = Move(
-                [stock_stack.cards[-1]],
-                stock_stack,
-                discard_stack
-            )
-            self.history_manager.record_move(move)
-
-            # Move the top card from the stock stack to the discard stack
-            card = stock_stack.remove_card(stock_stack.cards[-1])
-            card.face_up = True
-            discard_stack.add_card(card)
-        elif not stock_stack.cards:
-            # Record the stock reset as a move
-            move = Move(
-                discard_stack.cards.copy(),
-                discard_stack,
-                stock_stack
-            )
-            self.history_manager.record_move(move)
-
-            # Reset the stock stack when empty
-            while discard_stack.cards:
-                card = discard_stack.remove_card(discard_stack.cards[-1])
-                card.face_up = False
-                stock_stack.add_card(card)
\ No newline at end of file
+        stock_stack = self.stacks[STOCK]
+        if not stock_stack.cards or stock_stack.cards[-1].check_if_clicked(mouse_position):
+            # Turn over the top stock card, or reset the stock from the discard stack when empty
+            if self.dead_end and not stock_stack.cards:
+                logging.debug('Not recycling the stock: no card of it can be played any more')
+                return
+            move = self.game_state.stock_click()
+            if move:
+                self.transfer_cards(move.from_stack, move.to_stack, move.count)
+                self.check_repeated_position()
+                self.play_automatic_moves()
+
+    def check_repeated_position(self):
+        """Check if the last move led back to a position reached before, i.e. made no progress
+
+        Returns:
+            bool: True if the position was reached before.
+        """
+        repeated = self.game_state.is_repeated_position()
+        if repeated:
+            logging.debug(f'Position {self.game_state.hash:016x} reached again: no progress since then')
+        return repeated
+
+    def play_automatic_moves(self):
+        """Make the automatic moves following a move of the player, if auto_play is on, and show them.
+
+        The safe foundation moves are undone together with the player's move; once every tableau
+        card is face up, the rest of the game is played as one more undo entry.
+        """
+        if not self.auto_play:
+            return
+        moves = play_safe_moves(self.game_state, linked=True)
+        if can_auto_complete(self.game_state):
+            moves += auto_complete(self.game_state)
+        if moves:
+            logging.debug(f'Playing {len(moves)} automatic move(s)')
+            self.animate_moves(moves)
+
+    def animate_moves(self, moves):
+        """Show moves the game state already made, as one batch.
+
+        The stacks are updated and position_changed is called once for the whole batch; the moved
+        cards then fly from their old places to their new ones, one move after the other, as
+        update_animation advances the flights.
+
+        Args:
+            moves (list): The moves, as `Move` objects, in the order they were made.
+        """
+        self.finish_animation()
+        now = pygame.time.get_ticks()
+        flights = []
+        for step, move in enumerate(moves):
+            source = self.stacks[move.from_stack]
+            cards = source.cards[-move.count:]
+            starts = [card.position for card in cards]
+            self.move_cards(move.from_stack, move.to_stack, move.count)
+            if move.from_stack in TABLEAU and source.cards:
+                # Turn the new top card face up if the game state revealed it
+                source.cards[-1].face_up = self.game_state.is_face_up(move.from_stack, len(source.cards) - 1)
+            start_time = now + step * AUTO_MOVE_INTERVAL
+            flights.extend([card, start, card.position, start_time, start] for card, start in zip(cards, starts))
+        self.position_changed()
+
+        for card, start, _, _, _ in flights:
+            card.in_flight = True
+            self.mark_dirty(pygame.Rect(start, card.card_size))
+        self.flights = flights
+
+    def is_animating(self):
+        """Check if cards are flying to their new places.
+
+        Returns:
+            bool: True while update_animation has flights to advance.
+        """
+        return bool(self.flights)
+
+    def update_animation(self):
+        """Advance the cards in flight to their positions at the current time, landing those that arrived"""
+        if not self.flights:
+            return
+        now = pygame.time.get_ticks()
+        flights = []
+        for flight in self.flights:
+            card, (start_x, start_y), (end_x, end_y), start_time, position = flight
+            progress = min(1.0, max(0, now - start_time) / AUTO_MOVE_DURATION)
+            new_position = (round(start_x + (end_x - start_x) * progress), round(start_y + (end_y - start_y) * progress))
+            if new_position != position:
+                self.mark_dirty(pygame.Rect(position, card.card_size))
+                self.mark_dirty(pygame.Rect(new_position, card.card_size))
+                flight[4] = new_position
+            if progress < 1.0:
+                flights.append(flight)
+            else:
+                card.in_flight = False  # Its stack draws it from now on
+        self.flights = flights
+
+    def finish_animation(self):
+        """Land every card in flight at once, e.g. when the player acts before the animation is over"""
+        for card, _, end, _, position in self.flights:
+            card.in_flight = False
+            self.mark_dirty(pygame.Rect(position, card.card_size))
+            self.mark_dirty(pygame.Rect(end, card.card_size))
+        self.flights = []
@@ -0,0 +1,447 @@
+"""
+game_state.py
+
+Headless rules engine for the Solitaire game.
+
+This script defines the `GameState` class, which holds the whole Klondike position
+(tableau, stock, discard and foundation stacks) without touching pygame. Cards are
+small integers, so deals can be played and simulated without a display or any image
+loading. The `Deck`, `Stack` and `Card` classes are the rendering layer on top of it.
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Local Imports
+from history_manager import HistoryManager
+from move import Move
+from zobrist import CARD_KEYS, HIDDEN_KEYS, MAX_STACK_SIZE, position_hash
+
+SUITS = ['hearts', 'diamonds', 'clubs', 'spades']
+RANKS = ['ace', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king']
+
+# Stack indices, in the same order as `Deck.stacks`
+TABLEAU = range(7)
+STOCK = 7
+DISCARD = 8
+FOUNDATIONS = range(9, 13)
+STACK_COUNT = 13
+
+
+def encode_card(rank, suit):
+    """Encode a card as an integer in the range 0-51.
+
+    Args:
+        rank (str): The rank of the card ('ace', '2', ..., 'king').
+        suit (str): The suit of the card ('hearts', 'diamonds', 'clubs', 'spades').
+
+    Returns:
+        int: suit_index * 13 + rank_index.
+    """
+    return SUITS.index(suit) * 13 + RANKS.index(rank)
+
+
+def card_rank(card):
+    """Return the rank of an encoded card as a number (1 for ace, 13 for king)."""
+    return card % 13 + 1
+
+
+def card_suit(card):
+    """Return the suit index of an encoded card (an index into `SUITS`)."""
+    return card // 13
+
+
+def card_color(card):
+    """Return the color of an encoded card ('red' for hearts/diamonds, 'black' for clubs/spades)."""
+    return 'red' if card < 26 else 'black'
+
+
+def card_name(card):
+    """Return the 'rank of suit' name of an encoded card."""
+    return "{} of {}".format(RANKS[card % 13], SUITS[card // 13])
+
+
+def stack_type(index):
+    """Return the type of the stack at the given index.
+
+    Args:
+        index (int): The stack index.
+
+    Returns:
+        str: 'tableau', 'stock', 'discard' or 'foundation' (same values as `Stack.deck`).
+    """
+    if index == STOCK:
+        return 'stock'
+    if index == DISCARD:
+        return 'discard'
+    if index in FOUNDATIONS:
+        return 'foundation'
+    return 'tableau'
+
+
+def _build_accept_tables():
+    """Build the bit tables of the cards each card (or an empty stack) accepts on top of it.
+
+    Returns:
+        tuple: The tableau and foundation tables. Entry `top` (or `EMPTY` for an empty stack)
+            is a bit mask with bit `card` set when `card` can be placed on it.
+    """
+    tableau = [0] * (EMPTY + 1)
+    foundation = [0] * (EMPTY + 1)
+    for card in range(52):
+        rank, red = card % 13, card < 26
+        if rank == 12:
+            tableau[EMPTY] |= 1 << card  # Only Kings can be placed on an empty tableau stack
+        if rank == 0:
+            foundation[EMPTY] |= 1 << card  # Only Aces can be placed on an empty foundation stack
+        else:
+            foundation[card - 1] |= 1 << card  # Same suit, one rank higher
+        for top in range(52):
+            if (top < 26) != red and top % 13 == rank + 1:
+                tableau[top] |= 1 << card  # Alternating colors, one rank lower
+    return tableau, foundation
+
+
+EMPTY = 52  # Table index used for an empty stack
+TABLEAU_ACCEPTS, FOUNDATION_ACCEPTS = _build_accept_tables()
+
+# The accept table of each stack, by stack index (None for stacks that never accept cards)
+STACK_ACCEPTS = [TABLEAU_ACCEPTS] * len(TABLEAU) + [None, None] + [FOUNDATION_ACCEPTS] * len(FOUNDATIONS)
+DECK_TYPE_ACCEPTS = {'tableau': TABLEAU_ACCEPTS, 'foundation': FOUNDATION_ACCEPTS, 'stock': None, 'discard': None}
+
+
+def can_place(deck_type, top_card, card):
+    """Check if a card can be placed on a stack according to the rules of Solitaire.
+
+    Tableau stacks accept cards of alternating colors and one rank lower than the top card
+    (only Kings on an empty stack), foundation stacks accept cards of the same suit and one
+    rank higher (only Aces on an empty stack), and stock and discard stacks accept nothing.
+
+    Args:
+        deck_type (str): The type of the stack ('tableau', 'stock', 'discard', 'foundation').
+        top_card (int): The encoded top card of the stack, or None if the stack is empty.
+        card (int): The encoded card to place.
+
+    Returns:
+        bool: True if the card can be placed on the stack, False otherwise.
+    """
+    table = DECK_TYPE_ACCEPTS[deck_type]
+    if table is None:
+        return False
+    return table[EMPTY if top_card is None else top_card] >> card & 1 == 1
+
+
+class GameState:
+    """Class to represent the state of a Solitaire game without any graphics.
+
+    Attributes:
+        stacks (list): 13 lists of encoded cards, bottom card first, in the order of `Deck.stacks`.
+        hidden (list): The number of face-down cards at the bottom of each tableau stack.
+        history_manager (HistoryManager): The history of moves, used for undo and redo.
+        hash (int): The 64-bit Zobrist hash of the position, updated as cards move and turn over.
+        position_visits (dict): The number of times each position hash was reached in this game
+            (the deal counts as one visit, and undoing a move takes its visit back). Only the positions
+            since the last progress move are kept, and never more than the history holds moves.
+    """
+
+    def __init__(self, max_history=10000):
+        """Initialize an empty game state.
+
+        Args:
+            max_history (int): The maximum number of moves kept for undo (default: 10000).
+        """
+        self.stacks = [[] for _ in range(STACK_COUNT)]
+        self.hidden = [0] * STACK_COUNT
+        self.history_manager = HistoryManager(max_history)
+        self.hash = position_hash(self.stacks, self.hidden)
+        self.position_visits = {self.hash: 1}
+
+    def deal(self, cards):
+        """Deal a shuffled deck the same way `Deck.setup_stacks` does.
+
+        Stack i of the tableau receives i + 1 cards with only the last one face up,
+        and the rest of the cards go to the stock.
+
+        Args:
+            cards (list): The 52 encoded cards, dealt from the end of the list.
+        """
+        cards = list(cards)
+        self.stacks = [[] for _ in range(STACK_COUNT)]
+        for i in TABLEAU:
+            for _ in range(i + 1):
+                self.stacks[i].append(cards.pop())
+        cards.reverse()
+        self.stacks[STOCK] = cards
+        self.hidden = [i for i in TABLEAU] + [0] * (STACK_COUNT - len(TABLEAU))
+        self.history_manager.clear_history()
+        self.hash = position_hash(self.stacks, self.hidden)
+        self.position_visits = {self.hash: 1}
+
+    def copy(self, max_history=10000):
+        """Copy the position, without its move history, e.g. for a search to play on.
+
+        Args:
+            max_history (int): The maximum number of moves the copy keeps for undo (default: 10000).
+
+        Returns:
+            GameState: A new game state with the same stacks.
+        """
+        state = GameState(max_history)
+        state.stacks = [list(cards) for cards in self.stacks]
+        state.hidden = list(self.hidden)
+        state.hash = self.hash
+        state.position_visits = {self.hash: 1}
+        return state
+
+    def is_face_up(self, stack, index):
+        """Check if the card at the given position is face up.
+
+        Args:
+            stack (int): The stack index.
+            index (int): The position of the card in the stack (0 is the bottom card).
+
+        Returns:
+            bool: True if the card is face up, False otherwise.
+        """
+        return stack != STOCK and index >= self.hidden[stack]
+
+    def can_add_card(self, stack, card):
+        """Check if a card can be added to the given stack.
+
+        Args:
+            stack (int): The stack index.
+            card (int): The encoded card.
+
+        Returns:
+            bool: True if the card can be added to the stack, False otherwise.
+        """
+        table = STACK_ACCEPTS[stack]
+        if table is None:
+            return False
+        cards = self.stacks[stack]
+        return table[cards[-1] if cards else EMPTY] >> card & 1 == 1
+
+    def can_move(self, from_stack, to_stack, count):
+        """Check if the top `count` cards of a stack can be moved onto another stack.
+
+        Only face-up runs can be moved off the tableau, only the top card can be moved off
+        the discard and foundation stacks, and only one card at a time onto a foundation.
+
+        Args:
+            from_stack (int): The index of the source stack.
+            to_stack (int): The index of the destination stack.
+            count (int): The number of cards to move.
+
+        Returns:
+            bool: True if the move is legal, False otherwise.
+        """
+        if from_stack == to_stack or from_stack == STOCK or count < 1:
+            return False
+        cards = self.stacks[from_stack]
+        if from_stack in TABLEAU:
+            if count > len(cards) - self.hidden[from_stack]:
+                return False
+        elif count != 1 or not cards:
+            return False
+        if count != 1 and to_stack in FOUNDATIONS:
+            return False
+        return self.can_add_card(to_stack, cards[-count])
+
+    def move(self, from_stack, to_stack, count, linked=False):
+        """Move the top `count` cards of a stack onto another stack, if the move is legal.
+
+        This is the rule behind dropping dragged cards on a stack. The new top card of
+        a tableau stack is turned face up, and the move is recorded for undo.
+
+        Args:
+            from_stack (int): The index of the source stack.
+            to_stack (int): The index of the destination stack.
+            count (int): The number of cards to move.
+            linked (bool): Whether the move is undone together with the move before it (default: False).
+
+        Returns:
+            bool: True if the move was made, False if it is not legal.
+        """
+        if not self.can_move(from_stack, to_stack, count):
+            return False
+        self._transfer(from_stack, to_stack, count)
+        flipped = self._reveal(from_stack)
+        self.history_manager.record_move(Move(from_stack, to_stack, count, flipped, linked))
+        self._visit(flipped or from_stack == DISCARD)
+        return True
+
+    def stock_click(self, linked=False):
+        """Handle a click on the stock stack.
+
+        Turns the top stock card over onto the discard stack, or moves the whole
+        discard stack back to the stock when the stock is empty.
+
+        Args:
+            linked (bool): Whether the move is undone together with the move before it (default: False).
+
+        Returns:
+            Move: The move that was made, or None if both stacks are empty.
+        """
+        if self.stacks[STOCK]:
+            move = Move(STOCK, DISCARD, 1, linked=linked)
+        elif self.stacks[DISCARD]:
+            move = Move(DISCARD, STOCK, len(self.stacks[DISCARD]), linked=linked)
+        else:
+            return None
+        self._transfer(move.from_stack, move.to_stack, move.count)
+        self.history_manager.record_move(move)
+        self._visit()
+        return move
+
+    def undo_last_move(self):
+        """Undo the last recorded move.
+
+        Returns:
+            Move: The move that was undone, or None if there is nothing to undo.
+        """
+        move = self.history_manager.undo_move()
+        if move:
+            self._leave()
+            self._transfer(move.to_stack, move.from_stack, move.count)
+            if move.flipped:
+                self._set_hidden(move.from_stack, self.hidden[move.from_stack] + 1)
+            self.position_visits.setdefault(self.hash, 1)  # Its visits may have been forgotten by the move
+        return move
+
+    def redo_last_move(self):
+        """Make the last undone move again.
+
+        Returns:
+            Move: The move that was redone, or None if there is nothing to redo.
+        """
+        move = self.history_manager.redo_move()
+        if move:
+            self._transfer(move.from_stack, move.to_stack, move.count)
+            if move.flipped:
+                self._set_hidden(move.from_stack, self.hidden[move.from_stack] - 1)
+            self._visit(move.flipped or (move.from_stack == DISCARD and move.to_stack != STOCK))
+        return move
+
+    def undo_last_entry(self):
+        """Undo the last undo entry: the last move and the moves linked to it, e.g. a whole auto-complete.
+
+        Returns:
+            list: The moves that were undone, last move first (empty if there is nothing to undo).
+        """
+        moves = []
+        move = self.undo_last_move()
+        while move:
+            moves.append(move)
+            move = self.undo_last_move() if move.linked else None
+        return moves
+
+    def redo_last_entry(self):
+        """Make the last undone undo entry again, with all its linked moves.
+
+        Returns:
+            list: The moves that were redone, first move first (empty if there is nothing to redo).
+        """
+        move = self.redo_last_move()
+        moves = [move] if move else []
+        while moves and self.history_manager.is_redo_linked():
+            moves.append(self.redo_last_move())
+        return moves
+
+    def undo_to(self, position):
+        """Undo moves until only the first `position` moves of the history remain.
+
+        Args:
+            position (int): The number of moves to keep (0 restarts the deal).
+
+        Returns:
+            set: The indices of the stacks changed by the undone moves.
+        """
+        changed = set()
+        while self.history_manager.position > position:
+            move = self.undo_last_move()
+            changed.add(move.from_stack)
+            changed.add(move.to_stack)
+        return changed
+
+    def is_repeated_position(self):
+        """Check if the current position was already reached earlier in the game, e.g. after
+        cycling through the whole stock or moving a run back and forth without progress.
+
+        Returns:
+            bool: True if the position was reached before by the moves in the history.
+        """
+        return self.position_visits.get(self.hash, 0) > 1
+
+    def check_win(self):
+        """Check if all foundation stacks are complete.
+
+        Returns:
+            bool: True if all foundations are complete, False otherwise.
+        """
+        for stack in FOUNDATIONS:
+            if len(self.stacks[stack]) != 13:
+                return False
+        return True
+
+    def _transfer(self, from_stack, to_stack, count):
+        """Move the top `count` cards between two stacks without checking the rules.
+
+        Cards dealt from or back to the stock are turned over one at a time, so their
+        order is reversed. The hash is updated for the moved cards only.
+        """
+        source, target = self.stacks[from_stack], self.stacks[to_stack]
+        start = len(source) - count
+        cards = source[start:]
+        del source[start:]
+
+        # XOR the cards out of their old places, then into their new ones
+        value = self.hash
+        base = (from_stack * MAX_STACK_SIZE + start) * 52
+        for offset, card in enumerate(cards):
+            value ^= CARD_KEYS[base + offset * 52 + card]
+        if from_stack == STOCK or to_stack == STOCK:
+            cards.reverse()
+        base = (to_stack * MAX_STACK_SIZE + len(target)) * 52
+        for offset, card in enumerate(cards):
+            value ^= CARD_KEYS[base + offset * 52 + card]
+        self.hash = value
+        target.extend(cards)
+
+    def _reveal(self, stack):
+        """Turn the top card of a tableau stack face up if it is face down.
+
+        Returns:
+            bool: True if a card was turned over.
+        """
+        if stack in TABLEAU and self.stacks[stack] and self.hidden[stack] == len(self.stacks[stack]):
+            self._set_hidden(stack, self.hidden[stack] - 1)
+            return True
+        return False
+
+    def _set_hidden(self, stack, count):
+        """Set the number of face-down cards of a tableau stack, updating the hash."""
+        self.hash ^= HIDDEN_KEYS[stack][self.hidden[stack]] ^ HIDDEN_KEYS[stack][count]
+        self.hidden[stack] = count
+
+    def _visit(self, progress=False):
+        """Count a visit to the current position, after a move was made.
+
+        A progress move (turning a tableau card face up, or playing the top discard card) can only
+        be taken back by undo, so no earlier position can be reached again and their visits are
+        forgotten. The visits are also forgotten once there are as many as the history holds
+        moves, so the count stays bounded however long the game runs without progress.
+
+        Args:
+            progress (bool): Whether the move can never be reversed by another move (default: False).
+        """
+        if progress or len(self.position_visits) >= self.history_manager.max_moves:
+            self.position_visits = {}
+        self.position_visits[self.hash] = self.position_visits.get(self.hash, 0) + 1
+
+    def _leave(self):
+        """Forget the visit to the current position, before its move is undone."""
+        visits = self.position_visits.get(self.hash, 0) - 1
+        if visits > 0:
+            self.position_visits[self.hash] = visits
+        else:
+            self.position_visits.pop(self.hash, None)
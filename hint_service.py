@@ -0,0 +1,142 @@
+"""
+hint_service.py
+
+Background hint search for the game.
+
+This script defines the `HintService` class, which runs the solver on a copy of the
+position in a worker thread, so a deep search never blocks the event loop. (A thread rather
+than a process, since `main.py` runs the game at import time and a spawned process would
+start a second game.) A search is cancelled as soon as the position changes, and its result
+is only handed out if the position it was computed for is still the current one, so a stale
+hint is never shown.
+When the solver runs out of budget without settling the position, the service can rank the
+moves by random playouts instead (see `batch_state.best_move`).
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Standard Imports
+import logging
+import threading
+
+import pygame
+
+# Local Imports
+from solver import UNKNOWN, SolveResult
+
+# Event posted when a hint search finishes, to wake up the main loop
+HINT_READY = pygame.event.custom_type()
+
+# Status of the result of a search that raised an error instead of finishing
+FAILED = 'failed'
+
+
+def post_hint_ready():
+    """Post a HINT_READY event to the pygame event queue (safe to call from any thread)."""
+    if pygame.display.get_init():
+        pygame.event.post(pygame.event.Event(HINT_READY))
+
+
+class HintService:
+    """Class to represent the service searching for hints in the background.
+
+    Attributes:
+        solver (Solver): The solver used for the searches.
+        notify (callable): Called from the worker thread when a search finishes.
+        playouts (callable): Takes a position and returns the move with the best playout win rate,
+            used when the solver's budget runs out; None to keep the solver's move ordering.
+        searches (int): The number of searches started so far, used to tell them apart.
+        pending (tuple): The (search number, position hash, cancel event) of the running search, or None.
+        result (tuple): The (search number, position hash, SolveResult) of the last finished search, or None.
+        lock (threading.Lock): Guards `result`, which the worker thread writes.
+        search_lock (threading.Lock): Runs the searches one at a time, as they share the solver.
+    """
+
+    def __init__(self, solver, notify=post_hint_ready, playouts=None):
+        """Initialize the service.
+
+        Args:
+            solver (Solver): The solver used for the searches.
+            notify (callable): Called from the worker thread when a search finishes (default: post a HINT_READY event).
+            playouts (callable): Ranks the moves of an unsettled position by playouts (default: None, not used).
+        """
+        self.solver = solver
+        self.notify = notify
+        self.playouts = playouts
+        self.searches = 0
+        self.pending = None
+        self.result = None
+        self.lock = threading.Lock()
+        self.search_lock = threading.Lock()
+
+    def request(self, game_state):
+        """Start searching for a hint for the current position, cancelling any running search.
+
+        Args:
+            game_state (GameState): The current position. A copy is searched, so the game can go on.
+        """
+        self.cancel()
+        self.searches += 1
+        cancel_event = threading.Event()
+        self.pending = (self.searches, game_state.hash, cancel_event)
+        worker = threading.Thread(target=self._search, args=(self.searches, game_state.copy(), cancel_event),
+                                  name='hint-search', daemon=True)
+        worker.start()
+
+    def cancel(self):
+        """Cancel the running search, if any, and forget its result (e.g. after a move)."""
+        if self.pending:
+            self.pending[2].set()
+            self.pending = None
+        with self.lock:
+            self.result = None
+
+    def is_searching(self):
+        """Check if a search is running.
+
+        Returns:
+            bool: True if a requested hint is not ready yet.
+        """
+        return self.pending is not None
+
+    def poll(self, game_state):
+        """Collect the result of the running search, if it finished.
+
+        Args:
+            game_state (GameState): The current position.
+
+        Returns:
+            SolveResult: The result, if the search finished and was run for the current position (with
+                the FAILED status if it raised an error); None otherwise.
+        """
+        if not self.pending:
+            return None
+        with self.lock:
+            result, self.result = self.result, None
+        if result is None:
+            return None
+        search, position_hash, solve_result = result
+        if search != self.pending[0] or position_hash != game_state.hash:
+            return None  # Computed for a position that no longer exists
+        self.pending = None
+        return solve_result
+
+    def _search(self, search, state, cancel_event):
+        """Run a search in the worker thread and store its result, unless it was cancelled."""
+        with self.search_lock:  # A cancelled search stops within a few hundred nodes
+            if cancel_event.is_set():
+                return
+            try:
+                solve_result = self.solver.solve(state, should_stop=cancel_event.is_set)
+                if solve_result.status == UNKNOWN and self.playouts and not cancel_event.is_set():
+                    solve_result.best_move = self.playouts(state) or solve_result.best_move
+            except Exception:
+                # Still hand a result over, so poll stops waiting for this search
+                logging.exception('Hint search failed')
+                solve_result = SolveResult(FAILED, [], None, 0)
+        if cancel_event.is_set():
+            return
+        with self.lock:
+            self.result = (search, state.hash, solve_result)
+        self.notify()
@@ -7,40 +7,97 @@ Author: Chiriac Laura-Florina
 Created: 24-12-2024
 """
 
+# Standard Imports
+from array import array
+
+# Local Imports
+from move import LINKED_SHIFT, Move
+
+
 class HistoryManager:
     """
     Class to manage the history of moves in the game.
-    Allows recording moves, undoing the last move, and clearing history.
+    Allows recording moves, undoing and redoing them, and clearing history.
+
+    Moves are packed into 16-bit entries of an array, so each move costs two bytes.
+    The oldest moves are dropped once the history holds more than max_moves moves.
+    Linked moves (see `Move.linked`) form one undo entry with the moves before them.
     """
-    def __init__(self):
+    def __init__(self, max_moves=10000):
         """
         Initialize the HistoryManager with an empty history.
+
+        Args:
+            max_moves (int): The maximum number of moves kept for undo (default: 10000).
         """
-        self.history = []  # List to store the history of moves.
+        self.max_moves = max_moves
+        self.history = array('H')  # Packed moves, oldest first.
+        self.position = 0  # Number of moves that can be undone; the entries after it can be redone.
 
     def record_move(self, move):
         """
-        Record a move in the history.
+        Record a move in the history. The moves that could be redone are discarded.
 
         Args:
-            move: A tuple or object representing the move to be recorded.
+            move (Move): The move to be recorded.
         """
-        self.history.append(move)
+        del self.history[self.position:]
+        self.history.append(move.pack())
+        self.position += 1
+        if self.position > self.max_moves:
+            # Drop the oldest quarter at once, so trimming stays cheap on long sessions
+            drop = self.position - self.max_moves + self.max_moves // 4
+            del self.history[:drop]
+            self.position -= drop
 
     def undo_move(self):
         """
-        Undo the last move by retrieving and removing it from the history.
+        Undo the last move by retrieving it from the history. It can be redone afterwards.
 
         Returns:
-            The last move in the history, or None if the history is empty.
+            Move: The last move in the history, or None if there is no move to undo.
         """
-        if self.history:
-            return self.history.pop()  # Remove and return the last move.
+        if self.position:
+            self.position -= 1
+            return Move.unpack(self.history[self.position])
         return None  # No move to undo.
 
+    def redo_move(self):
+        """
+        Redo the last undone move by retrieving it from the history.
+
+        Returns:
+            Move: The last undone move, or None if there is no move to redo.
+        """
+        if self.position < len(self.history):
+            self.position += 1
+            return Move.unpack(self.history[self.position - 1])
+        return None  # No move to redo.
+
+    def last_move(self):
+        """
+        Get the last move made, e.g. to learn whether it turned a card face up.
+
+        Returns:
+            Move: The last move that can be undone, or None if there is none.
+        """
+        if self.position:
+            return Move.unpack(self.history[self.position - 1])
+        return None
+
+    def is_redo_linked(self):
+        """
+        Check if the next move to redo belongs to the same undo entry as the move before it.
+
+        Returns:
+            bool: True if there is a move to redo and it is linked.
+        """
+        return self.position < len(self.history) and bool(self.history[self.position] >> LINKED_SHIFT)
+
     def clear_history(self):
         """
         Clear all recorded history.
         Used when restarting the game.
         """
-        self.history = []
\ No newline at end of file
+        self.history = array('H')
+        self.position = 0
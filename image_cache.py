@@ -0,0 +1,87 @@
+"""
+image_cache.py
+
+Process-wide cache of loaded and resized images.
+
+This script defines the `ImageCache` class, which keeps decoded and scaled pygame
+surfaces keyed by (path, size), so the same image file is only read from disk once.
+The least recently used surfaces are evicted when the cache is full.
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Standard Imports
+from collections import OrderedDict
+
+import pygame
+
+CARD_BACK_PATH = 'resources/images/cards/card_back.png'
+
+
+class ImageCache:
+    """Class to represent a least-recently-used cache of image surfaces.
+
+    Attributes:
+        max_entries (int): The maximum number of surfaces kept in the cache.
+        surfaces (OrderedDict): The cached surfaces keyed by (path, size), least recently used first.
+    """
+
+    def __init__(self, max_entries=128):
+        """Initialize an empty cache.
+
+        Args:
+            max_entries (int): The maximum number of surfaces kept in the cache (default: 128).
+        """
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+
+    def get(self, path, size=None):
+        """Return the image at the given path, scaled to the given size.
+
+        The image is loaded and scaled on the first request only; later requests
+        for the same (path, size) return the same surface, which must not be modified.
+
+        Args:
+            path (str): The path to the image file.
+            size (tuple): The desired (width, height) of the image, or None to keep the original size.
+
+        Returns:
+            pygame.Surface: The loaded image.
+
+        Raises:
+            pygame.error: If the image cannot be loaded.
+        """
+        key = (path, tuple(size) if size else None)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+
+        surface = pygame.image.load(path)
+        if size:
+            surface = pygame.transform.scale(surface, size)
+        self.put(path, size, surface)
+        return surface
+
+    def put(self, path, size, surface):
+        """Add an already loaded surface to the cache.
+
+        Args:
+            path (str): The path of the image file the surface was made from.
+            size (tuple): The size the image was scaled to, or None for the original size.
+            surface (pygame.Surface): The surface.
+        """
+        key = (path, tuple(size) if size else None)
+        self.surfaces[key] = surface
+        self.surfaces.move_to_end(key)
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)  # Evict the least recently used surface
+
+    def clear(self):
+        """Remove all surfaces from the cache."""
+        self.surfaces.clear()
+
+
+# Shared cache used by the whole game
+image_cache = ImageCache()
@@ -0,0 +1,35 @@
+"""
+input_events.py
+
+Input stage for the game's event loop.
+
+High polling rate mice queue many motion events per frame. Only the latest position
+matters for dragging, so runs of consecutive motion events are collapsed into the last
+one before the events are handled.
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+import pygame
+
+
+def coalesce_motion(events):
+    """Collapse each run of consecutive mouse motion events into its last event.
+
+    Other events are kept in order, so a button press or release still sees the mouse
+    position that came before it.
+
+    Args:
+        events (list): The events of one frame, in order.
+
+    Returns:
+        list: The events with each run of motion events replaced by its last event.
+    """
+    coalesced = []
+    for event in events:
+        if event.type == pygame.MOUSEMOTION and coalesced and coalesced[-1].type == pygame.MOUSEMOTION:
+            coalesced[-1] = event
+        else:
+            coalesced.append(event)
+    return coalesced
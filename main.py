@@ -7,11 +7,58 @@ Author: Chiriac Laura-Florina
 Created: 22-12-2024
 """
 
+# Standard Imports
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+
 # Third-party Library Imports
 import pygame
 
 # Local Imports
+from asset_cache import AssetCache, load_menu_background, load_game_assets
+from deal_database import DealDatabase
+from deals import MAX_DEAL_NUMBER
 from deck import Deck
+from image_cache import image_cache
+from input_events import coalesce_motion
+from renderer import DirtyRectRenderer
+from scheduler import FrameScheduler
+from ui_cache import Button, StaticLayer, text_cache
+
+def parse_deal_number(text):
+    """Parse a deal number given on the command line.
+
+    Args:
+        text (str): The argument.
+
+    Returns:
+        int: The deal number.
+
+    Raises:
+        argparse.ArgumentTypeError: If the argument is not a whole number from 0 to MAX_DEAL_NUMBER.
+    """
+    try:
+        deal_number = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'{text!r} is not a deal number') from None
+    if not 0 <= deal_number <= MAX_DEAL_NUMBER:
+        raise argparse.ArgumentTypeError(f'deal numbers go from 0 to {MAX_DEAL_NUMBER}')
+    return deal_number
+
+# Deal number of the first game, if given on the command line (python main.py <deal number>). The arguments
+# are checked before the window opens, so a wrong one only prints the usage.
+parser = argparse.ArgumentParser(description='Play Solitaire.')
+parser.add_argument('deal_number', nargs='?', type=parse_deal_number,
+                    help='the deal to play first, to replay a deal (default: a random deal)')
+first_deal_number = parser.parse_args().deal_number
+
+# Interval (in seconds) after which the interpreter hands the GIL over to a waiting thread, e.g. from a
+# hint search back to the main loop. The default of 5 ms lets a search hold up a frame by that much each
+# time the loop gives the GIL away (e.g. while it sleeps until its next frame). Set once for the whole game.
+SWITCH_INTERVAL = 0.0002
+sys.setswitchinterval(SWITCH_INTERVAL)
 
 # Initialize Pygame
 pygame.init()
@@ -24,107 +71,95 @@ display_dimensions = (SCREEN_WIDTH, SCREEN_HEIGHT)
 screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption('Solitaire')
 
-# Loading background image for main menu
-background_image = pygame.image.load('resources/images/photorealistic-casino-lifestyle.jpg')
-background_image_game = pygame.image.load('resources/images/green_background.png')
+# Loading background image for main menu (the game assets are loaded in the background further below)
+asset_cache = AssetCache()
+background_image = load_menu_background(asset_cache)
+background_image_game = None
 
-# Setting frame rate
-clock = pygame.time.Clock()
+# Setting frame rate (only used while something is moving, the loop sleeps until the next event otherwise)
 FPS = 60
+scheduler = FrameScheduler(FPS)
+
+# The game screen only redraws the areas that changed since the last frame
+renderer = DirtyRectRenderer(screen)
+
+# Only deal games the solver can win, picked from the deal database if there is one
+WINNABLE_DEALS_ONLY = True
+DEAL_DATABASE_PATH = 'resources/deals.db'
+DEAL_DIFFICULTY = None  # 'easy', 'medium', 'hard' or None for any
+
+# Send safe cards to the foundations by themselves, and finish the game once every tableau card is face up
+AUTO_PLAY = True
 
 # Game states
 MAIN_MENU = 'main_menu'
 GAME = 'game'
+WIN = 'win'
 current_state = MAIN_MENU
 
-# Play button surface with per-pixel alpha
-play_button_surface = pygame.Surface((200, 70), pygame.SRCALPHA)
-play_button_rect = play_button_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 120))
-play_button = pygame.Rect(play_button_rect.topleft, play_button_rect.size)
+# Play button
+play_button = Button(pygame.Rect(0, 0, 200, 70), 'Play', 70, (50, 10))
+play_button.rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 120)
 
-# Quit button surface with per-pixel alpha
-quit_button_surface = pygame.Surface((200, 70), pygame.SRCALPHA)
-quit_button_rect = quit_button_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 230))
-quit_button = pygame.Rect(quit_button_rect.topleft, quit_button_rect.size)
+# Quit button
+quit_button = Button(pygame.Rect(0, 0, 200, 70), 'Quit', 70, (50, 10))
+quit_button.rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 230)
 
-# Create an undo button surface
-undo_button_surface = pygame.Surface((100, 70), pygame.SRCALPHA)
-undo_button_rect = undo_button_surface.get_rect(center=(SCREEN_WIDTH // 2 - 600, SCREEN_HEIGHT // 2 - 300))
-undo_button = pygame.Rect(undo_button_rect.topleft, undo_button_rect.size)
+# Undo button
+undo_button = Button(pygame.Rect(0, 0, 100, 70), 'Undo', 40)
+undo_button.rect.center = (SCREEN_WIDTH // 2 - 600, SCREEN_HEIGHT // 2 - 300)
 
-# Create a new game button surface
-new_game_button_surface = pygame.Surface((150, 50), pygame.SRCALPHA)
-new_game_button_rect = new_game_button_surface.get_rect(bottomright=(SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20))
-new_game_button = pygame.Rect(new_game_button_rect.topleft, new_game_button_rect.size)
+# Redo button
+redo_button = Button(pygame.Rect(0, 0, 100, 70), 'Redo', 40)
+redo_button.rect.center = (SCREEN_WIDTH // 2 - 600, SCREEN_HEIGHT // 2 - 210)
 
-# Create a hint button surface
-hint_button_surface = pygame.Surface((100, 50), pygame.SRCALPHA)
-hint_button_rect = hint_button_surface.get_rect(bottomright=(SCREEN_WIDTH - 20, SCREEN_HEIGHT - 80))
-hint_button = pygame.Rect(hint_button_rect.topleft, hint_button_rect.size)
+# New game button
+new_game_button = Button(pygame.Rect(0, 0, 150, 50), 'New Game', 30)
+new_game_button.rect.bottomright = (SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20)
 
-# Colors
-border_color = (255, 255, 255)
-text_color = (255, 255, 255)
-hover_color = (50, 50, 50, 118)
+# Hint button
+hint_button = Button(pygame.Rect(0, 0, 100, 50), 'Hint', 30)
+hint_button.rect.bottomright = (SCREEN_WIDTH - 20, SCREEN_HEIGHT - 80)
 
-# Fonts
-font = pygame.font.Font(None, 70)
-title_font = pygame.font.Font(None, 170)
+# Restart button
+restart_button = Button(pygame.Rect(0, 0, 150, 50), 'Restart', 30)
+restart_button.rect.bottomright = (SCREEN_WIDTH - 20, SCREEN_HEIGHT - 140)
 
-# Start Menu
-def main_menu():
-    """Displays the main menu and handles events for the menu.
+game_buttons = [undo_button, redo_button, new_game_button, hint_button, restart_button]
 
-    This includes the background, the play button, and the quit button, as well as handling events for the buttons.
-    """
-    screen.blit(background_image, (0, 0))
-
-    # Main Menu elements
-    mouse_pos = pygame.mouse.get_pos()
-
-    # Add title text
-    title_text = title_font.render('Solitaire', True, text_color)
-    screen.blit(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 330))  # Lower y-coordinate centered
-
-    # Play button
-    if play_button_rect.collidepoint(mouse_pos):
-        play_button_surface.fill(hover_color)
-    else:
-        play_button_surface.fill((0, 0, 0, 50))  # Fill with transparent color
-
-    pygame.draw.rect(play_button_surface, border_color, play_button_surface.get_rect(), 2)  # Draw the border
+# Main menu layer: background, title and buttons, composited once
+title_text = text_cache.render('Solitaire', 170)
+menu_layer = StaticLayer(
+    background_image,
+    texts=[(title_text, (SCREEN_WIDTH // 2 - title_text.get_width() // 2, 330))],  # Lower y-coordinate centered
+    buttons=[play_button, quit_button])
 
-    # Render the text
-    text = font.render('Play', True, text_color)
-    play_button_surface.blit(text, (50, 10))
-
-    # Draw the button
-    screen.blit(play_button_surface, play_button_rect.topleft)
-
-    # Quit button
-    if quit_button_rect.collidepoint(mouse_pos):
-        quit_button_surface.fill(hover_color)
-    else:
-        quit_button_surface.fill((0, 0, 0, 50))  # Fill with transparent color
-    pygame.draw.rect(quit_button_surface, border_color, quit_button_surface.get_rect(), 2)  # Draw the border
-
-    # Render the text
-    text = font.render('Quit', True, text_color)
-    quit_button_surface.blit(text, (50, 10))
+# Start Menu
+def main_menu(events):
+    """Handles the events for the menu and displays the main menu.
 
-    # Draw the button
-    screen.blit(quit_button_surface, quit_button_rect.topleft)
+    This includes the background, the play button, and the quit button, as well as handling events for the buttons.
 
+    Args:
+        events (list): The events to handle.
+    """
     # Main menu logic : for buttons and text
-    for ev in pygame.event.get():
+    for ev in events:
         if ev.type == pygame.QUIT:
             return False
         if ev.type == pygame.MOUSEBUTTONDOWN:
             if play_button.collidepoint(ev.pos):
                 global current_state
+                if deck is None:
+                    start_game()
                 current_state = GAME
+                renderer.mark_all()
+                scheduler.request_frame()
+                return True
             elif quit_button.collidepoint(ev.pos):
                 return False
+
+    menu_layer.draw(screen, pygame.mouse.get_pos())
     return True
 
 # Create the deck
@@ -134,6 +169,7 @@ card_size = (100, 150)
 def load_and_resize_image(path, size):
     """
     Loads and resizes an image to the specified size.
+    Images are loaded through the shared image cache, so each (path, size) is only decoded once.
 
     Args:
         path (str): The path to the image file.
@@ -146,113 +182,74 @@ def load_and_resize_image(path, size):
         FileNotFoundError: If the image file is not found.
     """
     try:
-        image = pygame.image.load(path)
+        return image_cache.get(path, size)
     except pygame.error:
         raise FileNotFoundError(f"Card image not found at: {path}")
-    return pygame.transform.scale(image, size)
-
-# Load card images
-card_images = {
-    'hearts': {rank: load_and_resize_image(f'resources/images/cards/{rank}_of_hearts.png', card_size) for rank in ['ace', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king']},
-    'diamonds': {rank: load_and_resize_image(f'resources/images/cards/{rank}_of_diamonds.png', card_size) for rank in ['ace', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king']},
-    'clubs': {rank: load_and_resize_image(f'resources/images/cards/{rank}_of_clubs.png', card_size) for rank in ['ace', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king']},
-    'spades': {rank: load_and_resize_image(f'resources/images/cards/{rank}_of_spades.png', card_size) for rank in ['ace', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'jack', 'queen', 'king']},
-    'card_back': load_and_resize_image('resources/images/cards/card_back.png', card_size)
-}
-
-# Create the deck object
-deck = Deck((0,0), card_images, card_size)
 
-# Put the stacks in the correct position on the screen
-deck.setup_stacks(display_dimensions)
+# Load the card images and the game background on a background thread while the menu is showing
+asset_loader = ThreadPoolExecutor(max_workers=1)
+game_assets = asset_loader.submit(load_game_assets, asset_cache, card_size, load_and_resize_image)
+asset_loader.shutdown(wait=False)
+
+# The deck object is created once the assets are loaded
+deck = None
+
+def start_game():
+    """Wait for the game assets to finish loading, then create the deck and put the stacks in place."""
+    global deck, background_image_game, game_layer
+    card_images, background_image_game = game_assets.result()
+    game_layer = StaticLayer(background_image_game, placeholders=card_places, buttons=game_buttons)
+
+    # Create the deck object
+    deck = Deck((0,0), card_images, card_size)
+    deck.auto_play = AUTO_PLAY
+    if os.path.exists(DEAL_DATABASE_PATH):
+        deck.deal_database = DealDatabase(DEAL_DATABASE_PATH)  # Memory-mapped, only the pages read are loaded
+
+    # Deal the first game and put the stacks in the correct position on the screen
+    deck.reset_all(display_dimensions, WINNABLE_DEALS_ONLY, first_deal_number, DEAL_DIFFICULTY)
+
+# Define rectangles for the four card places and the Stock Pile
+card_places = [
+    pygame.Rect((200, 50, 100, 150)),  # Stock card place
+    pygame.Rect((350, 50, 100, 150)),  # Second stock card place
+
+    pygame.Rect((650, 50, 100, 150)),  # First ace card place
+    pygame.Rect((800, 50, 100, 150)),  # Second ace card place
+    pygame.Rect((950, 50, 100, 150)),
+    pygame.Rect((1100, 50, 100, 150)),
+
+    # Card places for the table stacks
+    pygame.Rect((200, 250, 100, 150)),  # First table stack
+    pygame.Rect((350, 250, 100, 150)),  # Second table stack
+    pygame.Rect((500, 250, 100, 150)),
+    pygame.Rect((650, 250, 100, 150)),
+    pygame.Rect((800, 250, 100, 150)),
+    pygame.Rect((950, 250, 100, 150)),
+    pygame.Rect((1100, 250, 100, 150))
+
+]
+
+# Game board layer: background, card places and buttons, composited once the game background is loaded
+game_layer = None
 
 # Game Board
 def game_board():
     """
-    Displays the game board and handles events for the game.
+    Displays the game board.
 
-    This function handles the drawing of the game board, piles, and initial cards, as well as the undo, new game, and hint buttons.
+    This function draws the game board layer (background, card places and the undo, new game, and hint buttons),
+    with the button under the mouse in its hover state.
     """
+    game_layer.draw(screen, pygame.mouse.get_pos())
 
-    # Define rectangles for the four card places and the Stock Pile
-    card_places = [
-        pygame.Rect((200, 50, 100, 150)),  # Stock card place
-        pygame.Rect((350, 50, 100, 150)),  # Second stock card place
-
-        pygame.Rect((650, 50, 100, 150)),  # First ace card place
-        pygame.Rect((800, 50, 100, 150)),  # Second ace card place
-        pygame.Rect((950, 50, 100, 150)),
-        pygame.Rect((1100, 50, 100, 150)),
-
-        # Card places for the table stacks
-        pygame.Rect((200, 250, 100, 150)),  # First table stack
-        pygame.Rect((350, 250, 100, 150)),  # Second table stack
-        pygame.Rect((500, 250, 100, 150)),
-        pygame.Rect((650, 250, 100, 150)),
-        pygame.Rect((800, 250, 100, 150)),
-        pygame.Rect((950, 250, 100, 150)),
-        pygame.Rect((1100, 250, 100, 150))
-
-    ]
-
-    # Colors
-    card_place_color = (255, 255, 255)  # White color for card places
-
-    # Draw card places
-    for rect in card_places:
-        pygame.draw.rect(screen, card_place_color, rect, 2, border_radius=10)  # Draw the border
-
-    # Draw undo button
-    undo_hover_color = (50, 50, 50, 118)  # Hover color for button
-    undo_text_font = pygame.font.Font(None, 40)
-
-    if undo_button_rect.collidepoint(pygame.mouse.get_pos()):
-        undo_button_surface.fill(undo_hover_color) # Fill with hover color
-    else:
-        undo_button_surface.fill((0, 0, 0, 50)) # Fill with transparent color
-    pygame.draw.rect(undo_button_surface, border_color, undo_button_surface.get_rect(), 2) # Draw the border
-
-    # Fix button text
-    text = undo_text_font.render('Undo', True, text_color)
-    text_rect = text.get_rect(center=(undo_button_surface.get_width() // 2, undo_button_surface.get_height() // 2))
-
-    undo_button_surface.blit(text, text_rect.topleft)
-    screen.blit(undo_button_surface, undo_button_rect.topleft)
-
-    # Draw new game button
-    new_game_text_font = pygame.font.Font(None, 30)
-    if new_game_button_rect.collidepoint(pygame.mouse.get_pos()):
-        new_game_button_surface.fill(undo_hover_color)  # Fill with hover color
-    else:
-        new_game_button_surface.fill((0, 0, 0, 50))  # Fill with transparent color
-    pygame.draw.rect(new_game_button_surface, border_color, new_game_button_surface.get_rect(), 2)  # Draw the border
-
-    # Render button text
-    text = new_game_text_font.render('New Game', True, text_color)
-    text_rect = text.get_rect(
-        center=(new_game_button_surface.get_width() // 2, new_game_button_surface.get_height() // 2))
-
-    new_game_button_surface.blit(text, text_rect.topleft)
-    screen.blit(new_game_button_surface, new_game_button_rect.topleft)
-
-    # Draw hint button
-    hint_text_font = pygame.font.Font(None, 30)  # Smaller font size
-    if hint_button_rect.collidepoint(pygame.mouse.get_pos()):
-        hint_button_surface.fill(undo_hover_color)  # Fill with hover color
-    else:
-        hint_button_surface.fill((0, 0, 0, 50))  # Fill with transparent color
-    pygame.draw.rect(hint_button_surface, border_color, hint_button_surface.get_rect(), 2)  # Draw the border
-
-    # Render button text
-    text = hint_text_font.render('Hint', True, text_color)
-    text_rect = text.get_rect(
-        center=(hint_button_surface.get_width() // 2, hint_button_surface.get_height() // 2))
-
-    hint_button_surface.blit(text, text_rect.topleft)
-    screen.blit(hint_button_surface, hint_button_rect.topleft)
+# Time at which the win screen ends
+win_end_time = None
 
 def win_screen(screen, duration=5):
-    """Display a win screen for a specified duration.
+    """Display a win screen and switch to the win state for a specified duration.
+
+    The win state waits for the duration without blocking the event loop.
 
     Args:
         screen (pygame.Surface): The Pygame surface where the win screen will be displayed.
@@ -261,43 +258,129 @@ def win_screen(screen, duration=5):
     Returns:
         None
     """
+    global current_state, win_end_time
     screen.blit(background_image_game, (0, 0))
-    win_font = pygame.font.Font(None, 100)
-    text = win_font.render('You Win!', True, (255, 255, 255))
+    text = text_cache.render('You Win!', 100)
     screen_width, screen_height = screen.get_size()
     text_rect = text.get_rect(center=(screen_width // 2, screen_height // 2))
     screen.blit(text, text_rect)
     pygame.display.flip()
-    pygame.time.wait(duration * 1000)  # Wait for the specified duration in milliseconds
+    win_end_time = pygame.time.get_ticks() + duration * 1000
+    current_state = WIN
 
-# Game function
-def game():
-    """Displays the game board and handles events for the game.
+def win_state(events):
+    """Handles the events while the win screen is showing and ends the game once its time is over.
 
-    This function handles the overall game logic: drawing the board, drawing the cards, and then handling occuring events."""
-    screen.blit(background_image_game, (0, 0))
+    Args:
+        events (list): The events to handle.
+    """
+    for ev in events:
+        if ev.type == pygame.QUIT:
+            return False
+    if pygame.time.get_ticks() >= win_end_time:
+        deck.reset_all(display_dimensions, WINNABLE_DEALS_ONLY, difficulty=DEAL_DIFFICULTY)
+        return False
+    return True
+
+def get_timeout():
+    """Returns the number of milliseconds until the next timer of the current state runs out, or None."""
+    if current_state == WIN:
+        return max(0, win_end_time - pygame.time.get_ticks())
+    if current_state == GAME:
+        return deck.get_highlight_timeout()
+    return None
+
+# Button the mouse is over in the game screen, to redraw buttons only when their hover state changes
+hovered_button = None
+
+def update_hovered_button():
+    """Marks the game buttons whose hover state changed since the last frame for redrawing."""
+    global hovered_button
+    mouse_pos = pygame.mouse.get_pos()
+    button = None
+    for game_button in game_buttons:
+        if game_button.collidepoint(mouse_pos):
+            button = game_button
+    if button is not hovered_button:
+        for game_button in (hovered_button, button):
+            if game_button:
+                renderer.mark_dirty(game_button.rect)
+        hovered_button = button
+
+def draw_deal_number():
+    """Draws the number of the current deal in the bottom left corner, so the deal can be replayed."""
+    text = text_cache.render(f'Deal #{deck.deal_number}', 30)
+    screen.blit(text, text.get_rect(bottomleft=(20, SCREEN_HEIGHT - 20)))
+
+# Shown when no move can make progress any more, with the buttons that get the game going again outlined
+DEAD_END_MESSAGE = 'No moves left: Undo or start a New Game'
+dead_end_shown = False
+
+def get_dead_end_rects():
+    """Returns the areas of the dead-end message and of the outlines of the undo and new game buttons."""
+    text = text_cache.render(DEAD_END_MESSAGE, 40)
+    return [text.get_rect(midbottom=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 20)),
+            undo_button.rect.inflate(12, 12), new_game_button.rect.inflate(12, 12)]
+
+def update_dead_end_message():
+    """Marks the dead-end message for redrawing when the deck's dead-end state changes."""
+    global dead_end_shown
+    if deck.dead_end != dead_end_shown:
+        renderer.mark_dirty(*get_dead_end_rects())
+        dead_end_shown = deck.dead_end
+
+def draw_dead_end_message():
+    """Draws the dead-end message at the bottom of the screen and outlines the undo and new game buttons."""
+    message_rect, *button_rects = get_dead_end_rects()
+    screen.blit(text_cache.render(DEAD_END_MESSAGE, 40), message_rect)
+    for button_rect in button_rects:
+        pygame.draw.rect(screen, (255, 0, 0), button_rect, 4)
+
+def draw_game():
+    """Draws the whole game screen: the game board, the deal number, the dead-end message and the cards."""
     game_board()
+    draw_deal_number()
+    if deck.dead_end:
+        draw_dead_end_message()
     deck.draw(screen)
-    handle_events(deck)
-    if deck.check_win():
+
+# Game function
+def game(events):
+    """Displays the game board and handles events for the game.
+
+    This function handles the overall game logic: handling occuring events, then redrawing the parts of the board
+    and the cards that changed.
+
+    Args:
+        events (list): The events to handle.
+    """
+    handle_events(deck, events)
+    deck.update_animation()  # Move the cards flying after automatic moves
+    deck.update_hint()  # Show the background hint search's result once it is ready (it posts HINT_READY)
+    deck.update_highlights()
+    update_hovered_button()
+    update_dead_end_message()
+    renderer.mark_dirty(*deck.pop_dirty_rects())
+    renderer.render(draw_game)
+    if deck.check_win() and not deck.is_animating():
         print("You won!")
         # Clear the screen and put a new win screen
         win_screen(screen)
-        deck.reset_all(display_dimensions)
-        return False
     return True
 
 # Handle events function for adding the game logic to the game
-def handle_events(deck):
+def handle_events(deck, events):
     """Handles the events for the game such as clicks on game buttons, drag-and-drop for cards, quitting action.
 
     Args:
         deck (Deck): The deck object for the game.
+        events (list): The events to handle.
 
     Returns:
         None
     """
-    for event in pygame.event.get():
+    # Only the latest of consecutive mouse motions matters for dragging
+    for event in coalesce_motion(events):
         if event.type == pygame.QUIT:
             pygame.quit()
             exit()
@@ -305,21 +388,21 @@ def handle_events(deck):
             mouse_position = pygame.mouse.get_pos()
             if undo_button.collidepoint(mouse_position):
                 deck.undo_last_move()
+            if redo_button.collidepoint(mouse_position):
+                deck.redo_last_move()
             if new_game_button.collidepoint(mouse_position):
-                deck.reset_all(display_dimensions)
+                deck.reset_all(display_dimensions, WINNABLE_DEALS_ONLY, difficulty=DEAL_DIFFICULTY)
+                renderer.mark_all()  # The deal number changed too
+            if restart_button.collidepoint(mouse_position):
+                deck.restart_deal()
             if hint_button.collidepoint(mouse_position):
                 deck.show_hint()
             if deck.stock_stack.rect.collidepoint(mouse_position):
                 deck.check_for_stock_click(mouse_position)
-            for stack in deck.stacks:
-                for card in stack.cards[::-1]:
-                    if card.check_if_clicked(mouse_position):
-                        draggable_stack = card.get_draggable_stack()
-                        for c in draggable_stack:
-                            c.start_drag(mouse_position)
-                        deck.dragged_cards = draggable_stack
-                        stack.remove_cards(draggable_stack)
-                        break
+            hit = deck.spatial_index.get_card_at(mouse_position)
+            if hit:
+                stack, card = hit
+                deck.start_dragging(stack, card.get_draggable_stack(), mouse_position)
         elif event.type == pygame.MOUSEBUTTONUP:
             if deck.dragged_cards:
                 deck.stop_dragging()
@@ -328,17 +411,20 @@ def handle_events(deck):
                 deck.dragged_cards = None
         elif event.type == pygame.MOUSEMOTION:
             if deck.dragged_cards:
-                for card in deck.dragged_cards:
-                    card.update_position(pygame.mouse.get_pos())
+                deck.drag_to(event.pos)
 
 # Main run loop
 run = True
 while run:
-    clock.tick(FPS) # Set the frame rate
+    # Run at the frame rate while cards are dragged or flying, otherwise sleep until an event or a timer
+    animating = current_state == GAME and (bool(deck.dragged_cards) or deck.is_animating())
+    events = scheduler.next_events(animating, get_timeout())
     if current_state == MAIN_MENU:
-        run = main_menu() # Run the main menu
+        run = main_menu(events) # Run the main menu
+        pygame.display.flip() # Update the display
     elif current_state == GAME:
-        run = game() # Run the game
-    pygame.display.flip() # Update the display
+        run = game(events) # Run the game (it updates the changed areas of the display itself)
+    elif current_state == WIN:
+        run = win_state(events) # Wait for the end of the win screen
 
-pygame.quit() # Quit game after the loop ends
\ No newline at end of file
+pygame.quit() # Quit game after the loop ends
@@ -7,51 +7,67 @@ Author: Chiriac Laura-Florina
 Created: 08-12-2024
 """
 
+# Bit layout of a packed move: flipped (1 bit), count (6 bits), to_stack (4 bits), from_stack (4 bits), linked (1 bit)
+COUNT_SHIFT = 1
+TO_SHIFT = 7
+FROM_SHIFT = 11
+LINKED_SHIFT = 15
+
+
 class Move:
     """
-    Class to retain the details of a move in the game, including the cards moved,
-    the source stack, the destination stack, and the state changes involved.
+    Class to retain the details of a move in the game: the source stack, the destination stack,
+    the number of cards moved, whether the move turned a tableau card face up and whether it
+    belongs to the same undo entry as the move before it.
     """
 
-    def __init__(self, cards, from_stack, to_stack):
+    def __init__(self, from_stack, to_stack, count, flipped=False, linked=False):
         """
         Initialize the Move object with details about the cards being moved and their origin/destination.
 
         Args:
-            cards (list): The list of card objects being moved.
-            from_stack (Stack): The stack from which the cards are moved.
-            to_stack (Stack): The stack to which the cards are moved.
+            from_stack (int): The index of the stack from which the cards are moved.
+            to_stack (int): The index of the stack to which the cards are moved.
+            count (int): The number of cards moved.
+            flipped (bool): Whether the move turned the new top card of the from_stack face up.
+            linked (bool): Whether the move is undone and redone together with the move before it,
+                e.g. the moves of an auto-complete.
         """
-        self.cards = cards  # List of cards being moved.
         self.from_stack = from_stack  # The stack from which the cards are moved.
         self.to_stack = to_stack  # The stack to which the cards are moved.
+        self.count = count  # Number of cards moved.
+        self.flipped = flipped  # True if a face-down card was revealed by the move.
+        self.linked = linked  # True if the move is part of the same undo entry as the move before it.
 
-        # Record the original positions of the cards being moved
-        self.positions = [card.position for card in cards]
-
-        # Record the face-up states of the cards being moved
-        self.face_up_states = [card.face_up for card in cards]
+    def __str__(self):
+        """
+        Return a string representation of the move.
 
-        # Record the face-up state of the last card remaining in the from_stack
-        if len(from_stack.cards) > len(cards):
-            self.last_card_face_up_state = from_stack.cards[-len(cards) - 1].face_up
-        else:
-            self.last_card_face_up_state = None
+        Returns:
+            str: A description of the move, including the number of cards and their source/destination stacks.
+        """
+        return f"Move {self.count} card(s) from stack {self.from_stack} to stack {self.to_stack}"
 
-        # Record the face-up states of all cards in the from_stack
-        self.from_stack_face_up_state = [card.face_up for card in from_stack.cards]
+    def pack(self):
+        """
+        Pack the move into a 16-bit integer, for storing it in the history.
 
-        # Record the face-up states of all cards in the to_stack
-        self.to_stack_face_up_state = [card.face_up for card in to_stack.cards]
+        Returns:
+            int: The packed move.
+        """
+        return (int(self.linked) << LINKED_SHIFT) | (self.from_stack << FROM_SHIFT) | (self.to_stack << TO_SHIFT) | \
+            (self.count << COUNT_SHIFT) | int(self.flipped)
 
-    def __str__(self):
+    @staticmethod
+    def unpack(value):
         """
-        Return a string representation of the move.
+        Create a move from a packed 16-bit integer.
+
+        Args:
+            value (int): The packed move, as returned by pack().
 
         Returns:
-            str: A description of the move, including the cards and their source/destination stacks.
+            Move: The unpacked move.
         """
-        # Get the names of the cards being moved
-        card_names = ', '.join(str(card) for card in self.cards)
-        return f"Move {card_names} from {self.from_stack} to {self.to_stack}"
-
+        return Move((value >> FROM_SHIFT) & 0xF, (value >> TO_SHIFT) & 0xF, (value >> COUNT_SHIFT) & 0x3F,
+                    bool(value & 1), bool(value >> LINKED_SHIFT))
@@ -0,0 +1,138 @@
+"""
+move_index.py
+
+Incremental index of the legal moves of a game.
+
+This script defines the `LegalMoveIndex` class, which records, for the top card of every
+stack and the head of every face-up tableau run, which stacks can accept it. After a
+move only the stacks it touched are re-examined, so the random policy of the simulator and
+the legal actions of the environment become lookups instead of a scan over every card and
+every stack.
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Local Imports
+from game_state import STACK_COUNT, STOCK, TABLEAU
+
+TABLEAU_MASK = sum(1 << stack for stack in TABLEAU)  # Runs of more than one card only go onto the tableau
+
+
+class LegalMoveIndex:
+    """Class to represent the legal moves of a game state, kept up to date as stacks change.
+
+    Attributes:
+        game_state (GameState): The game state being indexed.
+        targets (list): For each source stack, a dict mapping the number of cards moved to a
+            bit mask of the stacks that accept them (bit i set for stack i).
+    """
+
+    def __init__(self, game_state):
+        """Build the index for a game state.
+
+        Args:
+            game_state (GameState): The game state to index.
+        """
+        self.game_state = game_state
+        self.targets = [{} for _ in range(STACK_COUNT)]
+        self.rebuild()
+
+    def rebuild(self):
+        """Index every stack again, e.g. after a new deal."""
+        self.update(range(STACK_COUNT))
+
+    def update(self, stacks):
+        """Index the given stacks again after they changed.
+
+        The moves out of a changed stack are recomputed, and every other source is only
+        checked again against the changed stacks.
+
+        Args:
+            stacks (iterable): The indices of the stacks that changed.
+        """
+        changed = set(stacks)
+        changed_mask = 0
+        for stack in changed:
+            changed_mask |= 1 << stack
+            self.targets[stack] = self._index_source(stack)
+
+        state = self.game_state
+        for source in range(STACK_COUNT):
+            if source in changed:
+                continue
+            cards = state.stacks[source]
+            counts = self.targets[source]
+            for count in counts:
+                card = cards[-count]
+                mask = counts[count] & ~changed_mask
+                for target in changed:
+                    if state.can_add_card(target, card):
+                        mask |= 1 << target
+                counts[count] = mask if count == 1 else mask & TABLEAU_MASK
+
+    def _index_source(self, source):
+        """Compute the moves out of a stack.
+
+        Returns:
+            dict: The bit mask of accepting stacks, keyed by the number of cards moved.
+        """
+        state = self.game_state
+        cards = state.stacks[source]
+        if source == STOCK or not cards:
+            return {}
+        if source in TABLEAU:
+            counts = range(len(cards) - state.hidden[source], 0, -1)  # Every face-up run, longest first
+        else:
+            counts = (1,)  # Only the top card can leave the discard and foundation stacks
+
+        moves = {}
+        for count in counts:
+            card = cards[-count]
+            mask = 0
+            for target in range(STACK_COUNT):
+                if target != source and state.can_add_card(target, card):
+                    mask |= 1 << target
+            moves[count] = mask if count == 1 else mask & TABLEAU_MASK
+        return moves
+
+    def get_moves(self):
+        """Get all legal moves.
+
+        Moves are ordered by source stack, then from the deepest card of each stack to its
+        top card, then by target stack.
+
+        Returns:
+            list: (from_stack, count, to_stack) tuples.
+        """
+        moves = []
+        for source, counts in enumerate(self.targets):
+            for count, mask in counts.items():
+                target = 0
+                while mask:
+                    if mask & 1:
+                        moves.append((source, count, target))
+                    mask >>= 1
+                    target += 1
+        return moves
+
+    def get_targets(self, source, count):
+        """Get the stacks that accept the top `count` cards of a stack.
+
+        Args:
+            source (int): The index of the source stack.
+            count (int): The number of cards moved.
+
+        Returns:
+            list: The indices of the accepting stacks.
+        """
+        mask = self.targets[source].get(count, 0)
+        return [target for target in range(STACK_COUNT) if mask >> target & 1]
+
+    def has_moves(self):
+        """Check if any card can be moved from one stack to another (not counting the stock).
+
+        Returns:
+            bool: True if there is at least one legal move.
+        """
+        return any(mask for counts in self.targets for mask in counts.values())
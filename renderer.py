@@ -0,0 +1,92 @@
+"""
+renderer.py
+
+Dirty-rectangle renderer for the game screen.
+
+This script defines the `DirtyRectRenderer` class, which collects the screen areas
+that changed since the last frame, redraws only those areas and pushes them to the
+display with `pygame.display.update(rects)`. When nothing changed, a frame costs
+nothing at all.
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+import pygame
+
+
+class DirtyRectRenderer:
+    """Class to represent a renderer that only redraws the changed areas of the screen.
+
+    Attributes:
+        screen (pygame.Surface): The display surface.
+        dirty_rects (list): The areas to redraw on the next frame.
+        full_redraw (bool): Whether the whole screen has to be redrawn on the next frame.
+    """
+
+    def __init__(self, screen):
+        """Initialize the renderer.
+
+        Args:
+            screen (pygame.Surface): The display surface.
+        """
+        self.screen = screen
+        self.dirty_rects = []
+        self.full_redraw = True
+
+    def mark_dirty(self, *rects):
+        """Record screen areas to redraw on the next frame.
+
+        Args:
+            *rects (pygame.Rect): The areas that changed.
+        """
+        self.dirty_rects.extend(rects)
+
+    def mark_all(self):
+        """Redraw the whole screen on the next frame."""
+        self.full_redraw = True
+
+    def get_update_rects(self):
+        """Get the areas to redraw, clipped to the screen, with overlapping areas merged.
+
+        Returns:
+            list: The areas to redraw, as pygame.Rect objects.
+        """
+        screen_rect = self.screen.get_rect()
+        if self.full_redraw:
+            return [screen_rect]
+
+        merged = []
+        for rect in self.dirty_rects:
+            rect = screen_rect.clip(rect)
+            if not rect.width or not rect.height:
+                continue
+            # Absorb every area the rectangle overlaps, until it overlaps none
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def render(self, draw):
+        """Redraw the changed areas and push them to the display.
+
+        Args:
+            draw (callable): The function drawing the whole screen. It is called once per
+                area to redraw, with the screen clipped to that area.
+
+        Returns:
+            list: The areas that were redrawn (empty if nothing changed).
+        """
+        update_rects = self.get_update_rects()
+        for rect in update_rects:
+            self.screen.set_clip(rect)
+            draw()
+        self.screen.set_clip(None)
+        if update_rects:
+            pygame.display.update(update_rects)
+
+        self.dirty_rects = []
+        self.full_redraw = False
+        return update_rects
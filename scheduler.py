@@ -0,0 +1,67 @@
+"""
+scheduler.py
+
+Frame scheduler for the main loop.
+
+This script defines the `FrameScheduler` class, which paces the main loop at a fixed
+frame rate only while something is moving (a drag, for example). The rest of the time
+it blocks on `pygame.event.wait` until an event arrives or a timer runs out, so an
+idle game uses no CPU.
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+import pygame
+
+
+class FrameScheduler:
+    """Class to represent the scheduler deciding when the main loop runs its next iteration.
+
+    Attributes:
+        fps (int): The frame rate used while something is moving.
+        clock (pygame.time.Clock): The clock pacing the frames.
+        frame_requested (bool): Whether the next iteration must run without waiting for an event.
+        wakeups (int): The number of iterations scheduled so far.
+    """
+
+    def __init__(self, fps=60):
+        """Initialize the scheduler. The first iteration runs without waiting.
+
+        Args:
+            fps (int): The frame rate used while something is moving (default: 60).
+        """
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+        self.frame_requested = True
+        self.wakeups = 0
+
+    def request_frame(self):
+        """Run the next iteration without waiting for an event, e.g. after switching screens."""
+        self.frame_requested = True
+
+    def next_events(self, animating=False, timeout=None):
+        """Wait until the next iteration of the main loop is due and return its events.
+
+        Args:
+            animating (bool): Whether something is moving; if so, iterations run at the frame rate.
+            timeout (int): The number of milliseconds until a timer runs out (e.g. a hint highlight
+                expiring), or None if no timer is running.
+
+        Returns:
+            list: The events to handle in this iteration (possibly empty).
+        """
+        self.wakeups += 1
+        if animating or self.frame_requested:
+            self.frame_requested = False
+            self.clock.tick(self.fps)
+            return pygame.event.get()
+
+        if timeout is None:
+            event = pygame.event.wait()  # Block until something happens
+        else:
+            event = pygame.event.wait(max(1, timeout))  # Block until something happens or the timer runs out
+        events = [] if event.type == pygame.NOEVENT else [event]
+        events.extend(pygame.event.get())
+        self.clock.tick()  # Keep the clock in step for the next animated frame
+        return events
@@ -0,0 +1,205 @@
+"""
+simulate.py
+
+Batch simulation of numbered deals on the headless game state.
+
+This script plays (or solves) a range of deal numbers with one of three policies, on
+every core through a process pool, and streams one CSV line per deal to a results file
+as the games finish:
+
+- random: random legal moves (and stock clicks), up to a move limit;
+- greedy: the first move in the order the hint search tries them (safe foundation moves,
+  moves revealing cards, ..., the stock), without looking ahead, never going back to a
+  position already reached;
+- solver: the solver, within a node budget per deal.
+
+It reports the win rate, the moves per game and the nodes searched per second. Run it
+from the project root, for example:
+
+    python simulate.py --first 0 --count 100000 --policy greedy --output greedy.csv
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Standard Imports
+import argparse
+import multiprocessing
+import random
+import sys
+import time
+
+# Local Imports
+from deals import deal_cards
+from game_state import DISCARD, GameState, STOCK
+from move_index import LegalMoveIndex
+from solver import LOST, UNKNOWN, WON, Solver
+
+POLICIES = ('random', 'greedy', 'solver')
+STOCK_CLICK = None  # Stands for a click on the stock in the lists of candidate moves
+
+# Settings of the worker processes, set by init_worker
+worker_settings = {}
+
+
+def apply_move(state, index, move):
+    """Make a (from_stack, count, to_stack) move, or a stock click, and update the move index.
+
+    Returns:
+        bool: True if the move was made.
+    """
+    if move is STOCK_CLICK:
+        done = state.stock_click()
+        changed = (STOCK, DISCARD)
+    else:
+        from_stack, count, to_stack = move
+        done = state.move(from_stack, to_stack, count)
+        changed = (from_stack, to_stack)
+    if done:
+        index.update(changed)
+    return bool(done)
+
+
+def play_greedy(state, max_moves, solver):
+    """Play a game with the greedy policy.
+
+    The first of the solver's ordered moves is made. A move leading back to a position
+    already reached is taken back and the next one is tried; the game is lost when every
+    move does.
+
+    Returns:
+        int: The number of moves made.
+    """
+    moves = 0
+    while moves < max_moves and not state.check_win():
+        for from_stack, to_stack, count in solver.get_ordered_moves(state):
+            if from_stack == STOCK or to_stack == STOCK:
+                state.stock_click()
+            else:
+                state.move(from_stack, to_stack, count)
+            if not state.is_repeated_position():
+                break
+            state.undo_last_move()
+        else:
+            break  # No move makes progress
+        moves += 1
+    return moves
+
+
+def play_random(state, max_moves, rng):
+    """Play a game with random legal moves and stock clicks.
+
+    Returns:
+        int: The number of moves made.
+    """
+    index = LegalMoveIndex(state)
+    moves = 0
+    while moves < max_moves and not state.check_win():
+        candidates = index.get_moves()
+        if state.stacks[STOCK] or state.stacks[DISCARD]:
+            candidates.append(STOCK_CLICK)
+        if not candidates:
+            break
+        apply_move(state, index, rng.choice(candidates))
+        moves += 1
+    return moves
+
+
+def init_worker(policy, max_moves, max_nodes):
+    """Store the settings of a worker process, so tasks only carry their deal number."""
+    worker_settings.update(policy=policy, max_moves=max_moves, solver=Solver(max_nodes=max_nodes))
+
+
+def run_deal(deal_number):
+    """Play or solve one deal with the worker's policy.
+
+    Args:
+        deal_number (int): The deal to play.
+
+    Returns:
+        tuple: (deal_number, result, moves, nodes, seconds), where result is 'won', 'lost'
+            or, for the solver, 'unknown' when it neither won nor proved the deal lost (its pruned
+            search running out of moves is no proof, see `SolveResult.winnable`).
+    """
+    start = time.perf_counter()
+    state = GameState(max_history=worker_settings['max_moves'] + 1)
+    state.deal(deal_cards(deal_number))
+    policy = worker_settings['policy']
+    nodes = 0
+    if policy == 'solver':
+        solve_result = worker_settings['solver'].solve(state)
+        result = {True: WON, False: LOST, None: UNKNOWN}[solve_result.winnable]
+        moves, nodes = len(solve_result.line), solve_result.nodes
+    else:
+        if policy == 'greedy':
+            moves = play_greedy(state, worker_settings['max_moves'], worker_settings['solver'])
+        else:
+            moves = play_random(state, worker_settings['max_moves'], random.Random(deal_number))
+        result = 'won' if state.check_win() else 'lost'
+    return deal_number, result, moves, nodes, time.perf_counter() - start
+
+
+def positive_int(text):
+    """Parse a command line argument that must be a whole number of at least 1."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'{text!r} is not a whole number') from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f'{value} is not at least 1')
+    return value
+
+
+def parse_args(argv):
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description='Play or solve a range of numbered deals in parallel.')
+    parser.add_argument('--first', type=int, default=0, help='first deal number (default: 0)')
+    parser.add_argument('--count', type=positive_int, default=1000, help='number of deals (default: 1000)')
+    parser.add_argument('--policy', choices=POLICIES, default='greedy', help='policy (default: greedy)')
+    parser.add_argument('--workers', type=positive_int, default=multiprocessing.cpu_count(),
+                        help='worker processes (default: one per core)')
+    parser.add_argument('--max-moves', type=int, default=1000,
+                        help='move limit per game for the random and greedy policies (default: 1000)')
+    parser.add_argument('--max-nodes', type=int, default=100000,
+                        help='node budget per deal for the solver policy (default: 100000)')
+    parser.add_argument('--output', default='results.csv', help='results file (default: results.csv)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the simulation and print a summary."""
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    deal_numbers = range(args.first, args.first + args.count)
+    chunk_size = max(1, min(64, args.count // (args.workers * 16)))
+
+    results = {'won': 0, 'lost': 0, 'unknown': 0}
+    total_moves = total_nodes = 0
+    search_seconds = 0.0
+    start = time.perf_counter()
+    with open(args.output, 'w') as output, multiprocessing.Pool(
+            args.workers, init_worker, (args.policy, args.max_moves, args.max_nodes)) as pool:
+        output.write('deal,result,moves,nodes,seconds\n')
+        for done, (deal_number, result, moves, nodes, seconds) in enumerate(
+                pool.imap_unordered(run_deal, deal_numbers, chunk_size), 1):
+            output.write(f'{deal_number},{result},{moves},{nodes},{seconds:.4f}\n')
+            results[result] += 1
+            total_moves += moves
+            total_nodes += nodes
+            search_seconds += seconds
+            if done % 1000 == 0:
+                output.flush()
+                print(f'{done}/{args.count} deals, {results["won"] / done:.1%} won', file=sys.stderr)
+    elapsed = time.perf_counter() - start
+
+    print(f'{args.count} deals with the {args.policy} policy on {args.workers} workers in {elapsed:.1f} s '
+          f'({args.count / elapsed:.0f} deals/s)')
+    print(f'won: {results["won"]} ({results["won"] / args.count:.1%}), lost: {results["lost"]}, '
+          f'unknown: {results["unknown"]}')
+    print(f'moves per game: {total_moves / args.count:.1f}')
+    if args.policy == 'solver':
+        print(f'nodes searched: {total_nodes} ({total_nodes / search_seconds:.0f} nodes/s per worker, '
+              f'{total_nodes / elapsed:.0f} nodes/s in total)')
+
+
+if __name__ == '__main__':
+    main()
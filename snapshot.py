@@ -0,0 +1,201 @@
+"""
+snapshot.py
+
+Immutable position snapshots for searches that branch.
+
+This script defines the `Snapshot` class, a position stored as tuples: 13 stack tuples, the
+face-down counts and the Zobrist hash. A snapshot is never changed; applying a move returns a
+new snapshot that shares every untouched stack tuple with its parent, so a child costs one
+13-slot tuple plus the two stacks the move changed, and going back is just keeping the
+parent. Searches can branch from any position without undoing moves on a `GameState` or
+touching the stacks the game draws, and a snapshot can be handed to another thread as is.
+`batch_state.score_moves` applies each candidate move to a snapshot, to score the moves that
+lead to positions playing the same (see `Snapshot.canonical_key`) only once.
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Local Imports
+from game_state import (DISCARD, EMPTY, FOUNDATIONS, STACK_ACCEPTS, STACK_COUNT, STOCK, TABLEAU, GameState)
+from move import Move
+from zobrist import CARD_KEYS, HIDDEN_KEYS, MAX_STACK_SIZE, position_hash
+
+
+class Snapshot:
+    """Class to represent a position that never changes.
+
+    Attributes:
+        stacks (tuple): 13 tuples of encoded cards, bottom card first, in the order of `Deck.stacks`.
+        hidden (tuple): The number of face-down cards at the bottom of each tableau stack.
+        hash (int): The 64-bit Zobrist hash of the position, the same as a `GameState` in that position.
+    """
+
+    __slots__ = ('stacks', 'hidden', 'hash')
+
+    def __init__(self, stacks, hidden, value=None):
+        """Initialize a snapshot.
+
+        Args:
+            stacks (tuple): 13 tuples of encoded cards.
+            hidden (tuple): The number of face-down cards of each stack.
+            value (int): The hash of the position, or None to compute it.
+        """
+        self.stacks = stacks
+        self.hidden = hidden
+        self.hash = position_hash(stacks, hidden) if value is None else value
+
+    @classmethod
+    def from_game_state(cls, game_state):
+        """Take a snapshot of a game state's position.
+
+        Args:
+            game_state (GameState): The position.
+
+        Returns:
+            Snapshot: The snapshot.
+        """
+        return cls(tuple(tuple(cards) for cards in game_state.stacks), tuple(game_state.hidden), game_state.hash)
+
+    def to_game_state(self, max_history=10000):
+        """Create a game state in the position, e.g. for the solver to play on.
+
+        Args:
+            max_history (int): The maximum number of moves the game state keeps for undo (default: 10000).
+
+        Returns:
+            GameState: A new game state, with an empty history.
+        """
+        state = GameState(max_history)
+        state.stacks = [list(cards) for cards in self.stacks]
+        state.hidden = list(self.hidden)
+        state.hash = self.hash
+        state.position_visits = {self.hash: 1}
+        return state
+
+    def __eq__(self, other):
+        return isinstance(other, Snapshot) and self.stacks == other.stacks and self.hidden == other.hidden
+
+    def __hash__(self):
+        return self.hash
+
+    def canonical_key(self):
+        """Get a key that is the same for positions that only differ in the order of their tableau stacks
+        or of their foundations. The rules treat every tableau stack and every foundation alike, so
+        such positions play the same.
+
+        Returns:
+            tuple: The key, hashable.
+        """
+        tableau = sorted(zip(self.hidden, self.stacks[:len(TABLEAU)]))
+        foundations = sorted(self.stacks[FOUNDATIONS[0]:])
+        return tuple(tableau), tuple(foundations), self.stacks[STOCK], self.stacks[DISCARD]
+
+    def is_face_up(self, stack, index):
+        """Check if the card at the given position is face up (see `GameState.is_face_up`)."""
+        return stack != STOCK and index >= self.hidden[stack]
+
+    def can_add_card(self, stack, card):
+        """Check if a card can be added to the given stack (see `GameState.can_add_card`)."""
+        table = STACK_ACCEPTS[stack]
+        if table is None:
+            return False
+        cards = self.stacks[stack]
+        return table[cards[-1] if cards else EMPTY] >> card & 1 == 1
+
+    def can_move(self, from_stack, to_stack, count):
+        """Check if the top `count` cards of a stack can be moved onto another stack (see `GameState.can_move`)."""
+        if from_stack == to_stack or from_stack == STOCK or count < 1:
+            return False
+        cards = self.stacks[from_stack]
+        if from_stack in TABLEAU:
+            if count > len(cards) - self.hidden[from_stack]:
+                return False
+        elif count != 1 or not cards:
+            return False
+        if count != 1 and to_stack in FOUNDATIONS:
+            return False
+        return self.can_add_card(to_stack, cards[-count])
+
+    def stock_move(self):
+        """Get the move a click on the stock stack makes.
+
+        Returns:
+            Move: Turning the top stock card over, or moving the discard stack back to the empty
+                stock; None if both stacks are empty.
+        """
+        if self.stacks[STOCK]:
+            return Move(STOCK, DISCARD, 1)
+        if self.stacks[DISCARD]:
+            return Move(DISCARD, STOCK, len(self.stacks[DISCARD]))
+        return None
+
+    def get_moves(self):
+        """Get every legal move of the position, the stock click last.
+
+        Returns:
+            list: The moves, as `Move` objects.
+        """
+        moves = []
+        for from_stack, cards in enumerate(self.stacks):
+            if from_stack == STOCK or not cards:
+                continue
+            counts = range(1, len(cards) - self.hidden[from_stack] + 1) if from_stack in TABLEAU else (1,)
+            for count in counts:
+                for to_stack in range(STACK_COUNT):
+                    if self.can_move(from_stack, to_stack, count):
+                        moves.append(Move(from_stack, to_stack, count))
+        stock_move = self.stock_move()
+        if stock_move:
+            moves.append(stock_move)
+        return moves
+
+    def apply(self, move):
+        """Make a move, in a new snapshot. Only the two stacks the move changes are new; the others are shared.
+
+        Args:
+            move (Move): The move, a stock click included (its flipped and linked flags are ignored).
+
+        Returns:
+            Snapshot: The position after the move, or None if the move is not legal.
+        """
+        from_stack, to_stack, count = move.from_stack, move.to_stack, move.count
+        if from_stack == STOCK or to_stack == STOCK:
+            stock_move = self.stock_move()
+            if not stock_move or (stock_move.from_stack, stock_move.to_stack, stock_move.count) != \
+                    (from_stack, to_stack, count):
+                return None
+        elif not self.can_move(from_stack, to_stack, count):
+            return None
+
+        stacks = list(self.stacks)
+        source, target = stacks[from_stack], stacks[to_stack]
+        start = len(source) - count
+        cards = source[start:]
+        # XOR the cards out of their old places, then into their new ones, as `GameState._transfer` does
+        value = self.hash
+        base = (from_stack * MAX_STACK_SIZE + start) * 52
+        for offset, card in enumerate(cards):
+            value ^= CARD_KEYS[base + offset * 52 + card]
+        if from_stack == STOCK or to_stack == STOCK:
+            cards = cards[::-1]  # Cards are turned over one at a time between the stock and the discard stack
+        base = (to_stack * MAX_STACK_SIZE + len(target)) * 52
+        for offset, card in enumerate(cards):
+            value ^= CARD_KEYS[base + offset * 52 + card]
+        stacks[from_stack] = source[:start]
+        stacks[to_stack] = target + cards
+
+        # Turn the new top card of a tableau stack face up
+        hidden = self.hidden
+        if from_stack in TABLEAU and start and hidden[from_stack] == start:
+            value ^= HIDDEN_KEYS[from_stack][start] ^ HIDDEN_KEYS[from_stack][start - 1]
+            hidden = hidden[:from_stack] + (start - 1,) + hidden[from_stack + 1:]
+        return Snapshot(tuple(stacks), hidden, value)
+
+    def check_win(self):
+        """Check if all four foundations are complete.
+
+        Returns:
+            bool: True if the game is won.
+        """
+        return all(len(self.stacks[stack]) == 13 for stack in FOUNDATIONS)
@@ -0,0 +1,367 @@
+"""
+solitaire_env.py
+
+Gym-style environments for automated players.
+
+This script defines the `SolitaireEnv` class, one game behind the usual `reset(seed)` /
+`step(action)` interface, and the `VectorEnv` class, which steps many games in lockstep,
+either in-process on a `BatchState` or split across worker processes. Both share the
+action list of `batch_state` (a move from one stack to another, or a click on the stock),
+the legal-action mask, and the observation encoding:
+
+- observation: (13, 52) uint8 array with the cards of each stack, bottom card first, as
+  encoded cards, FACE_DOWN for a face-down card (the whole stock) and EMPTY past the top;
+- reward: the number of cards the action put on the foundations (negative when cards go
+  back down), plus WIN_REWARD for winning the game;
+- terminated: the game is won or no action is legal; truncated: `max_steps` were made.
+
+A seed is a deal number (see `deals.py`): `reset(seed)` deals that deal, and a vectorized
+reset with a seed deals the numbers from the seed on. NumPy is required by this module only.
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Standard Imports
+import multiprocessing
+
+# Third-party Library Imports
+import numpy
+
+# Local Imports
+from batch_state import ACTIONS, STOCK_ACTION, BatchState, action_to_move
+from deals import deal_cards, new_deal_number
+from game_state import DISCARD, EMPTY, FOUNDATIONS, STACK_COUNT, STOCK, TABLEAU, GameState
+from move_index import LegalMoveIndex
+
+FACE_DOWN = EMPTY + 1  # Observation value of a face-down card
+WIN_REWARD = 10.0
+MAX_STEPS = 1000  # Default step limit of a game
+
+# The action index of each (from_stack, to_stack) pair
+ACTION_INDEX = {(int(from_stack), int(to_stack)): action for action, (from_stack, to_stack) in enumerate(ACTIONS)}
+
+
+def new_game(deal_number):
+    """Deal a numbered deal on a new game state.
+
+    Returns:
+        GameState: The game state.
+    """
+    state = GameState(max_history=1)  # Environments never undo
+    state.deal(deal_cards(deal_number))
+    return state
+
+
+class SolitaireEnv:
+    """Class to represent one game for an automated player.
+
+    Attributes:
+        max_steps (int): The number of steps after which a game is truncated.
+        game_state (GameState): The game being played.
+        move_index (LegalMoveIndex): The legal moves of the game, kept up to date after each step.
+        deal_number (int): The deal being played.
+        steps (int): The number of steps made in the game.
+    """
+
+    def __init__(self, max_steps=MAX_STEPS):
+        """Initialize the environment. Call reset before the first step.
+
+        Args:
+            max_steps (int): The number of steps after which a game is truncated (default: MAX_STEPS).
+        """
+        self.max_steps = max_steps
+        self.game_state = None
+        self.move_index = None
+        self.deal_number = None
+        self.steps = 0
+
+    def reset(self, seed=None):
+        """Start a new game.
+
+        Args:
+            seed (int): The deal number, or None for a random deal.
+
+        Returns:
+            tuple: (observation, info), where info holds the 'deal_number' and the 'action_mask'.
+        """
+        self.deal_number = new_deal_number() if seed is None else seed
+        self.game_state = new_game(self.deal_number)
+        self.move_index = LegalMoveIndex(self.game_state)
+        self.steps = 0
+        return self.observe(), self._info()
+
+    def action_mask(self):
+        """Get the legal actions.
+
+        Returns:
+            numpy.ndarray: (len(ACTIONS),) bool array, True for a legal action.
+        """
+        mask = numpy.zeros(len(ACTIONS), dtype=bool)
+        for from_stack, _, to_stack in self.move_index.get_moves():
+            action = ACTION_INDEX.get((from_stack, to_stack))  # None between foundations, which is not an action
+            if action is not None:
+                mask[action] = True
+        mask[STOCK_ACTION] = bool(self.game_state.stacks[STOCK] or self.game_state.stacks[DISCARD])
+        return mask
+
+    def observe(self):
+        """Encode the position.
+
+        Returns:
+            numpy.ndarray: (13, 52) uint8 array (see the module docstring).
+        """
+        observation = numpy.full((STACK_COUNT, 52), EMPTY, dtype=numpy.uint8)
+        for stack, cards in enumerate(self.game_state.stacks):
+            observation[stack, :len(cards)] = cards
+        for stack in TABLEAU:
+            observation[stack, :self.game_state.hidden[stack]] = FACE_DOWN
+        observation[STOCK, :len(self.game_state.stacks[STOCK])] = FACE_DOWN
+        return observation
+
+    def step(self, action):
+        """Make an action.
+
+        Args:
+            action (int): The index of a legal action.
+
+        Returns:
+            tuple: (observation, reward, terminated, truncated, info).
+
+        Raises:
+            ValueError: If the action is not legal.
+        """
+        move = action_to_move(self.game_state, action)
+        before = self._foundation_cards()
+        if action == STOCK_ACTION:
+            done = self.game_state.stock_click()
+        else:
+            done = self.game_state.move(move.from_stack, move.to_stack, move.count)
+        if not done:
+            raise ValueError(f"Illegal action {action} ({move.from_stack} -> {move.to_stack})")
+        self.move_index.update((move.from_stack, move.to_stack))
+        self.steps += 1
+
+        reward = float(self._foundation_cards() - before)
+        info = self._info()
+        terminated = self.game_state.check_win()
+        if terminated:
+            reward += WIN_REWARD
+        else:
+            terminated = not info['action_mask'].any()
+        return self.observe(), reward, terminated, self.steps >= self.max_steps, info
+
+    def _foundation_cards(self):
+        """Count the cards on the foundations."""
+        return sum(len(self.game_state.stacks[stack]) for stack in FOUNDATIONS)
+
+    def _info(self):
+        """Get the info dict returned with each observation."""
+        return {'deal_number': self.deal_number, 'action_mask': self.action_mask()}
+
+
+class VectorEnv:
+    """Class to represent many games stepped in lockstep.
+
+    Games that end are reset to the next deal right away (their last observation is in the
+    'final_observation' info), so every step takes one action for every game.
+
+    Attributes:
+        num_envs (int): The number of games.
+        max_steps (int): The number of steps after which a game is truncated.
+        workers (list): The (process, connection, number of games) of each worker process; empty when in-process.
+        batch (BatchState): The games, when in-process.
+        deal_numbers (numpy.ndarray): The deal played in each game, when in-process.
+        steps (numpy.ndarray): The number of steps made in each game, when in-process.
+        legal (numpy.ndarray): The action mask of the in-process games, kept from the last step.
+        next_deals (numpy.ndarray): The deal number each game gets when it is reset, when in-process
+            (None for random deals).
+        deal_stride (int): The step between the deal numbers of a game, the number of games of the whole
+            vectorized environment (more than `num_envs` in a worker process).
+    """
+
+    def __init__(self, num_envs, workers=0, max_steps=MAX_STEPS):
+        """Initialize the environments. Call reset before the first step.
+
+        Args:
+            num_envs (int): The number of games.
+            workers (int): The number of worker processes to split the games across, or 0 to
+                step them all in this process (default: 0).
+            max_steps (int): The number of steps after which a game is truncated (default: MAX_STEPS).
+        """
+        self.num_envs = num_envs
+        self.max_steps = max_steps
+        self.workers = []
+        self.batch = None
+        self.legal = None
+        self.deal_numbers = numpy.zeros(num_envs, dtype=numpy.uint64)
+        self.steps = numpy.zeros(num_envs, dtype=numpy.int32)
+        self.next_deals = None
+        self.deal_stride = num_envs
+        for games in numpy.array_split(numpy.arange(num_envs), workers) if workers else ():
+            connection, worker_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_run_worker, daemon=True,
+                                              args=(worker_connection, len(games), num_envs, max_steps))
+            process.start()
+            worker_connection.close()
+            self.workers.append((process, connection, len(games)))
+
+    def reset(self, seed=None):
+        """Start a new game in every environment.
+
+        Args:
+            seed (int): The deal number of the first game, or None for random deals. Game i
+                plays the deals seed + i, seed + i + N, seed + i + 2N, ... in turn.
+
+        Returns:
+            tuple: (observations, info), where info holds the 'deal_number' and the 'action_mask' arrays.
+        """
+        if self.workers:
+            start = 0
+            for _, connection, size in self.workers:
+                connection.send(('reset', None if seed is None else seed + start))
+                start += size
+            return self._gather_reset()
+
+        self.batch = BatchState(self.num_envs)
+        self.steps[:] = 0
+        self.next_deals = None if seed is None else seed + numpy.arange(self.num_envs, dtype=numpy.uint64)
+        for game in range(self.num_envs):
+            self._deal(game)
+        self.legal = self.batch.legal_mask()
+        return self.observe(), self._info()
+
+    def observe(self):
+        """Encode the position of every in-process game.
+
+        Returns:
+            numpy.ndarray: (N, 13, 52) uint8 array (see the module docstring).
+        """
+        positions = numpy.arange(52)
+        in_stack = positions < self.batch.lengths[:, :, None]
+        return numpy.where(self.batch.face_up_mask(), self.batch.cards,
+                           numpy.where(in_stack, FACE_DOWN, EMPTY)).astype(numpy.uint8)
+
+    def step(self, actions):
+        """Make one action in every game.
+
+        Args:
+            actions (numpy.ndarray): (N,) array of the index of a legal action for each game.
+
+        Returns:
+            tuple: (observations, rewards, terminated, truncated, info), one entry per game.
+
+        Raises:
+            ValueError: If an action is not legal.
+        """
+        actions = numpy.asarray(actions)
+        if self.workers:
+            start = 0
+            for _, connection, size in self.workers:
+                connection.send(('step', actions[start:start + size]))
+                start += size
+            return self._gather_step()
+
+        illegal = ~self.legal[numpy.arange(self.num_envs), actions]
+        if illegal.any():
+            raise ValueError(f"Illegal actions in games {numpy.nonzero(illegal)[0].tolist()}")
+        before = self._foundation_cards()
+        self.batch.apply(actions)
+        self.steps += 1
+
+        won = self.batch.is_won()
+        rewards = (self._foundation_cards() - before + WIN_REWARD * won).astype(numpy.float32)
+        legal = self.batch.legal_mask()
+        terminated = won | ~legal.any(axis=1)
+        truncated = self.steps >= self.max_steps
+        info = {}
+        ended = numpy.nonzero(terminated | truncated)[0]
+        if len(ended):
+            info['final_observation'] = self.observe()[ended]
+            info['final_games'] = ended
+            for game in ended:
+                self._deal(game)
+            legal[ended] = self.batch.legal_mask()[ended]
+        self.legal = legal
+        info.update(self._info())
+        return self.observe(), rewards, terminated, truncated, info
+
+    def close(self):
+        """Stop the worker processes, if any."""
+        for process, connection, _ in self.workers:
+            connection.send(('close', None))
+            process.join()
+            connection.close()
+        self.workers = []
+
+    def _deal(self, game):
+        """Deal the next deal in an in-process game."""
+        if self.next_deals is None:
+            deal_number = new_deal_number()
+        else:
+            deal_number = int(self.next_deals[game])
+            self.next_deals[game] += self.deal_stride
+        single = BatchState.from_game_state(new_game(deal_number), 1)
+        self.batch.cards[game], self.batch.lengths[game], self.batch.hidden[game] = (
+            single.cards[0], single.lengths[0], single.hidden[0])
+        self.deal_numbers[game] = deal_number
+        self.steps[game] = 0
+
+    def _foundation_cards(self):
+        """Count the cards on the foundations of every in-process game."""
+        return self.batch.lengths[:, FOUNDATIONS[0]:].sum(axis=1)
+
+    def _info(self):
+        """Get the info dict returned with the observations of the in-process games."""
+        return {'deal_number': self.deal_numbers.copy(), 'action_mask': self.legal}
+
+    def _receive(self):
+        """Collect the results of the worker processes, raising the error of the first one that failed."""
+        results = [connection.recv() for _, connection, _ in self.workers]
+        if any(isinstance(result, Exception) for result in results):
+            raise next(result for result in results if isinstance(result, Exception))
+        return results
+
+    def _gather_reset(self):
+        """Collect and join the reset results of the worker processes."""
+        results = self._receive()
+        return numpy.concatenate([observations for observations, _ in results]), _join_info(
+            [info for _, info in results])
+
+    def _gather_step(self):
+        """Collect and join the step results of the worker processes."""
+        observations, rewards, terminated, truncated, infos = zip(*self._receive())
+        return (numpy.concatenate(observations), numpy.concatenate(rewards), numpy.concatenate(terminated),
+                numpy.concatenate(truncated), _join_info(infos))
+
+
+def _join_info(infos):
+    """Join the info dicts of the worker processes, offsetting the game indices of each."""
+    info = {'deal_number': numpy.concatenate([part['deal_number'] for part in infos]),
+            'action_mask': numpy.concatenate([part['action_mask'] for part in infos])}
+    final_observations, final_games = [], []
+    start = 0
+    for part in infos:
+        if 'final_games' in part:
+            final_observations.append(part['final_observation'])
+            final_games.append(part['final_games'] + start)
+        start += len(part['deal_number'])
+    if final_games:
+        info['final_observation'] = numpy.concatenate(final_observations)
+        info['final_games'] = numpy.concatenate(final_games)
+    return info
+
+
+def _run_worker(connection, num_envs, total_envs, max_steps):
+    """Step an in-process VectorEnv for the parent process, until it sends 'close'."""
+    env = VectorEnv(num_envs, max_steps=max_steps)
+    env.deal_stride = total_envs
+    while True:
+        command, argument = connection.recv()
+        if command == 'close':
+            break
+        try:
+            connection.send(env.reset(argument) if command == 'reset' else env.step(argument))
+        except Exception as error:  # Sent back for the parent to raise, instead of ending the worker
+            connection.send(error)
+    connection.close()
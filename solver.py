@@ -0,0 +1,322 @@
+"""
+solver.py
+
+Klondike solver working on the headless game state.
+
+This script defines the `Solver` class, which searches the moves of a `GameState` depth
+first, most promising moves first, for a line that wins the game. The search is pruned:
+foundation moves that can never hurt are made without trying anything else, tableau moves
+that neither reveal a card, empty a column nor free a card for the foundations are skipped,
+and positions already seen are not searched twice (they are remembered by their Zobrist
+hash in a fixed-size transposition table); a position `dead_end.is_dead_end` proves lost
+is not searched at all. It stops after a node or time budget, so it can
+answer hints and pick winnable deals without keeping the player waiting.
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Standard Imports
+import time
+
+# Local Imports
+from dead_end import is_dead_end
+from game_state import DISCARD, FOUNDATIONS, STOCK, TABLEAU, card_rank
+from move import Move
+from zobrist import TranspositionTable
+
+# Solve results
+WON = 'won'  # A winning line was found
+LOST = 'lost'  # The pruned search ran out of moves without winning (not a proof, unless `proven`)
+UNKNOWN = 'unknown'  # The budget ran out first
+
+
+class SolveResult:
+    """Class to represent the outcome of a search.
+
+    Attributes:
+        status (str): WON, LOST or UNKNOWN.
+        line (list): The winning moves from the searched position, as `Move` objects (empty unless WON).
+        best_move (Move): The move to play next: the first move of the winning line, or the most
+            promising move if no line was found. None if there is no move at all.
+        nodes (int): The number of positions searched.
+        proven (bool): True if a LOST status is certain: the position is a dead end (see dead_end.py).
+            Otherwise LOST only means the pruned search found no winning line.
+    """
+
+    def __init__(self, status, line, best_move, nodes, proven=False):
+        self.status = status
+        self.line = line
+        self.best_move = best_move
+        self.nodes = nodes
+        self.proven = proven
+
+    @property
+    def winnable(self):
+        """bool: True if the position is winnable, False if it is proven lost, None if that is not known.
+
+        The search skips moves (see `get_ordered_moves`), so running out of moves without a win
+        is not a proof and gives None, like running out of budget.
+        """
+        if self.status == WON:
+            return True
+        if self.status == LOST and self.proven:
+            return False
+        return None
+
+    def __str__(self):
+        return f"{self.status} after {self.nodes} nodes ({len(self.line)} moves)"
+
+
+def is_safe_foundation_move(stacks, card):
+    """Check if sending a card to the foundations can never block a win.
+
+    Aces and twos are always safe; any other card is safe once both foundations of the other
+    color hold the card one rank lower, since no tableau card could still need to go on it.
+
+    Args:
+        stacks (list): The stacks of the game state.
+        card (int): The encoded card.
+
+    Returns:
+        bool: True if the move is safe.
+    """
+    rank = card_rank(card)
+    if rank <= 2:
+        return True
+    red = card < 26
+    opposite_heights = [len(stacks[index]) for index in FOUNDATIONS
+                        if stacks[index] and (stacks[index][0] < 26) != red]
+    return len(opposite_heights) == 2 and min(opposite_heights) >= rank - 1
+
+
+def foundation_target(state, card):
+    """Return the foundation stack a card can go to (the first empty one for an Ace), or None.
+
+    Args:
+        state (GameState): The position.
+        card (int): The encoded card.
+
+    Returns:
+        int: The index of the foundation stack, or None if the card cannot go up yet.
+    """
+    for target in FOUNDATIONS:
+        if state.can_add_card(target, card):
+            return target
+    return None
+
+
+class Solver:
+    """Class to represent a depth-first Klondike solver with a node and time budget.
+
+    Attributes:
+        max_nodes (int): The maximum number of positions searched per solve.
+        time_limit (float): The maximum number of seconds per solve, or None for no limit.
+        table (TranspositionTable): The positions seen, stored with the number of the solve
+            that saw them, so the table is reused without being cleared.
+        solves (int): The number of solves run so far.
+    """
+
+    def __init__(self, max_nodes=200000, time_limit=None, table_bits=16):
+        """Initialize the solver.
+
+        Args:
+            max_nodes (int): The maximum number of positions searched per solve (default: 200000).
+            time_limit (float): The maximum number of seconds per solve, or None (default) for no limit.
+            table_bits (int): The base-2 logarithm of the number of transposition table buckets (default: 16).
+        """
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.table = TranspositionTable(table_bits)
+        self.solves = 0
+
+    def solve(self, game_state, should_stop=None):
+        """Search for a winning line from a position. The game state itself is not changed.
+
+        Args:
+            game_state (GameState): The position to solve.
+            should_stop (callable): Checked every few hundred nodes; the search gives up (as if its
+                budget ran out) once it returns True. None (default) to never stop early.
+
+        Returns:
+            SolveResult: The outcome of the search.
+        """
+        state = game_state.copy(max_history=self.max_nodes + 1)
+        deadline = None if self.time_limit is None else time.perf_counter() + self.time_limit
+        root_moves = self.get_ordered_moves(state)
+        best_move = Move(*root_moves[0]) if root_moves else None
+        if state.check_win():
+            return SolveResult(WON, [], None, 0)
+        if is_dead_end(state):
+            return SolveResult(LOST, [], best_move, 0, proven=True)
+
+        self.solves += 1
+        solve_id, table = self.solves, self.table
+        table.store(state.hash, solve_id, solve_id << 10)
+        path = []  # The moves from the root to the current position
+        frames = [iter(root_moves)]  # The moves left to try at each depth
+        nodes = 0
+        while frames:
+            move = next(frames[-1], None)
+            if move is None:
+                # Every move from this position was tried: go back one move
+                frames.pop()
+                if path:
+                    path.pop()
+                    state.undo_last_move()
+                continue
+
+            self._apply(state, move)
+            if table.get(state.hash) == solve_id:
+                state.undo_last_move()
+                continue
+            path.append(move)
+            # Entries of the current solve outrank older ones, and positions near the root prune the most
+            table.store(state.hash, solve_id, (solve_id << 10) - len(path))
+            nodes += 1
+
+            if self._is_won(state):
+                line = [Move(*step) for step in path] + self._finish(state)
+                return SolveResult(WON, line, line[0], nodes)
+            if nodes >= self.max_nodes or (nodes % 256 == 0 and (
+                    (deadline and time.perf_counter() > deadline) or (should_stop and should_stop()))):
+                return SolveResult(UNKNOWN, [], best_move, nodes)
+            frames.append(iter(self.get_ordered_moves(state)))
+
+        return SolveResult(LOST, [], best_move, nodes)
+
+    def is_winnable(self, game_state):
+        """Check if a position is winnable within the budget.
+
+        Args:
+            game_state (GameState): The position to check.
+
+        Returns:
+            bool: True if winnable, False if proven lost, None if not known (see `SolveResult.winnable`).
+        """
+        return self.solve(game_state).winnable
+
+    def best_move(self, game_state):
+        """Get the move to play next from a position.
+
+        Args:
+            game_state (GameState): The position.
+
+        Returns:
+            Move: The first move of a winning line, or the most promising move if no line was found
+                within the budget, or None if there is no move at all.
+        """
+        return self.solve(game_state).best_move
+
+    def get_ordered_moves(self, state):
+        """Get the moves worth trying from a position, most promising first.
+
+        A safe foundation move is returned alone. Otherwise the order is: other foundation
+        moves, tableau moves that reveal a card, discard moves to the tableau, tableau moves
+        that empty a column, partial runs that free a card for the foundations, the stock, and
+        last foundation cards back to the tableau.
+
+        Args:
+            state (GameState): The position.
+
+        Returns:
+            list: (from_stack, to_stack, count) tuples.
+        """
+        stacks, hidden = state.stacks, state.hidden
+
+        foundation_moves = []
+        for source in (*TABLEAU, DISCARD):
+            cards = stacks[source]
+            if not cards:
+                continue
+            target = foundation_target(state, cards[-1])
+            if target is not None:
+                if is_safe_foundation_move(stacks, cards[-1]):
+                    return [(source, target, 1)]
+                foundation_moves.append((source, target, 1))
+
+        reveal_moves, empty_moves, partial_moves = [], [], []
+        for source in sorted(TABLEAU, key=lambda index: -hidden[index]):  # Deepest hidden cards first
+            cards = stacks[source]
+            face_up = len(cards) - hidden[source]
+            for count in range(face_up, 0, -1):
+                card = cards[-count]
+                if count < face_up:
+                    # Splitting a run only helps if the card under it can go to the foundations
+                    if foundation_target(state, cards[-count - 1]) is None:
+                        continue
+                    moves = partial_moves
+                elif hidden[source]:
+                    moves = reveal_moves
+                elif card_rank(card) == 13:
+                    continue  # A King already at the bottom of a column has nowhere better to go
+                else:
+                    moves = empty_moves
+                target = self._tableau_target(state, source, card)
+                if target is not None:
+                    moves.append((source, target, count))
+
+        discard_moves = []
+        if stacks[DISCARD]:
+            target = self._tableau_target(state, DISCARD, stacks[DISCARD][-1])
+            if target is not None:
+                discard_moves.append((DISCARD, target, 1))
+
+        stock_moves = []
+        if stacks[STOCK]:
+            stock_moves.append((STOCK, DISCARD, 1))
+        elif stacks[DISCARD]:
+            stock_moves.append((DISCARD, STOCK, len(stacks[DISCARD])))
+
+        return_moves = []
+        for source in FOUNDATIONS:
+            if stacks[source]:
+                target = self._tableau_target(state, source, stacks[source][-1], allow_empty=False)
+                if target is not None:
+                    return_moves.append((source, target, 1))
+
+        return foundation_moves + reveal_moves + discard_moves + empty_moves + partial_moves + \
+            stock_moves + return_moves
+
+    @staticmethod
+    def _tableau_target(state, source, card, allow_empty=True):
+        """Return a tableau stack a card can go to, or None.
+
+        Every empty column is the same, so only the first one is offered.
+        """
+        for target in TABLEAU:
+            if target != source and (allow_empty or state.stacks[target]) and state.can_add_card(target, card):
+                return target
+        return None
+
+    @staticmethod
+    def _apply(state, move):
+        """Make a (from_stack, to_stack, count) move on the game state, recording it for undo."""
+        from_stack, to_stack, count = move
+        if from_stack == STOCK or to_stack == STOCK:
+            state.stock_click()
+        else:
+            state.move(from_stack, to_stack, count)
+
+    @staticmethod
+    def _is_won(state):
+        """Check if a position is won, or as good as won: every card is face up in the tableau or the foundations."""
+        return not state.stacks[STOCK] and not state.stacks[DISCARD] and not any(state.hidden[index] for index in TABLEAU)
+
+    def _finish(self, state):
+        """Play every remaining card to the foundations from an as-good-as-won position.
+
+        The lowest card still needed is always on top of its column, so one card can be sent
+        up at a time without searching.
+
+        Returns:
+            list: The foundation moves, as `Move` objects.
+        """
+        moves = []
+        while not state.check_win():
+            source = min((index for index in TABLEAU if state.stacks[index]),
+                         key=lambda index: card_rank(state.stacks[index][-1]))
+            target = foundation_target(state, state.stacks[source][-1])
+            state.move(source, target, 1)
+            moves.append(Move(source, target, 1))
+        return moves
@@ -0,0 +1,90 @@
+"""
+spatial_index.py
+
+Spatial index for hit-testing the stacks of the game.
+
+This script defines the `SpatialIndex` class, which sorts the stacks into the columns of
+the fixed layout built by `Deck.setup_stacks`, so finding the card under a click or the
+stacks under a dropped card only looks at the one or two columns involved instead of
+every card of every stack.
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+
+class SpatialIndex:
+    """Class to represent a column grid over the stacks of the game.
+
+    The grid only depends on the positions of the stacks, which never move. Which card of a
+    stack is under a point follows from the number of cards in it, so the index stays up to
+    date as `Stack.add_card` and `Stack.remove_cards` change the stacks.
+
+    Attributes:
+        stacks (list): The stacks, in the order of `Deck.stacks`.
+        origin_x (int): The x-coordinate where the first column starts.
+        column_width (int): The width of a column (card width plus spacing).
+        columns (dict): The indices of the stacks in each column, keyed by column number.
+    """
+
+    def __init__(self, stacks, origin_x, column_width):
+        """Build the index.
+
+        Args:
+            stacks (list): The stacks, in the order of `Deck.stacks`.
+            origin_x (int): The x-coordinate where the first column starts.
+            column_width (int): The width of a column (card width plus spacing).
+        """
+        self.stacks = stacks
+        self.origin_x = origin_x
+        self.column_width = column_width
+        self.columns = {}
+        for index, stack in enumerate(stacks):
+            for column in self.get_columns(stack.rect.left, stack.rect.right):
+                self.columns.setdefault(column, []).append(index)
+
+    def get_columns(self, left, right):
+        """Get the columns covered by a horizontal range.
+
+        Args:
+            left (int): The left edge of the range.
+            right (int): The right edge of the range (exclusive).
+
+        Returns:
+            range: The column numbers.
+        """
+        return range((left - self.origin_x) // self.column_width,
+                     (right - 1 - self.origin_x) // self.column_width + 1)
+
+    def get_card_at(self, point):
+        """Get the topmost card under a point.
+
+        Args:
+            point (tuple): The (x, y) position to check.
+
+        Returns:
+            tuple: The stack and the card under the point, or None if there is no card there.
+        """
+        column = (point[0] - self.origin_x) // self.column_width
+        for index in self.columns.get(column, ()):
+            stack = self.stacks[index]
+            card = stack.get_card_at(point)
+            if card is not None:
+                return stack, card
+        return None
+
+    def get_stacks_overlapping(self, rect):
+        """Get the stacks whose area overlaps a rectangle, such as a dropped card.
+
+        Args:
+            rect (pygame.Rect): The rectangle to check.
+
+        Returns:
+            list: The indices of the overlapping stacks, in the order of `Deck.stacks`.
+        """
+        indices = set()
+        for column in self.get_columns(rect.left, rect.right):
+            for index in self.columns.get(column, ()):
+                if self.stacks[index].rect.colliderect(rect):
+                    indices.add(index)
+        return sorted(indices)
@@ -11,9 +11,14 @@ Created: 24-12-2024
 import pygame
 import logging
 
+# Local Imports
+from game_state import can_place
+
 # Configure logging
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
+CARD_OFFSET = 30  # Vertical distance between the cards of a tableau stack
+
 
 class Stack:
     """Class to represent a stack of cards in a Solitaire game."""
@@ -61,6 +66,47 @@ class Stack:
         card_rect = pygame.Rect(card.position, card.card_size)  # Create the card's rectangle
         return stack_rect.colliderect(card_rect)  # Check if the rectangles intersect
 
+    def get_bounding_rect(self):
+        """
+        Get the screen area covered by the stack's placeholder and its cards.
+
+        Returns:
+            pygame.Rect: The bounding rectangle of the stack.
+        """
+        rect = self.rect.copy()
+        if self.cards:
+            last_card = self.cards[-1]
+            rect.union_ip(pygame.Rect(last_card.position, last_card.card_size))
+        return rect
+
+    def get_card_at(self, point):
+        """
+        Get the topmost card of the stack under a point.
+
+        Card positions follow from the stack's position and the number of cards, so the
+        card is found directly instead of checking every card.
+
+        Args:
+            point (tuple): The (x, y) position to check.
+
+        Returns:
+            Card: The card under the point, or None if there is none.
+        """
+        if not self.cards:
+            return None
+        x, y = point
+        stack_x, stack_y = self.position
+        card_width, card_height = self.cards[0].card_size
+        if not (stack_x <= x < stack_x + card_width and y >= stack_y):
+            return None
+
+        if self.is_stock or self.is_discard or self.is_foundation:
+            index = len(self.cards) - 1  # All cards are at the stack's position
+        else:
+            index = min(len(self.cards) - 1, (y - stack_y) // CARD_OFFSET)
+        card = self.cards[index]
+        return card if y < card.position[1] + card_height else None
+
     def add_card(self, card):
         """
         Add a card to the stack.
@@ -79,9 +125,53 @@ class Stack:
         else:
             card.position = self.get_next_card_position()  # Set the card position for tableau stacks
 
+        card.index = len(self.cards)  # Set the position of the card in the stack
         self.cards.append(card)  # Add the card to the stack
         card.stack = self  # Set the stack to which the card belongs
 
+    def add_cards(self, cards):
+        """
+        Add several cards to the top of the stack in one operation, e.g. when restoring a move.
+
+        Args:
+            cards (list): The cards to add, bottom card first.
+        """
+        logging.debug(f'Adding {len(cards)} cards to stack at position {self.position} with is_discard = {self.is_discard}')
+
+        x, y = self.position
+        first_index = len(self.cards)
+        for index, card in enumerate(cards, first_index):
+            if self.is_discard or self.is_foundation:
+                card.position = self.position  # Place the card at the stack's position
+                card.face_up = True  # Set the card face up for discard or foundation stacks
+                card.draggable = True  # Allow the card to be dragged
+            elif self.is_stock:
+                card.position = self.position  # Stock cards have a fixed position
+            else:
+                card.position = (x, y + index * CARD_OFFSET)  # Offset tableau cards by their index
+            card.stack = self
+            card.index = index
+        self.cards.extend(cards)
+
+    def pop_cards(self, count):
+        """
+        Remove the top `count` cards of the stack in one operation.
+
+        Args:
+            count (int): The number of cards to remove.
+
+        Returns:
+            list: The removed cards, bottom card first (empty if `count` is not positive).
+        """
+        if count <= 0:
+            return []  # A slice from -0 would take the whole stack
+        cards = self.cards[-count:]
+        del self.cards[-count:]
+        for card in cards:
+            card.stack = None
+            card.index = None
+        return cards
+
     def remove_card(self, card):
         """
         Remove a card from the stack.
@@ -92,25 +182,33 @@ class Stack:
         Returns:
             Card: The card that was removed.
         """
-        if card in self.cards:
-            self.cards.remove(card)  # Remove the card from the stack.
+        if card.stack is self:
+            del self.cards[card.index]  # Remove the card from the stack.
+            for index in range(card.index, len(self.cards)):
+                self.cards[index].index = index  # Shift the cards that were above it.
             card.stack = None  # Set the stack attribute of the card to None.
+            card.index = None
         return card
 
     def remove_cards(self, cards):
         """
-        Remove multiple cards from the stack.
+        Remove a run of cards from the stack in one slice operation.
 
         Args:
-            cards (list): A list of cards to remove from the stack.
+            cards (list): The cards to remove, consecutive in the stack and bottom card first
+                (as returned by `Card.get_draggable_stack`).
 
         Returns:
             list: The list of cards that were removed.
         """
-        for card in cards:
-            if card in self.cards:
-                self.cards.remove(card)  # Remove each card from the stack.
+        if cards and cards[0].stack is self:
+            start = cards[0].index
+            del self.cards[start:start + len(cards)]  # Remove the whole run from the stack.
+            for index in range(start, len(self.cards)):
+                self.cards[index].index = index  # Shift the cards that were above the run, if any.
+            for card in cards:
                 card.stack = None  # Set the stack attribute of each card to None.
+                card.index = None
         return cards
 
     def get_next_card_position(self):
@@ -124,27 +222,40 @@ class Stack:
             return self.position  # Stock cards have a fixed position.
         else:
             # For tableau, offset the y-coordinate based on the number of cards in the stack.
-            return self.position[0], self.position[1] + len(self.cards) * 30
+            return self.position[0], self.position[1] + len(self.cards) * CARD_OFFSET
 
-    def draw(self, screen):
+    def draw(self, screen, atlas=None):
         """
         Draw the stack of cards on the screen.
 
         Args:
             screen (pygame.Surface): The surface on which to draw the stack.
+            atlas (CardAtlas): The atlas to draw the cards from. If None, each card's own images are drawn.
         """
-        if self.cards:
+        cards = self.cards
+        if any(card.in_flight for card in cards):
+            cards = [card for card in cards if not card.in_flight]  # The deck draws the cards flying to the stack
+        if cards:
             if self.is_stock:
-                for card in self.cards:
-                    screen.blit(card.back_image, card.position)  # Draw the back image for stock cards.
+                for card in cards:
+                    if atlas:
+                        atlas.blit(screen, card)
+                    else:
+                        screen.blit(card.back_image, card.position)  # Draw the back image for stock cards.
             elif self.is_discard or self.is_foundation:
                 # For discard or foundation stacks, draw only the top card face-up.
-                top_card = self.cards[-1]
-                screen.blit(top_card.image, top_card.position)
+                top_card = cards[-1]
+                if atlas:
+                    atlas.blit(screen, top_card)
+                else:
+                    screen.blit(top_card.image, top_card.position)
             else:
-                for card in self.cards:
+                for card in cards:
                     # Draw each card face-up or face-down depending on its state.
-                    screen.blit(card.image if card.face_up else card.back_image, card.position)
+                    if atlas:
+                        atlas.blit(screen, card)
+                    else:
+                        screen.blit(card.image if card.face_up else card.back_image, card.position)
         else:
             # Draw an empty placeholder for the stack.
             pygame.draw.rect(screen, (200, 200, 200), (*self.position, 100, 150), 2)
@@ -159,24 +270,5 @@ class Stack:
         Returns:
             bool: True if the card can be added to the stack, False otherwise.
         """
-        rank_mapping = {
-            'ace': 1, '2': 2, '3': 3, '4': 4, '5': 5, '6': 6, '7': 7, '8': 8,
-            '9': 9, '10': 10, 'jack': 11, 'queen': 12, 'king': 13
-        }
-
-        # Stock and discard stacks cannot accept new cards
-        if self.is_stock or self.is_discard:
-            return False
-
-        # Foundation stacks accept cards of the same suit and one rank higher than the top card
-        if self.is_foundation:
-            if not self.cards:
-                return card.rank == 'ace'  # Only Aces can be placed on an empty foundation stack
-            top_card = self.cards[-1]
-            return (card.suit == top_card.suit) and (rank_mapping[card.rank] == rank_mapping[top_card.rank] + 1)
-
-        # Tableau stacks accept cards of alternating colors and one rank lower than the top card
-        if not self.cards:
-            return card.rank == 'king'  # Only Kings can be placed on an empty tableau stack.
-        top_card = self.cards[-1]
-        return card.color != top_card.color and rank_mapping[card.rank] == rank_mapping[top_card.rank] - 1
\ No newline at end of file
+        top_card = self.cards[-1].code if self.cards else None
+        return can_place(self.deck, top_card, card.code)
@@ -0,0 +1,144 @@
+"""
+zobrist.py
+
+Zobrist hashing of Solitaire positions and a transposition table keyed by it.
+
+Every (stack, position in the stack, card) triple and every number of face-down cards of
+a tableau stack has a fixed random 64-bit key, and the hash of a position is the XOR of
+the keys that describe it. Moving cards or turning one over only XORs out the old keys
+and XORs in the new ones, so `GameState` keeps the hash up to date in O(cards moved).
+The keys come from a private seeded generator, so hashes are the same on every run and
+the global `random` state is left alone.
+
+Author: Chiriac Laura-Florina
+Created: 18-10-2026
+"""
+
+# Standard Imports
+from array import array
+import random
+
+# Stack counts, as in `game_state` (which imports this module)
+STACK_COUNT = 13
+TABLEAU_COUNT = 7
+MAX_STACK_SIZE = 52
+
+_key_generator = random.Random(0x5017A12E)
+
+# CARD_KEYS[(stack * MAX_STACK_SIZE + position) * 52 + card]
+CARD_KEYS = [_key_generator.getrandbits(64) for _ in range(STACK_COUNT * MAX_STACK_SIZE * 52)]
+
+# HIDDEN_KEYS[stack][count]: the key for `count` face-down cards at the bottom of a tableau stack
+HIDDEN_KEYS = [[_key_generator.getrandbits(64) for _ in range(TABLEAU_COUNT)] for _ in range(TABLEAU_COUNT)]
+
+
+def card_key(stack, position, card):
+    """Return the key of a card at a position of a stack.
+
+    Args:
+        stack (int): The stack index.
+        position (int): The position of the card in the stack (0 is the bottom card).
+        card (int): The encoded card.
+
+    Returns:
+        int: The 64-bit key.
+    """
+    return CARD_KEYS[(stack * MAX_STACK_SIZE + position) * 52 + card]
+
+
+def position_hash(stacks, hidden):
+    """Compute the hash of a position from scratch.
+
+    Args:
+        stacks (list): The 13 lists of encoded cards of a game state.
+        hidden (list): The number of face-down cards of each stack.
+
+    Returns:
+        int: The 64-bit hash.
+    """
+    value = 0
+    for stack, cards in enumerate(stacks):
+        base = stack * MAX_STACK_SIZE
+        for position, card in enumerate(cards):
+            value ^= CARD_KEYS[(base + position) * 52 + card]
+    for stack in range(TABLEAU_COUNT):
+        value ^= HIDDEN_KEYS[stack][hidden[stack]]
+    return value
+
+
+class TranspositionTable:
+    """Class to represent a fixed-size table of position hashes and values.
+
+    The table has 2 ** size_bits buckets of two entries each. The first entry of a bucket
+    keeps the entry with the highest priority (e.g. the one that cost the most search) and
+    the second one is always replaced, so new positions are never refused and valuable ones
+    survive. Memory use is fixed at 24 bytes per entry, however many positions are stored.
+
+    Attributes:
+        mask (int): The bit mask selecting the bucket of a hash.
+        keys (array): The hashes stored in each entry (0 for an empty entry).
+        values (array): The value stored with each hash.
+        priorities (array): The priority of each entry, for the replacement policy.
+    """
+
+    def __init__(self, size_bits=18):
+        """Initialize an empty table.
+
+        Args:
+            size_bits (int): The base-2 logarithm of the number of buckets (default: 18).
+        """
+        entries = 2 << size_bits
+        self.mask = (1 << size_bits) - 1
+        self.keys = array('Q', bytes(8 * entries))
+        self.values = array('q', bytes(8 * entries))
+        self.priorities = array('q', bytes(8 * entries))
+
+    def get(self, key, default=None):
+        """Look up the value stored for a hash.
+
+        Args:
+            key (int): The 64-bit position hash.
+            default: The value returned if the hash is not stored.
+
+        Returns:
+            int: The stored value, or default.
+        """
+        slot = (key & self.mask) << 1
+        if self.keys[slot] == key:
+            return self.values[slot]
+        if self.keys[slot + 1] == key:
+            return self.values[slot + 1]
+        return default
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def store(self, key, value=0, priority=0):
+        """Store a value for a hash, replacing an older entry of the same bucket if needed.
+
+        Args:
+            key (int): The 64-bit position hash.
+            value (int): The value to store (default: 0).
+            priority (int): How valuable the entry is; the first entry of a bucket is only
+                replaced by an entry of at least the same priority (default: 0).
+        """
+        slot = (key & self.mask) << 1
+        first_key = self.keys[slot]
+        if not first_key or first_key == key or priority >= self.priorities[slot]:
+            if first_key and first_key != key:
+                # Move the replaced entry to the always-replace slot instead of losing it
+                self.keys[slot + 1] = self.keys[slot]
+                self.values[slot + 1] = self.values[slot]
+                self.priorities[slot + 1] = self.priorities[slot]
+        else:
+            slot += 1
+        self.keys[slot] = key
+        self.values[slot] = value
+        self.priorities[slot] = priority
+
+    def clear(self):
+        """Remove every entry."""
+        entries = len(self.keys)
+        self.keys = array('Q', bytes(8 * entries))
+        self.values = array('q', bytes(8 * entries))
+        self.priorities = array('q', bytes(8 * entries))